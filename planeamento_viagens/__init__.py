@@ -0,0 +1,3 @@
+# Planeamento de viagens: itinerários, atrações, rotas e respetiva interface gráfica
+# Importar o pacote (ou qualquer módulo, exceto interface) não lê a chave da API, não liga à base de dados
+# nem cria janelas: os clientes e ligações são criados no primeiro uso
@@ -0,0 +1,5 @@
+# Permite executar a aplicação com "python -m planeamento_viagens [comando]"
+import sys
+from .principal import main
+
+sys.exit(main(sys.argv[1:]))
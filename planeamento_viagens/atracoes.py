@@ -0,0 +1,371 @@
+# Atrações turísticas: inserção/leitura/remoção, pesquisa no servidor e importação de ficheiros
+import os                                           # Tamanho dos ficheiros importados
+import re                                           # Validação dos campos importados
+import sys                                          # Mensagens de progresso do comando de importação
+import csv                                          # Leitura de ficheiros CSV de atrações
+import json                                         # Leitura de ficheiros JSONL de atrações
+import argparse                                     # Comandos sem interface gráfica
+import itertools                                    # Divisão de iteráveis em lotes
+import threading                                    # Lock da cache de pesquisa
+import time                                         # Validade da cache de pesquisa
+import unicodedata                                  # Remoção de acentos na normalização de texto
+from collections import OrderedDict                 # Cache LRU dos resultados de pesquisa
+from .bd import criar_tabelas, cursor_bd, ligacao_bd, mysql_connector
+from .distancias import atualizar_distancias
+from .espacial import geocodificar_atracoes, invalidar_indice_espacial
+from .metricas import contar_cache, medido
+
+# Funções CRUD para atrações
+# Inserção que ignora atrações repetidas graças à chave única (nome, morada): numa linha duplicada
+# o "UPDATE id = id" não altera nada e o MySQL conta 0 linhas afetadas (1 quando insere)
+SQL_INSERIR_ATRACAO = (
+    "INSERT INTO atracoes (nome, morada, cidade, tipo) VALUES (%s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE id = id"
+)
+
+# Função para inserir uma nova atração turística na base de dados
+# Retorna o id da nova atração, ou None se já existia; os erros do MySQL passam para quem chama
+# Com atualizar_dados=False a matriz de distâncias e as coordenadas (pedidos à API do Google Maps) ficam
+# para quem chama: a interface pede-as em segundo plano com atualizar_dados_atracoes
+@medido("bd.inserir_atracao")
+def inserir_atracao(nome, morada, cidade, tipo, atualizar_dados=True):
+    id_novo = None
+    with cursor_bd(commit=True) as cursor:
+        # Uma única instrução: insere ou, se já existir (mesmo nome e morada), não faz nada
+        cursor.execute(SQL_INSERIR_ATRACAO, (nome, morada, cidade, tipo))
+        if cursor.rowcount == 1:
+            id_novo = cursor.lastrowid
+    if id_novo is None:
+        print(f"Atracao '{nome}' já existe. Ignorando inserção.")
+        return None
+    cache_pesquisa.limpar()     # Os resultados de pesquisa guardados ficaram desatualizados
+    invalidar_indice_espacial()
+    print(f"Atracao '{nome}' inserida com sucesso.")
+    if atualizar_dados:
+        atualizar_dados_atracoes([id_novo])
+    return id_novo
+
+# Calcula os dados derivados de atrações novas: a sua linha/coluna da matriz de distâncias e as coordenadas
+# Faz pedidos à API do Google Maps (um por bloco de distâncias), por isso na interface corre em segundo plano
+def atualizar_dados_atracoes(ids):
+    atualizar_distancias(ids)       # Calcula só a linha/coluna das novas atrações
+    geocodificar_atracoes(ids)
+
+# Insere muitas atrações de uma vez, a partir de qualquer iterável de tuplos (nome, morada, cidade, tipo)
+# As linhas são enviadas em lotes (INSERT de várias linhas via executemany) com um commit por lote
+# progresso(inseridas, ignoradas), se indicada, é chamada depois de cada lote
+# Retorna (inseridas, ignoradas); as ignoradas são as que já existiam na base de dados
+@medido("bd.inserir_atracoes_em_lote")
+def inserir_atracoes_em_lote(linhas, tamanho_lote=1000, atualizar_matriz=False, progresso=None):
+    inseridas = 0
+    ignoradas = 0
+    linhas = iter(linhas)       # Aceita listas, geradores, leitores de ficheiros, ...
+    with ligacao_bd() as conn:
+        cursor = conn.cursor()
+        try:
+            while True:
+                lote = list(itertools.islice(linhas, tamanho_lote))
+                if not lote:
+                    break
+                cursor.executemany(SQL_INSERIR_ATRACAO, lote)
+                conn.commit()                       # Um commit por lote
+                inseridas += cursor.rowcount
+                ignoradas += len(lote) - cursor.rowcount
+                if progresso is not None:
+                    progresso(inseridas, ignoradas)
+        finally:
+            cursor.close()
+    if inseridas:
+        cache_pesquisa.limpar()
+        invalidar_indice_espacial()
+    print(f"Atrações inseridas: {inseridas}; ignoradas (já existiam): {ignoradas}.")
+    if atualizar_matriz and inseridas:
+        atualizar_distancias()      # Calcula as distâncias só das atrações novas
+    return inseridas, ignoradas
+
+# Função para ler (listar) todas as atrações da base de dados
+@medido("bd.ler_todas_atracoes")
+def ler_todas_atracoes():
+    try:
+        with cursor_bd() as cursor:
+            # Executa uma query para obter todas as colunas de todas as linhas da tabela atracoes
+            cursor.execute("SELECT * FROM atracoes")
+            return cursor.fetchall()        # Retorna o resultado da query (uma lista de tuplas com os dados das atrações)
+    # Se ocorrer algum erro ao tentar comunicar com a base de dados, mostra mensagem e retorna lista vazia
+    except mysql_connector.Error as err:
+        print(f"Erro ao ler atrações: {err}", file=sys.stderr)
+        return []
+
+# Indica se a tabela atracoes já tem alguma atração (None se não for possível consultar a base de dados)
+@medido("bd.existem_atracoes")
+def existem_atracoes():
+    try:
+        with cursor_bd() as cursor:
+            cursor.execute("SELECT 1 FROM atracoes LIMIT 1")
+            return bool(cursor.fetchall())
+    except mysql_connector.Error as err:
+        print(f"Erro ao ler atrações: {err}", file=sys.stderr)
+        return None
+
+# Função para apagar os dados da tabela atrações da base de dados
+@medido("bd.apagar_todas_atracoes")
+def apagar_todas_atracoes():
+    try:
+        with cursor_bd(commit=True) as cursor:
+            # Executa o comando SQL para apagar todas as atrações
+            cursor.execute("DELETE FROM atracoes")
+        cache_pesquisa.limpar()
+        invalidar_indice_espacial()
+        print("Atracoes apagadas.")  # Mensagem de sucesso
+    except mysql_connector.Error as err:
+        print(f"Erro ao apagar dados: {err}", file=sys.stderr)
+
+# --- Pesquisa de atrações no servidor ---
+# Cache pequena (LRU com validade) dos resultados mais pedidos, partilhada pelas threads de pesquisa
+class CachePesquisa:
+    def __init__(self, max_entradas=256, validade=60):
+        self.max_entradas = max_entradas    # Número máximo de pesquisas guardadas
+        self.validade = validade            # Segundos até um resultado ser pedido de novo ao servidor
+        self.dados = OrderedDict()          # chave -> (instante, resultado), do menos para o mais usado
+        self.lock = threading.Lock()
+
+    def obter(self, chave):
+        with self.lock:
+            entrada = self.dados.get(chave)
+            if entrada is None or time.time() - entrada[0] > self.validade:
+                contar_cache("pesquisa_atracoes", falhas=1)
+                return None
+            self.dados.move_to_end(chave)
+            contar_cache("pesquisa_atracoes", acertos=1)
+            return entrada[1]
+
+    def guardar(self, chave, resultado):
+        with self.lock:
+            self.dados[chave] = (time.time(), resultado)
+            self.dados.move_to_end(chave)
+            while len(self.dados) > self.max_entradas:
+                self.dados.popitem(last=False)      # Remove a pesquisa usada há mais tempo
+
+    # Esquece todos os resultados (chamada quando as atrações são alteradas)
+    def limpar(self):
+        with self.lock:
+            self.dados.clear()
+
+cache_pesquisa = CachePesquisa()
+
+# Escapa os caracteres especiais do LIKE para procurar o texto literalmente
+def _escapar_like(texto):
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# Procura nomes de atrações na base de dados: primeiro as que começam pelo texto (nome, depois cidade),
+# depois as restantes encontradas pelo índice FULLTEXT (nome, cidade e morada)
+# Cada parte usa um índice e está limitada ao necessário para a página pedida; resultado em cache
+@medido("bd.pesquisar_atracoes")
+def pesquisar_atracoes(texto, limite=20, pagina=0):
+    texto = " ".join(texto.split())
+    chave = (texto.casefold(), limite, pagina)
+    resultado = cache_pesquisa.obter(chave)
+    if resultado is not None:
+        return resultado
+    necessarios = limite * (pagina + 1)         # Linhas que cada parte tem de fornecer para esta página
+    try:
+        with cursor_bd() as cursor:
+            if not texto:
+                cursor.execute("SELECT DISTINCT nome FROM atracoes ORDER BY nome LIMIT %s OFFSET %s",
+                               (limite, limite * pagina))
+            else:
+                prefixo = _escapar_like(texto) + "%"
+                # Termos para o modo booleano do FULLTEXT: todas as palavras (com 3+ letras) como prefixo
+                palavras = re.sub(r'[+\-<>()~*"@]', " ", texto).split()
+                termos = " ".join(f"+{palavra}*" for palavra in palavras if len(palavra) >= 3)
+                partes = [
+                    "(SELECT nome, 0 AS ordem FROM atracoes WHERE nome LIKE %s ORDER BY nome LIMIT %s)",
+                    "(SELECT nome, 1 AS ordem FROM atracoes WHERE cidade LIKE %s ORDER BY nome LIMIT %s)",
+                ]
+                parametros = [prefixo, necessarios, prefixo, necessarios]
+                if termos:
+                    partes.append("(SELECT nome, 2 AS ordem FROM atracoes "
+                                  "WHERE MATCH(nome, cidade, morada) AGAINST (%s IN BOOLEAN MODE) LIMIT %s)")
+                    parametros += [termos, necessarios]
+                cursor.execute(
+                    "SELECT nome, MIN(ordem) AS relevancia FROM (" + " UNION ALL ".join(partes) + ") AS r "
+                    "GROUP BY nome ORDER BY relevancia, nome LIMIT %s OFFSET %s",
+                    parametros + [limite, limite * pagina]
+                )
+            resultado = [linha[0] for linha in cursor.fetchall()]
+    except mysql_connector.Error as err:
+        print(f"Erro ao pesquisar atrações: {err}", file=sys.stderr)
+        return []
+    cache_pesquisa.guardar(chave, resultado)
+    return resultado
+
+# Função que insere um conjunto de atrações de exemplo na base de dados
+def inserir_atracoes_exemplo():
+    # Lista de tuplas, cada uma contendo dados de uma atração:
+    # (nome, morada, cidade, tipo)
+    atracoes = [
+        ("Torre de Belém", "Avenida Brasília, 1400-038 Lisboa, Portugal", "Lisboa", "Cultural"),
+        ("Estádio do Dragão", "Via Futebol Clube do Porto, 4350-415 Porto, Portugal", "Porto", "Desportivo"),
+        ("Mercado do Bolhão", "Rua Formosa 214, 4000-214 Porto, Portugal", "Porto", "Gastronómico"),
+        ("Praia da Marinha", "Praia da Marinha, 8400-450 Lagoa, Portugal", "Algarve", "Outro"),
+        ("Mosteiro dos Jerónimos", "Praça do Império 1400-206 Lisboa, Portugal", "Lisboa", "Cultural"),
+        ("Pavilhão Multiusos de Guimarães", "Avenida Conde Margaride 239, 4810-161 Guimarães, Portugal", "Guimarães", "Desportivo"),
+        ("Mercado Municipal de Faro", "Largo da Feira Nova, 8000-133 Faro, Portugal", "Faro", "Gastronómico"),
+        ("Castelo de São Jorge", "Rua de Santa Cruz do Castelo, 1100-129 Lisboa, Portugal", "Lisboa", "Cultural"),
+        ("Parque Natural da Serra da Estrela", "Serra da Estrela, 6230-618 Seia, Portugal", "Guarda", "Outro"),
+        ("Festival do Marisco", "Avenida do Mar, 8700-329 Olhão, Portugal", "Olhão", "Gastronómico")
+    ]
+    # Insere todas as atrações num só lote (as que já existirem são ignoradas)
+    try:
+        inserir_atracoes_em_lote(atracoes, atualizar_matriz=True)
+    except mysql_connector.Error as err:
+        print(f"Erro ao inserir atrações de exemplo: {err}", file=sys.stderr)
+
+# --- Importação de atrações a partir de ficheiros (CSV / JSONL) ---
+# Nomes de colunas aceites para cada campo (ficheiros de POIs usam nomes diferentes)
+COLUNAS_ATRACAO = {
+    "nome": ("nome", "name", "designacao"),
+    "morada": ("morada", "endereco", "endereço", "address"),
+    "cidade": ("cidade", "localidade", "concelho", "city"),
+    "tipo": ("tipo", "categoria", "type", "category"),
+}
+# Tipos conhecidos (pelo início da palavra, sem acentos) e o valor normalizado guardado na base de dados
+TIPOS_ATRACAO = {"cultur": "Cultural", "desport": "Desportivo", "gastron": "Gastronómico"}
+
+# Lê um ficheiro de atrações linha a linha (nunca o carrega todo para memória)
+# Gera tuplos (numero_linha, registo, erro): registo é um dicionário ou None quando a linha é ilegível
+def ler_registos_atracoes(ficheiro, formato):
+    if formato == "jsonl":
+        for numero, linha in enumerate(ficheiro, start=1):
+            if not linha.strip():
+                continue
+            try:
+                registo = json.loads(linha)
+            except ValueError:
+                yield numero, None, "JSON inválido"
+                continue
+            if isinstance(registo, dict):
+                yield numero, registo, None
+            else:
+                yield numero, None, "a linha não é um objeto JSON"
+    else:
+        # Deteta o separador (vírgula ou ponto e vírgula) a partir do início do ficheiro
+        amostra = ficheiro.read(4096)
+        ficheiro.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+        except csv.Error:
+            dialeto = csv.excel
+        leitor = csv.DictReader(ficheiro, dialect=dialeto)
+        for registo in leitor:
+            yield leitor.line_num, registo, None
+
+# Valida e normaliza um registo, retornando o tuplo (nome, morada, cidade, tipo) pronto a inserir
+# Lança ValueError com o motivo se o registo for rejeitado
+def normalizar_atracao(registo):
+    campos = {}
+    chaves = {str(chave).strip().lower(): valor for chave, valor in registo.items() if chave is not None}
+    for campo, nomes in COLUNAS_ATRACAO.items():
+        valor = next((chaves[nome] for nome in nomes if chaves.get(nome) not in (None, "")), "")
+        campos[campo] = " ".join(str(valor).split())     # Remove espaços repetidos e nas extremidades
+    if not campos["nome"]:
+        raise ValueError("nome em falta")
+    if len(campos["nome"]) > 255 or len(campos["morada"]) > 255 or len(campos["cidade"]) > 100:
+        raise ValueError("campo demasiado longo")
+    tipo = remover_acentos(campos["tipo"]).lower()
+    campos["tipo"] = next((normal for prefixo, normal in TIPOS_ATRACAO.items() if tipo.startswith(prefixo)), "Outro")
+    return campos["nome"], campos["morada"], campos["cidade"], campos["tipo"]
+
+# Remove os acentos de um texto (ex: "Gastronómica" -> "Gastronomica")
+def remover_acentos(texto):
+    return "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+
+# Importa um ficheiro CSV ou JSONL de atrações em streaming, inserindo-as em lotes
+# - progresso(estado) é chamada após cada lote (estado tem lidas/inseridas/ignoradas/rejeitadas/fracao)
+# - as linhas rejeitadas são escritas (à medida que aparecem) no relatório CSV indicado
+# - cancelar é um threading.Event opcional que interrompe a importação no próximo registo
+# Retorna o dicionário com o estado final
+def importar_atracoes_ficheiro(caminho, tamanho_lote=1000, caminho_relatorio=None, progresso=None, cancelar=None):
+    formato = "jsonl" if caminho.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+    tamanho_ficheiro = os.path.getsize(caminho) or 1
+    estado = {"lidas": 0, "inseridas": 0, "ignoradas": 0, "rejeitadas": 0, "fracao": 0.0}
+    relatorio = open(caminho_relatorio, "w", encoding="utf-8", newline="") if caminho_relatorio else None
+    escritor = csv.writer(relatorio) if relatorio else None
+    if escritor:
+        escritor.writerow(["linha", "motivo", "registo"])
+    try:
+        with open(caminho, "r", encoding="utf-8-sig", newline="") as f:
+            # Gerador com apenas as linhas válidas (as rejeitadas vão diretamente para o relatório)
+            def linhas_validas():
+                for numero, registo, erro in ler_registos_atracoes(f, formato):
+                    if cancelar is not None and cancelar.is_set():
+                        return
+                    estado["lidas"] += 1
+                    if erro is None:
+                        try:
+                            yield normalizar_atracao(registo)
+                            continue
+                        except ValueError as e:
+                            erro = str(e)
+                    estado["rejeitadas"] += 1
+                    if escritor:
+                        escritor.writerow([numero, erro, json.dumps(registo, ensure_ascii=False) if registo else ""])
+
+            # Chamada pela inserção em lote depois de cada commit
+            def lote_inserido(inseridas, ignoradas):
+                estado["inseridas"] = inseridas
+                estado["ignoradas"] = ignoradas
+                estado["fracao"] = min(1.0, f.buffer.tell() / tamanho_ficheiro)    # Posição aproximada no ficheiro
+                if progresso is not None:
+                    progresso(dict(estado))
+
+            inserir_atracoes_em_lote(linhas_validas(), tamanho_lote=tamanho_lote, progresso=lote_inserido)
+    finally:
+        if relatorio:
+            relatorio.close()
+    estado["fracao"] = 1.0
+    return estado
+
+# Comando sem interface gráfica: python ProjetoFinal_Grupo4_codigo.py importar-atracoes FICHEIRO [opções]
+def comando_importar_atracoes(argumentos):
+    parser = argparse.ArgumentParser(prog="importar-atracoes",
+                                     description="Importa atrações de um ficheiro CSV ou JSONL.")
+    parser.add_argument("ficheiro", help="ficheiro .csv ou .jsonl com as atrações")
+    parser.add_argument("--lote", type=int, default=1000, help="número de linhas por lote (por omissão 1000)")
+    parser.add_argument("--relatorio", help="ficheiro CSV onde escrever as linhas rejeitadas")
+    parser.add_argument("--distancias", action="store_true",
+                        help="calcular também a matriz de distâncias das atrações novas (usa a API)")
+    parser.add_argument("--geocodificar", action="store_true",
+                        help="obter também as coordenadas das atrações novas (usa a API)")
+    args = parser.parse_args(argumentos)
+
+    def mostrar_progresso(estado):
+        print(f"\r{estado['fracao']:6.1%}  lidas: {estado['lidas']}  inseridas: {estado['inseridas']}  "
+              f"ignoradas: {estado['ignoradas']}  rejeitadas: {estado['rejeitadas']}", end="", file=sys.stderr)
+
+    criar_tabelas()
+    try:
+        estado = importar_atracoes_ficheiro(args.ficheiro, tamanho_lote=args.lote,
+                                            caminho_relatorio=args.relatorio, progresso=mostrar_progresso)
+    except (OSError, mysql_connector.Error) as err:
+        print(f"Erro ao importar atrações: {err}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    print(f"Linhas lidas: {estado['lidas']}; inseridas: {estado['inseridas']}; "
+          f"ignoradas (já existiam): {estado['ignoradas']}; rejeitadas: {estado['rejeitadas']}")
+    if args.distancias and estado["inseridas"]:
+        atualizar_distancias()
+    if args.geocodificar and estado["inseridas"]:
+        print(f"Coordenadas obtidas para {geocodificar_atracoes()} atração(ões).")
+    return 0
+
+# Função para obter os nomes das atrações da base de dados (aparece lista atrações enquando pessoa escreve locais)
+@medido("bd.obter_localizacoes_banco")
+def obter_localizacoes_banco():
+    # Usa uma ligação do pool (devolvida automaticamente no fim do bloco)
+    with cursor_bd() as cursor:
+        cursor.execute("SELECT nome FROM atracoes")     # Selecionar todos os nomes da tabela atracoes
+        resultados = cursor.fetchall()                  # Buscar todos os resultados da consulta
+    # Extrair os nomes da tupla retornada e remover duplicados com set
+    nomes_unicos = sorted(set([nome[0] for nome in resultados]))
+    return nomes_unicos     # Retornar lista ordenada de nomes únicos
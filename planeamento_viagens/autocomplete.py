@@ -0,0 +1,72 @@
+# Fontes de sugestões para o autocomplete (índice em memória ou pesquisa no servidor)
+import bisect                                       # Pesquisa binária nos índices ordenados
+from collections import defaultdict                 # Índice de trigramas
+from .atracoes import pesquisar_atracoes, remover_acentos
+
+# --- Índice de pesquisa para o autocomplete ---
+# Normaliza um texto para pesquisa: sem acentos, minúsculas e espaços simples
+def normalizar_pesquisa(texto):
+    return " ".join(remover_acentos(texto).casefold().split())
+
+# Índice construído uma vez a partir da lista de nomes, para responder a cada tecla sem percorrer a lista toda
+# - prefixo do nome: pesquisa binária na lista ordenada de nomes normalizados
+# - prefixo de outra palavra do nome: pesquisa binária numa lista ordenada de (palavra, posição)
+# - substring (3+ letras): interseção pelo trigrama menos frequente e confirmação com "in"
+# Os resultados vêm por esta ordem de relevância e limitados aos primeiros "limite"
+class IndiceAutocomplete:
+    def __init__(self, nomes):
+        pares = sorted({(normalizar_pesquisa(nome), nome) for nome in nomes})
+        self.normalizados = [normalizado for normalizado, _ in pares]
+        self.nomes = [nome for _, nome in pares]
+        # Palavras a seguir à primeira (a primeira já é coberta pelo prefixo do nome)
+        palavras = sorted((palavra, i) for i, normalizado in enumerate(self.normalizados)
+                          for palavra in normalizado.split()[1:])
+        self.palavras = [palavra for palavra, _ in palavras]
+        self.posicoes_palavras = [i for _, i in palavras]
+        # Trigrama -> posições dos nomes que o contêm (por ordem alfabética)
+        self.trigramas = defaultdict(list)
+        for i, normalizado in enumerate(self.normalizados):
+            for trigrama in {normalizado[j:j + 3] for j in range(len(normalizado) - 2)}:
+                self.trigramas[trigrama].append(i)
+
+    # Retorna no máximo "limite" nomes que contenham o texto: primeiro os que começam por ele
+    def procurar(self, texto, limite=50):
+        padrao = normalizar_pesquisa(texto)
+        if not padrao:
+            return self.nomes[:limite]
+        encontrados = []
+        vistos = set()
+
+        def juntar(posicoes):
+            for i in posicoes:
+                if len(encontrados) >= limite:
+                    return
+                if i not in vistos:
+                    vistos.add(i)
+                    encontrados.append(i)
+
+        # 1) Nomes que começam pelo texto (já estão por ordem alfabética)
+        inicio = bisect.bisect_left(self.normalizados, padrao)
+        fim = bisect.bisect_left(self.normalizados, padrao + "\uffff", inicio)
+        juntar(range(inicio, min(fim, inicio + limite)))
+        # 2) Nomes em que outra palavra começa pelo texto
+        if len(encontrados) < limite:
+            inicio = bisect.bisect_left(self.palavras, padrao)
+            fim = bisect.bisect_left(self.palavras, padrao + "\uffff", inicio)
+            juntar(sorted(self.posicoes_palavras[inicio:fim])[:limite])
+        # 3) Restantes nomes que contêm o texto em qualquer posição
+        if len(encontrados) < limite and len(padrao) >= 3:
+            listas = [self.trigramas.get(padrao[j:j + 3]) for j in range(len(padrao) - 2)]
+            if all(listas):
+                menor = min(listas, key=len)
+                juntar(i for i in menor if padrao in self.normalizados[i])
+        return [self.nomes[i] for i in encontrados]
+
+# Fonte de sugestões que pergunta ao servidor MySQL em cada pesquisa, em vez de ter todos os nomes em memória
+# O AutocompleteEntry chama procurar() numa thread em segundo plano e recebe o resultado depois
+class PesquisaAtracoesBD:
+    assincrona = True
+    nomes = []          # Não há lista local de nomes
+
+    def procurar(self, texto, limite=50, pagina=0):
+        return pesquisar_atracoes(texto, limite, pagina)
@@ -0,0 +1,245 @@
+# Base de dados MySQL: configuração, criação do esquema e pool de ligações partilhado
+# O conector MySQL só é importado na primeira ligação (importar o pacote não precisa do servidor)
+import sys                                          # Mensagens de erro
+import threading                                    # Lock do pool de ligações
+import time                                         # Espera quando o pool está esgotado
+from contextlib import contextmanager               # Gestores de contexto para ligações/cursores
+from .metricas import contar, cronometrar, medido
+from .util import ModuloPreguicoso
+
+mysql_connector = ModuloPreguicoso("mysql.connector")               # Ligação à base de dados MySQL
+errorcode = ModuloPreguicoso("mysql.connector.errorcode")           # Códigos de erro específicos do MySQL
+pooling = ModuloPreguicoso("mysql.connector.pooling")               # Pool de ligações reutilizáveis
+
+# --- Base de Dados ---
+# Configuração da ligação à base de dados MySQL
+# Configuração BASE (sem o campo "database" para a criação caso ainda nao exista)
+config_base = {
+    'user': 'root',     # Nome de utilizador da base de dados (alterar user)
+    'password': '',     # Palavra-passe da base de dados (alterar password)
+    'host': 'localhost'
+}
+# Configuração COMPLETA (com a base de dados já criada)
+config = {
+    'user': 'root',     # Nome de utilizador da base de dados (alterar user)
+    'password': '',     # Palavra-passe da base de dados (alterar password)
+    'host': 'localhost',
+    'database': 'planejamento_viagens',
+    'raise_on_warnings': True
+}
+
+# Função que cria a base de dados
+@medido("bd.criar_base_de_dados")
+def criar_base_de_dados():
+    try:
+        conn = mysql_connector.connect(**config_base)
+        cursor = conn.cursor()
+        cursor.execute("CREATE DATABASE IF NOT EXISTS planejamento_viagens DEFAULT CHARACTER SET 'utf8mb4'")
+        print("Base de dados criada ou já existe.")
+    except mysql_connector.Error as err:
+        print(f"Erro ao criar base de dados: {err}", file=sys.stderr)
+    finally:
+        cursor.close()
+        conn.close()
+
+# Executa uma alteração ao esquema, ignorando os erros de "já aplicada" (chave/coluna já existe)
+def _executar_migracao(cursor, sql):
+    try:
+        cursor.execute(sql)
+    except mysql_connector.Error as err:
+        if err.errno in (errorcode.ER_DUP_KEYNAME, errorcode.ER_DUP_FIELDNAME):
+            return
+        if err.errno == errorcode.ER_DUP_ENTRY:
+            print(f"Aviso: existem registos duplicados que impedem a migração: {err}", file=sys.stderr)
+            return
+        raise
+
+# Tipo (ex: "date", "datetime") de uma coluna da base de dados atual, ou None se a coluna não existir
+def _tipo_coluna(cursor, tabela, coluna):
+    cursor.execute("SELECT DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS "
+                   "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s", (tabela, coluna))
+    linhas = cursor.fetchall()
+    if not linhas:
+        return None
+    tipo = linhas[0][0]
+    return (tipo.decode() if isinstance(tipo, (bytes, bytearray)) else tipo).lower()    # Alguns conectores devolvem bytes
+
+# Função responsável por criar a base de dados e as tabelas
+@medido("bd.criar_tabelas")
+def criar_tabelas():
+    conn = None         # Variável para a ligação à base de dados
+    cursor = None       # Variável para executar comandos SQL
+    try:
+        # Estabelece ligação ao servidor MySQL (ainda sem selecionar a base de dados)
+        conn = mysql_connector.connect(
+            user=config['user'],
+            password=config['password'],
+            host=config['host'],
+            database=config['database']
+        )
+        cursor = conn.cursor()      # Cria o cursor para enviar comandos SQL
+
+        # Definição da tabela "utilizadores" (NÃO UTILIZADA)
+        tabela_utilizadores = """
+        CREATE TABLE IF NOT EXISTS utilizadores (
+            id INT AUTO_INCREMENT PRIMARY KEY,      -- ID automático e chave primária
+            nome VARCHAR(100) NOT NULL UNIQUE       -- Nome obrigatório e único
+        )
+        """
+
+        # Definição da tabela "itinerarios" (uma linha por viagem origem -> destino, com o resultado da rota)
+        tabela_itinerarios = """
+        CREATE TABLE IF NOT EXISTS itinerarios (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            id_utilizador INT NOT NULL,
+            nome_itinerario VARCHAR(255) NOT NULL,
+            data_inicio DATETIME,                -- Data/hora de partida
+            data_fim DATE,
+            chave CHAR(32),                      -- Identificador estável do itinerário na aplicação
+            origem VARCHAR(255),
+            destino VARCHAR(255),
+            tipo VARCHAR(50),                    -- Tipo de viagem (Cultural, Desportiva, Gastronómica, Outro)
+            notas TEXT,
+            distancia_m INT,                     -- Distância da rota em metros (NULL se ainda não calculada)
+            duracao_s INT,                       -- Duração da rota em segundos
+            estado_rota VARCHAR(255),            -- Texto mostrado quando não há rota (erro, não encontrada)
+            UNIQUE KEY uq_itinerarios_chave (chave),
+            INDEX idx_itinerarios_utilizador_data (id_utilizador, data_inicio, chave),  -- Leitura paginada por data
+            FOREIGN KEY (id_utilizador) REFERENCES utilizadores(id) ON DELETE CASCADE
+        )
+        """
+        # Definição da tabela "atracoes"  (UTILIZADA)
+        tabela_atracoes = """
+        CREATE TABLE IF NOT EXISTS atracoes (
+            id INT AUTO_INCREMENT PRIMARY KEY,   -- ID automático
+            nome VARCHAR(255) NOT NULL,          -- Nome da atração (obrigatório)
+            morada VARCHAR(255),                 -- Morada da atração
+            cidade VARCHAR(100),                 -- Cidade onde está localizada
+            tipo VARCHAR(50),                    -- Tipo da atração (ex: parque, museu)
+            latitude DOUBLE,                     -- Coordenadas obtidas uma única vez (geocodificar_atracoes)
+            longitude DOUBLE,
+            UNIQUE KEY uq_atracoes_nome_morada (nome, morada),  -- Sem duplicados; serve também para procurar por nome
+            INDEX idx_atracoes_cidade (cidade),                 -- Pesquisa por prefixo da cidade
+            FULLTEXT INDEX ft_atracoes (nome, cidade, morada)   -- Pesquisa por palavras (autocomplete)
+        )
+        """
+        # Definição da tabela "distancias" (matriz de distâncias pré-calculada entre atrações)
+        tabela_distancias = """
+        CREATE TABLE IF NOT EXISTS distancias (
+            id_origem INT NOT NULL,              -- Atração de partida
+            id_destino INT NOT NULL,             -- Atração de chegada
+            distancia_m INT,                     -- Distância em metros (NULL se não houver rota)
+            duracao_s INT,                       -- Duração em segundos (NULL se não houver rota)
+            distancia_texto VARCHAR(50),         -- Distância formatada pela API (ex: "321 km")
+            duracao_texto VARCHAR(50),           -- Duração formatada pela API (ex: "3 horas 9 min")
+            PRIMARY KEY (id_origem, id_destino),
+            FOREIGN KEY (id_origem) REFERENCES atracoes(id) ON DELETE CASCADE,
+            FOREIGN KEY (id_destino) REFERENCES atracoes(id) ON DELETE CASCADE
+        )
+        """
+
+        # Execução dos comandos SQL para criar cada tabela
+        cursor.execute(tabela_utilizadores)
+        cursor.execute(tabela_itinerarios)
+        cursor.execute(tabela_atracoes)
+        cursor.execute(tabela_distancias)
+        # Bases de dados criadas por versões anteriores não têm os índices de atracoes: a chave única (nome, morada)
+        # serve também as procuras por nome, a cidade tem índice próprio e o FULLTEXT serve o autocomplete
+        _executar_migracao(cursor, "ALTER TABLE atracoes ADD UNIQUE KEY uq_atracoes_nome_morada (nome, morada)")
+        _executar_migracao(cursor, "ALTER TABLE atracoes ADD INDEX idx_atracoes_cidade (cidade)")
+        _executar_migracao(cursor, "ALTER TABLE atracoes ADD FULLTEXT INDEX ft_atracoes (nome, cidade, morada)")
+        _executar_migracao(cursor, "ALTER TABLE atracoes ADD COLUMN latitude DOUBLE")
+        _executar_migracao(cursor, "ALTER TABLE atracoes ADD COLUMN longitude DOUBLE")
+        # Colunas da tabela itinerarios acrescentadas para guardar os itinerários da interface
+        # (data_inicio era DATE; só é alterada uma vez, porque o ALTER reconstrói a tabela)
+        if _tipo_coluna(cursor, "itinerarios", "data_inicio") == "date":
+            cursor.execute("ALTER TABLE itinerarios MODIFY data_inicio DATETIME")
+        for coluna in ("chave CHAR(32)", "origem VARCHAR(255)", "destino VARCHAR(255)", "tipo VARCHAR(50)",
+                       "notas TEXT", "distancia_m INT", "duracao_s INT", "estado_rota VARCHAR(255)"):
+            _executar_migracao(cursor, f"ALTER TABLE itinerarios ADD COLUMN {coluna}")
+        _executar_migracao(cursor, "ALTER TABLE itinerarios ADD UNIQUE KEY uq_itinerarios_chave (chave)")
+        _executar_migracao(cursor, "ALTER TABLE itinerarios ADD INDEX idx_itinerarios_utilizador_data "
+                                   "(id_utilizador, data_inicio, chave)")
+        print("Tabelas criadas ou já existem.")     # Confirmação visual no terminal
+        conn.commit()       # Confirma as alterações na base de dados
+
+    # Tratamento de erros do MySQL
+    except mysql_connector.Error as err:
+        if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
+            print("Erro: usuário ou senha inválidos.", file=sys.stderr)      # Caso o login falhe
+        else:
+            print(err, file=sys.stderr)      # Outros erros
+    # Fecha o cursor e a ligação, mesmo que ocorra erro
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if conn is not None:
+            conn.close()
+
+# --- Pool de ligações ---
+# Em vez de abrir e fechar uma ligação MySQL em cada função (handshake TCP + autenticação de cada vez),
+# todas as funções de acesso a dados pedem emprestada uma ligação a um pool partilhado e limitado
+TAMANHO_POOL = 5            # Número máximo de ligações abertas em simultâneo
+_pool = None                # Criado apenas no primeiro acesso (e recriado se o servidor falhar)
+_pool_lock = threading.Lock()
+
+# Retorna o pool de ligações, criando-o na primeira utilização
+def obter_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = pooling.MySQLConnectionPool(pool_name="planeamento", pool_size=TAMANHO_POOL,
+                                                pool_reset_session=True, **config)
+        return _pool
+
+# Substitui o pool de ligações por outro objeto com get_connection() (ex: a base de dados local usada
+# nas medições de desempenho); com None volta a ser criado o pool MySQL no próximo acesso
+def definir_pool(pool):
+    global _pool
+    with _pool_lock:
+        _pool = pool
+
+# Gestor de contexto que empresta uma ligação do pool e a devolve no fim (mesmo em caso de erro)
+# Se o pool estiver esgotado espera um pouco e tenta de novo; antes de entregar a ligação
+# verifica se ainda está viva (ping) e volta a ligar-se se o servidor a tiver fechado
+@contextmanager
+def ligacao_bd(tentativas=10, espera=0.1):
+    global _pool
+    conn = None
+    with cronometrar("bd.obter_ligacao"):      # Inclui a espera quando o pool está esgotado
+        for tentativa in range(tentativas):
+            try:
+                conn = obter_pool().get_connection()
+                break
+            except mysql_connector.errors.PoolError:
+                contar("bd.pool_esgotado")
+                if tentativa == tentativas - 1:
+                    raise                       # Continua esgotado: desiste
+                time.sleep(espera)              # Todas as ligações em uso: espera que uma seja devolvida
+            except mysql_connector.Error:
+                with _pool_lock:
+                    _pool = None                # Servidor indisponível: o pool é recriado no próximo pedido
+                raise
+    try:
+        conn.ping(reconnect=True, attempts=2, delay=0.2)    # Verificação de saúde da ligação
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()                 # Não devolve ao pool uma transação a meio
+        except mysql_connector.Error:
+            pass
+        raise
+    finally:
+        conn.close()                        # Numa ligação do pool, close() devolve-a ao pool
+
+# Gestor de contexto que fornece um cursor de uma ligação do pool e faz commit no fim se pedido
+@contextmanager
+def cursor_bd(commit=False):
+    with ligacao_bd() as conn:
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            if commit:
+                conn.commit()
+        finally:
+            cursor.close()
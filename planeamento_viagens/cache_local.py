@@ -0,0 +1,152 @@
+# Cache local em disco (SQLite) das rotas e coordenadas já pedidas ao Google Maps
+import json                                         # Serialização das rotas guardadas
+import sqlite3                                      # Ficheiro da cache
+import threading                                    # Lock da ligação partilhada
+import time                                         # Marcas temporais (validade e LRU)
+from .metricas import contar, contar_cache
+from .util import blocos
+
+# --- Cache de rotas ---
+# Cache persistente (ficheiro SQLite) das rotas pedidas ao Google Maps, para que o mesmo par
+# origem/destino não volte a gerar um pedido à API (sobrevive ao fecho da aplicação)
+# Os acessos (para a remoção LRU) ficam em memória e são gravados em lote: a cada "acessos_por_gravacao"
+# acertos, antes de remover entradas, ao mudar de ficheiro e ao fechar; assim um acerto não faz um commit
+class CacheRotas:
+    # Cache no ficheiro indicado, com validade em segundos e número máximo de entradas
+    def __init__(self, caminho="cache_rotas.db", validade=7 * 24 * 3600, max_entradas=5000, acessos_por_gravacao=100):
+        self.validade = validade            # Tempo (s) ao fim do qual uma rota é considerada desatualizada
+        self.max_entradas = max_entradas    # Acima deste número são removidas as rotas menos usadas (LRU)
+        self.acessos_por_gravacao = acessos_por_gravacao
+        self.acessos = {}                   # chave -> último acesso ainda por gravar
+        self.lock = threading.Lock()        # A ligação SQLite é partilhada, por isso protege-se o acesso
+        self.caminho = caminho
+        self._conn = None                   # O ficheiro só é aberto (e criado) no primeiro acesso
+
+    # Ligação ao ficheiro SQLite, aberta e preparada no primeiro acesso (chamada sempre com o lock)
+    @property
+    def conn(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.caminho, check_same_thread=False)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rotas (
+                    chave TEXT PRIMARY KEY,     -- (origem, destino, modo, idioma) normalizados
+                    resultado TEXT NOT NULL,    -- Rota em JSON
+                    criado REAL NOT NULL,       -- Quando foi obtida da API (para a validade)
+                    acedido REAL NOT NULL       -- Último acesso (para a remoção LRU)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rotas_acedido ON rotas (acedido)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS coordenadas (
+                    morada TEXT PRIMARY KEY,    -- Morada tal como foi enviada à API
+                    latitude REAL,              -- NULL se a API não encontrou a morada
+                    longitude REAL
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # Grava os acessos pendentes (chamada sempre com o lock; o commit fica a cargo de quem chama)
+    def _gravar_acessos(self):
+        if self.acessos:
+            self.conn.executemany("UPDATE rotas SET acedido = ? WHERE chave = ?",
+                                  [(acedido, chave) for chave, acedido in self.acessos.items()])
+            self.acessos.clear()
+
+    # Grava os acessos pendentes e fecha o ficheiro (volta a ser aberto no próximo acesso)
+    def fechar(self):
+        with self.lock:
+            if self._conn is not None:
+                self._gravar_acessos()
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+            self.acessos.clear()
+
+    # Passa a usar outro ficheiro (ex: uma cache temporária nas medições de desempenho)
+    def mudar_ficheiro(self, caminho):
+        self.fechar()
+        with self.lock:
+            self.caminho = caminho
+
+    # Constrói a chave da cache (ignora maiúsculas/minúsculas e espaços nas extremidades)
+    @staticmethod
+    def chave(origem, destino, modo, idioma):
+        return json.dumps([origem.strip().lower(), destino.strip().lower(), modo, idioma], ensure_ascii=False)
+
+    # Devolve a rota guardada ou None se não existir ou já tiver expirado
+    def obter(self, origem, destino, modo, idioma):
+        chave = self.chave(origem, destino, modo, idioma)
+        agora = time.time()
+        with self.lock:
+            linha = self.conn.execute("SELECT resultado, criado FROM rotas WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                contar_cache("rotas", falhas=1)
+                return None
+            resultado, criado = linha
+            if agora - criado > self.validade:
+                self.conn.execute("DELETE FROM rotas WHERE chave = ?", (chave,))      # Expirada: remove
+                self.conn.commit()
+                self.acessos.pop(chave, None)
+                contar_cache("rotas", falhas=1)
+                contar("cache.rotas_expiradas")
+                return None
+            self.acessos[chave] = agora
+            if len(self.acessos) >= self.acessos_por_gravacao:
+                self._gravar_acessos()
+                self.conn.commit()
+        contar_cache("rotas", acertos=1)
+        return json.loads(resultado)
+
+    # Guarda uma rota na cache e remove as entradas menos usadas se o limite for ultrapassado
+    def guardar(self, origem, destino, modo, idioma, rota):
+        chave = self.chave(origem, destino, modo, idioma)
+        agora = time.time()
+        with self.lock:
+            self._gravar_acessos()          # A remoção LRU tem de ver os acessos mais recentes
+            self.acessos.pop(chave, None)
+            self.conn.execute("INSERT OR REPLACE INTO rotas (chave, resultado, criado, acedido) VALUES (?, ?, ?, ?)",
+                              (chave, json.dumps(rota, ensure_ascii=False), agora, agora))
+            total = self.conn.execute("SELECT COUNT(*) FROM rotas").fetchone()[0]
+            if total > self.max_entradas:
+                self.conn.execute("DELETE FROM rotas WHERE chave IN (SELECT chave FROM rotas ORDER BY acedido LIMIT ?)",
+                                  (total - self.max_entradas,))
+            self.conn.commit()
+
+    # Guarda várias rotas (origem, destino, rota) numa só transação, sem substituir as que já existem
+    # "criado" permite indicar quando as rotas foram obtidas (por omissão, agora)
+    def guardar_varios(self, rotas, modo, idioma, criado=None):
+        agora = time.time()
+        criado = agora if criado is None else criado
+        with self.lock:
+            self._gravar_acessos()
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO rotas (chave, resultado, criado, acedido) VALUES (?, ?, ?, ?)",
+                [(self.chave(origem, destino, modo, idioma), json.dumps(rota, ensure_ascii=False), criado, agora)
+                 for origem, destino, rota in rotas])
+            total = self.conn.execute("SELECT COUNT(*) FROM rotas").fetchone()[0]
+            if total > self.max_entradas:
+                self.conn.execute("DELETE FROM rotas WHERE chave IN (SELECT chave FROM rotas ORDER BY acedido LIMIT ?)",
+                                  (total - self.max_entradas,))
+            self.conn.commit()
+
+    # Coordenadas já conhecidas das moradas indicadas: {morada: (lat, lng)}; (None, None) = não encontrada
+    def obter_coordenadas(self, moradas):
+        resultado = {}
+        with self.lock:
+            for bloco in blocos(moradas, 500):
+                linhas = self.conn.execute("SELECT morada, latitude, longitude FROM coordenadas WHERE morada IN (" +
+                                           ", ".join("?" * len(bloco)) + ")", bloco).fetchall()
+                resultado.update((morada, (lat, lng)) for morada, lat, lng in linhas)
+        contar_cache("coordenadas", acertos=len(resultado), falhas=len(moradas) - len(resultado))
+        return resultado
+
+    # Guarda as coordenadas obtidas da API ({morada: (lat, lng)}); as moradas não mudam, por isso não expiram
+    def guardar_coordenadas(self, coordenadas):
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO coordenadas (morada, latitude, longitude) VALUES (?, ?, ?)",
+                                  [(morada, lat, lng) for morada, (lat, lng) in coordenadas.items()])
+            self.conn.commit()
+
+cache_rotas = CacheRotas()      # Instância única usada por toda a aplicação
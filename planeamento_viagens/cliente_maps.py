@@ -0,0 +1,157 @@
+# Cliente do Google Maps criado só no primeiro pedido, com limite de ritmo, repetições e
+# agrupamento de pedidos iguais; a biblioteca googlemaps também só é importada nessa altura
+import json                                         # Chave dos pedidos agrupados
+import random                                       # Variação aleatória das esperas entre repetições
+import threading                                    # Locks do limitador e dos pedidos em curso
+import time                                         # Esperas do limitador de ritmo
+from .metricas import contar, cronometrar
+from .util import ModuloPreguicoso
+
+googlemaps = ModuloPreguicoso("googlemaps")                         # API do Google Maps
+excecoes_maps = ModuloPreguicoso("googlemaps.exceptions")           # Erros da API (para decidir se vale a pena repetir)
+
+# --- API do Google Maps ---
+# O cliente só é criado no primeiro pedido (lendo a chave do ficheiro), para a aplicação
+# poder arrancar e trabalhar com estimativas mesmo sem chave ou sem ligação à rede
+_cliente_maps = None
+_cliente_maps_lock = threading.Lock()
+LIMITE_PEDIDOS_POR_SEGUNDO = 10     # Ritmo médio de pedidos à API (abaixo da quota do projeto)
+RAJADA_PEDIDOS = 20                 # Pedidos que podem sair de seguida antes de o limite se aplicar
+# Tempo (s) em que a biblioteca googlemaps ainda repete sozinha os erros 500/503/504; depois lança Timeout
+# e quem repete é o ClienteMapsControlado (com 0 a biblioteca desistia antes do primeiro pedido)
+REPETICOES_BIBLIOTECA_S = 1
+
+# Limitador de ritmo "token bucket": o balde enche a "ritmo" fichas por segundo até "capacidade"
+# e cada pedido gasta uma ficha; sem fichas, o pedido espera pela próxima
+class BaldeFichas:
+    def __init__(self, ritmo, capacidade):
+        self.ritmo = ritmo
+        self.capacidade = capacidade
+        self.fichas = capacidade
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+
+    # Gasta uma ficha, esperando se for preciso; retorna True se teve de esperar
+    def adquirir(self):
+        esperou = False
+        while True:
+            with self.lock:
+                agora = time.monotonic()
+                self.fichas = min(self.capacidade, self.fichas + (agora - self.ultimo) * self.ritmo)
+                self.ultimo = agora
+                if self.fichas >= 1:
+                    self.fichas -= 1
+                    return esperou
+                espera = (1 - self.fichas) / self.ritmo
+            esperou = True
+            time.sleep(espera)
+
+# Pedido em curso partilhado por todos os que pedem exatamente o mesmo (single-flight)
+class _PedidoEmCurso:
+    def __init__(self):
+        self.terminado = threading.Event()
+        self.resultado = None
+        self.erro = None
+
+# Erros da API que vale a pena repetir (quota momentaneamente excedida, falhas de rede, erros do servidor)
+# HTTPError é uma subclasse de TransportError, por isso é verificado primeiro: os erros 4xx (chave inválida,
+# pedido mal formado) falham logo e só os 5xx são repetidos
+def _erro_repetivel(erro):
+    if isinstance(erro, excecoes_maps.HTTPError):
+        return (getattr(erro, "status_code", None) or 0) >= 500
+    if isinstance(erro, (excecoes_maps.Timeout, excecoes_maps.TransportError)):
+        return True
+    if isinstance(erro, excecoes_maps.ApiError):
+        return erro.status in ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR")
+    return False
+
+# Envolve o cliente do Google Maps: limita o ritmo dos pedidos, repete os que falham por motivos
+# temporários (espera exponencial com variação aleatória) e junta pedidos idênticos em simultâneo
+# num só pedido à API. Os métodos do cliente (directions, distance_matrix, geocode, ...) usam-se
+# da mesma forma; estatisticas() devolve os contadores de pedidos
+class ClienteMapsControlado:
+    def __init__(self, cliente, ritmo=LIMITE_PEDIDOS_POR_SEGUNDO, rajada=RAJADA_PEDIDOS,
+                 tentativas=4, espera_base=0.5, espera_max=8.0):
+        self.cliente = cliente
+        self.balde = BaldeFichas(ritmo, rajada)
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.em_curso = {}          # Chave do pedido -> _PedidoEmCurso
+        self.lock = threading.Lock()
+        self.contadores = {"pedidos": 0, "agrupados": 0, "repetidos": 0, "limitados": 0, "erros": 0}
+
+    def __getattr__(self, nome):
+        metodo = getattr(self.cliente, nome)
+        if not callable(metodo):
+            return metodo
+        return lambda *args, **kwargs: self._chamar(nome, args, kwargs)
+
+    def _contar(self, contador):
+        with self.lock:
+            self.contadores[contador] += 1
+        contar(f"maps.{contador}")
+
+    def estatisticas(self):
+        with self.lock:
+            return dict(self.contadores)
+
+    def _chamar(self, nome, args, kwargs):
+        chave = json.dumps([nome, args, kwargs], sort_keys=True, default=str, ensure_ascii=False)
+        with self.lock:
+            pedido = self.em_curso.get(chave)
+            dono = pedido is None
+            if dono:
+                pedido = self.em_curso[chave] = _PedidoEmCurso()
+            else:
+                self.contadores["agrupados"] += 1
+        if not dono:
+            contar("maps.agrupados")
+            # Já há um pedido igual a caminho: espera pela resposta dele
+            pedido.terminado.wait()
+            if pedido.erro is not None:
+                raise pedido.erro
+            return pedido.resultado
+        try:
+            with cronometrar(f"maps.{nome}"):      # Inclui as esperas do limite de ritmo e das repetições
+                pedido.resultado = self._com_repeticoes(getattr(self.cliente, nome), args, kwargs)
+            return pedido.resultado
+        except Exception as e:
+            pedido.erro = e
+            self._contar("erros")
+            raise
+        finally:
+            with self.lock:
+                del self.em_curso[chave]
+            pedido.terminado.set()
+
+    def _com_repeticoes(self, metodo, args, kwargs):
+        for tentativa in range(self.tentativas):
+            if self.balde.adquirir():
+                self._contar("limitados")
+            self._contar("pedidos")
+            try:
+                return metodo(*args, **kwargs)
+            except Exception as e:
+                if tentativa == self.tentativas - 1 or not _erro_repetivel(e):
+                    raise
+                self._contar("repetidos")
+                # Espera exponencial com variação aleatória ("full jitter") para os pedidos não voltarem juntos
+                time.sleep(random.uniform(0, min(self.espera_max, self.espera_base * 2 ** tentativa)))
+
+# Retorna o cliente do Google Maps, criando-o na primeira utilização
+def obter_cliente_maps():
+    global _cliente_maps
+    with _cliente_maps_lock:
+        if _cliente_maps is None:
+            with open("APIkey.txt", "r") as f:
+                chave = f.read().strip()            # Lê a chave da API armazenada no ficheiro
+            # As repetições (quota excedida, erros do servidor) passam a ser feitas pelo ClienteMapsControlado,
+            # para não se somarem às da biblioteca
+            _cliente_maps = ClienteMapsControlado(googlemaps.Client(key=chave, retry_over_query_limit=False,
+                                                                    retry_timeout=REPETICOES_BIBLIOTECA_S))
+        return _cliente_maps
+
+# Contadores do cliente do Google Maps, ou None se ainda não foi feito nenhum pedido
+def estatisticas_maps():
+    return _cliente_maps.estatisticas() if _cliente_maps is not None else None
@@ -0,0 +1,470 @@
+# Medições de desempenho dos caminhos mais usados, com substitutos locais (sem servidor MySQL nem Google Maps)
+# Uso: python ProjetoFinal_Grupo4_codigo.py medir-desempenho [--saida atual.json] [--comparar base.json]
+import io                                           # Saída das funções medidas (descartada)
+import os                                           # Ficheiros temporários e tamanhos
+import re                                           # Tradução das instruções SQL para SQLite
+import sys                                          # Tabela de resultados no terminal
+import json                                         # Resultados legíveis por outros programas
+import time                                         # Cronómetro (perf_counter)
+import random                                       # Dados gerados (sempre com a mesma semente)
+import sqlite3                                      # Base de dados local que substitui o MySQL
+import argparse                                     # Opções do comando
+import platform                                     # Versão do Python e sistema, guardadas com os resultados
+import tempfile                                     # Pasta dos ficheiros gerados
+import threading                                    # Uma ligação SQLite por thread
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from . import rotas
+from .atracoes import cache_pesquisa, inserir_atracoes_em_lote
+from .autocomplete import IndiceAutocomplete
+from .bd import cursor_bd, definir_pool
+from .cache_local import cache_rotas
+from .itinerarios import ArmazemItinerarios, Itinerario, escrever_itinerarios_texto, importar_itinerarios_texto
+from .metricas import metricas_ativas
+from .planeador import planear_itinerarios_ficheiro
+from .snapshots import escrever_snapshot, importar_itinerarios_snapshot
+
+FORMATO_MEDICOES = "medicoes"
+VERSAO_MEDICOES = 1
+DIFERENCA_MINIMA_MS = 0.5       # Abaixo desta diferença uma medição mais lenta não conta como regressão
+
+# --- Base de dados local (substituto do MySQL) ---
+# Mesmas tabelas e colunas que o esquema MySQL (só as usadas nas medições), num ficheiro SQLite temporário
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS atracoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    morada TEXT,
+    cidade TEXT,
+    tipo TEXT,
+    latitude REAL,
+    longitude REAL,
+    UNIQUE (nome, morada)
+);
+CREATE INDEX IF NOT EXISTS idx_atracoes_cidade ON atracoes (cidade);
+CREATE TABLE IF NOT EXISTS distancias (
+    id_origem INTEGER NOT NULL,
+    id_destino INTEGER NOT NULL,
+    distancia_m INTEGER,
+    duracao_s INTEGER,
+    distancia_texto TEXT,
+    duracao_texto TEXT,
+    PRIMARY KEY (id_origem, id_destino)
+);
+"""
+# "INSERT ... ON DUPLICATE KEY UPDATE id = id" (ignorar repetidos) escrito à maneira do SQLite
+PADRAO_IGNORAR_REPETIDOS = re.compile(r"^\s*INSERT INTO (.*?)\s+ON DUPLICATE KEY UPDATE id = id\s*$", re.S)
+
+# Converte uma instrução escrita para o MySQL na equivalente em SQLite
+def _sql_sqlite(sql):
+    sql = PADRAO_IGNORAR_REPETIDOS.sub(r"INSERT OR IGNORE INTO \1", sql)
+    return sql.replace("%s", "?")
+
+# Cursor com a mesma interface que o do mysql.connector (execute/executemany com parâmetros %s)
+class _CursorSQLite:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, sql, parametros=()):
+        self.cursor.execute(_sql_sqlite(sql), parametros)
+
+    def executemany(self, sql, linhas):
+        self.cursor.executemany(_sql_sqlite(sql), linhas)
+
+    def __getattr__(self, nome):
+        return getattr(self.cursor, nome)       # fetchone, fetchall, rowcount, close
+
+# Ligação "emprestada" pelo pool local: close() não fecha nada (a ligação é da thread)
+class _LigacaoSQLite:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def cursor(self):
+        return _CursorSQLite(self.conn.cursor())
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def ping(self, **opcoes):
+        pass
+
+    def close(self):
+        pass
+
+# Substituto do pool MySQL (ver bd.definir_pool): cada thread tem a sua ligação ao mesmo ficheiro SQLite
+class PoolSQLite:
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.local = threading.local()
+        self.ligacoes = []
+        self.lock = threading.Lock()
+        self._ligacao().executescript(ESQUEMA_SQLITE)
+
+    def _ligacao(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = sqlite3.connect(self.caminho, check_same_thread=False)
+            with self.lock:
+                self.ligacoes.append(conn)
+        return conn
+
+    def get_connection(self):
+        return _LigacaoSQLite(self._ligacao())
+
+    def fechar(self):
+        with self.lock:
+            for conn in self.ligacoes:
+                conn.close()
+            self.ligacoes.clear()
+
+# --- Dados gerados ---
+CIDADES = ["Lisboa", "Porto", "Faro", "Braga", "Coimbra", "Évora", "Aveiro", "Viseu", "Guimarães", "Setúbal"]
+PALAVRAS = ["Museu", "Castelo", "Praia", "Mercado", "Jardim", "Igreja", "Palácio", "Miradouro", "Teatro", "Parque",
+            "Ponte", "Torre", "Convento", "Estádio", "Quinta", "Capela"]
+APELIDOS = ["Real", "Municipal", "Velho", "Novo", "do Mar", "da Serra", "de São Jorge", "dos Navegantes",
+            "da Ribeira", "Nacional", "do Rio", "das Flores"]
+TIPOS_ATRACAO = ["Cultural", "Desportivo", "Gastronómico", "Outro"]
+TIPOS_VIAGEM = ["Cultural", "Desportiva", "Gastronómica", "Outro"]
+# Consultas de autocomplete (prefixos curtos, palavras inteiras, várias palavras e sem resultados)
+CONSULTAS_AUTOCOMPLETE = ["m", "ca", "cas", "museu", "praia do", "torre real", "jardim lis", "sao", "xyz", "ponte 12"]
+
+# Gera n atrações (nome, morada, cidade, tipo) sempre iguais para a mesma semente
+def gerar_atracoes(n, semente=1):
+    aleatorio = random.Random(semente)
+    for i in range(n):
+        cidade = aleatorio.choice(CIDADES)
+        yield (f"{aleatorio.choice(PALAVRAS)} {aleatorio.choice(APELIDOS)} {i}", f"Rua {i}, {cidade}, Portugal",
+               cidade, aleatorio.choice(TIPOS_ATRACAO))
+
+# Gera n itinerários com datas fora de ordem e rota já conhecida (identificadores fixos para serem reprodutíveis)
+def gerar_itinerarios(n, semente=2):
+    aleatorio = random.Random(semente)
+    inicio = datetime(2025, 1, 1)
+    itinerarios = []
+    for i in range(n):
+        origem, destino = aleatorio.sample(CIDADES, 2)
+        distancia_m = aleatorio.randint(1000, 300000)
+        itinerarios.append(Itinerario(origem, destino, aleatorio.choice(TIPOS_VIAGEM),
+                                      inicio + timedelta(minutes=aleatorio.randrange(365 * 24 * 60)),
+                                      f"nota {i}" if i % 3 == 0 else "", distancia_m, distancia_m * 45 // 1000,
+                                      id=f"{i:032x}"))
+    return itinerarios
+
+# Escreve um ficheiro CSV de n pedidos de viagem, com dias encadeados (A -> B -> C ...) como num plano real
+def gerar_pedidos_csv(caminho, n, semente=3):
+    aleatorio = random.Random(semente)
+    dia = datetime(2025, 1, 1, 9, 0)
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write("origem,destino,tipo,data,hora,notas\n")
+        escritos = 0
+        while escritos < n:
+            paragens = aleatorio.sample(CIDADES, aleatorio.randint(2, 6))
+            for hora, (origem, destino) in enumerate(zip(paragens, paragens[1:])):
+                f.write(f"{origem},{destino},{aleatorio.choice(TIPOS_VIAGEM)},{dia:%d/%m/%Y},"
+                        f"{dia.hour + 2 * hora:02d}:00,\n")
+                escritos += 1
+            dia += timedelta(days=1)
+
+# --- Medições ---
+# Executa funcao "repeticoes" vezes e retorna o melhor tempo em milissegundos (o mínimo é o valor
+# menos afetado por outros processos); preparar() corre antes de cada repetição, fora do cronómetro,
+# e o que retorna é passado a funcao
+def _melhor_tempo(funcao, repeticoes, preparar=None):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        argumentos = (preparar(),) if preparar is not None else ()
+        inicio = time.perf_counter()
+        funcao(*argumentos)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+# Latência do autocomplete (tempo médio por consulta) e tempo de construção do índice, por tamanho do catálogo
+def medir_autocomplete(contexto, resultados, informacao):
+    for n in contexto["catalogos"]:
+        nomes = [atracao[0] for atracao in gerar_atracoes(n)]
+        resultados[f"autocomplete.construir.n={n}"] = _melhor_tempo(lambda: IndiceAutocomplete(nomes),
+                                                                    contexto["repeticoes"])
+        indice = IndiceAutocomplete(nomes)
+        total = _melhor_tempo(lambda: [indice.procurar(texto) for texto in CONSULTAS_AUTOCOMPLETE],
+                              contexto["repeticoes"])
+        resultados[f"autocomplete.procurar.n={n}"] = total / len(CONSULTAS_AUTOCOMPLETE)
+
+# Custo de juntar, ordenar e mostrar itinerários no armazém (e no painel de texto, se houver ecrã)
+def medir_itinerarios(contexto, resultados, informacao):
+    for n in contexto["tamanhos_itinerarios"]:
+        itinerarios = gerar_itinerarios(n)
+
+        def inserir_um_a_um(armazem):
+            for itinerario in itinerarios:
+                armazem.inserir(itinerario)
+
+        resultados[f"itinerarios.inserir.n={n}"] = _melhor_tempo(inserir_um_a_um, contexto["repeticoes"],
+                                                                  ArmazemItinerarios)
+        resultados[f"itinerarios.inserir_varios.n={n}"] = _melhor_tempo(
+            lambda armazem: armazem.inserir_varios(itinerarios), contexto["repeticoes"], ArmazemItinerarios)
+        armazem = ArmazemItinerarios()
+        armazem.inserir_varios(itinerarios)
+        resultados[f"itinerarios.resumo.n={n}"] = _melhor_tempo(lambda: [it.resumo() for it in armazem],
+                                                                 contexto["repeticoes"])
+        if contexto["tk"] is not None:
+            _medir_painel(contexto, resultados, itinerarios, n)
+
+# Desenho no widget Text: página inteira e 100 itinerários acrescentados um a um com o painel a acompanhar
+def _medir_painel(contexto, resultados, itinerarios, n):
+    import tkinter as tk
+    from .interface import PainelItinerarios
+    widgets = []
+    extra = gerar_itinerarios(100, semente=n)
+
+    # Cada repetição desenha num widget novo (sem blocos nem tags das anteriores)
+    def preparar():
+        widgets.append(tk.Text(contexto["tk"]))
+        armazem = ArmazemItinerarios()
+        armazem.inserir_varios(itinerarios)
+        painel = PainelItinerarios(widgets[-1], armazem)
+        armazem.subscrever(painel.ao_alterar)
+        return armazem, painel
+
+    # O painel já com a primeira página desenhada, como na interface
+    def preparar_desenhado():
+        argumentos = preparar()
+        argumentos[1].redesenhar_pagina()
+        return argumentos
+
+    def acrescentar(argumentos):
+        armazem, _ = argumentos
+        for itinerario in extra:
+            armazem.inserir(itinerario)
+        contexto["tk"].update_idletasks()
+
+    def redesenhar(argumentos):
+        argumentos[1].redesenhar_pagina()
+        contexto["tk"].update_idletasks()
+
+    resultados[f"itinerarios.painel_redesenhar.n={n}"] = _melhor_tempo(redesenhar, contexto["repeticoes"], preparar)
+    resultados[f"itinerarios.painel_inserir_100.n={n}"] = _melhor_tempo(acrescentar, contexto["repeticoes"],
+                                                                         preparar_desenhado)
+    for widget in widgets:
+        widget.destroy()
+
+# Exportação e importação de ficheiros grandes de itinerários (texto e snapshots JSONL/gzip)
+def medir_ficheiros(contexto, resultados, informacao):
+    n = contexto["itinerarios_ficheiro"]
+    itinerarios = gerar_itinerarios(n)
+    armazem = ArmazemItinerarios()
+    armazem.inserir_varios(itinerarios)
+
+    def sem_entrega(lote, estado):      # Os lotes lidos são descartados
+        pass
+
+    for nome, caminho, exportar, importar in [
+        ("texto", "itinerarios.txt", escrever_itinerarios_texto, importar_itinerarios_texto),
+        ("snapshot", "itinerarios.jsonl", escrever_snapshot, importar_itinerarios_snapshot),
+        ("snapshot_gz", "itinerarios.jsonl.gz", escrever_snapshot, importar_itinerarios_snapshot),
+    ]:
+        caminho = os.path.join(contexto["pasta"], caminho)
+        resultados[f"exportar.{nome}.n={n}"] = _melhor_tempo(lambda: exportar(caminho, armazem), contexto["repeticoes"])
+        resultados[f"importar.{nome}.n={n}"] = _melhor_tempo(lambda: importar(caminho, sem_entrega),
+                                                             contexto["repeticoes"])
+        informacao[f"bytes.{nome}.n={n}"] = os.path.getsize(caminho)
+
+# Inserção em lote de atrações (povoamento da base de dados), na base de dados local
+def medir_sementeira(contexto, resultados, informacao):
+    def esvaziar():
+        with cursor_bd(commit=True) as cursor:
+            cursor.execute("DELETE FROM atracoes")
+
+    for n in contexto["atracoes_lote"]:
+        atracoes = list(gerar_atracoes(n))
+        resultados[f"atracoes.inserir_lote.n={n}"] = _melhor_tempo(lambda _: inserir_atracoes_em_lote(atracoes),
+                                                                   contexto["repeticoes"], esvaziar)
+        # Segunda passagem com as mesmas atrações: todas são ignoradas pela chave única
+        resultados[f"atracoes.inserir_lote_repetidas.n={n}"] = _melhor_tempo(
+            lambda: inserir_atracoes_em_lote(atracoes), contexto["repeticoes"])
+    esvaziar()
+    cache_pesquisa.limpar()
+
+# Tempo de atualização da tabela de atrações (carregar_tabela) com a tabela já preenchida
+def medir_tabela(contexto, resultados, informacao):
+    if contexto["tk"] is None:
+        raise _Ignorada("sem ecrã para o Tkinter")
+    from tkinter import ttk
+    from .interface import carregar_tabela
+    for n in contexto["atracoes_lote"]:
+        with cursor_bd(commit=True) as cursor:
+            cursor.execute("DELETE FROM atracoes")
+        inserir_atracoes_em_lote(gerar_atracoes(n))
+        tree = ttk.Treeview(contexto["tk"], columns=("ID", "Nome", "Morada", "Cidade", "Tipo"), show="headings")
+        carregar_tabela(tree)
+
+        def atualizar():
+            carregar_tabela(tree)
+            contexto["tk"].update_idletasks()
+
+        resultados[f"atracoes.carregar_tabela.n={n}"] = _melhor_tempo(atualizar, contexto["repeticoes"])
+        tree.destroy()
+
+# Planeamento em lote (leitura, rotas do fornecedor local em paralelo, ordenação e escrita)
+def medir_planeamento(contexto, resultados, informacao):
+    n = contexto["pedidos_planeamento"]
+    entrada = os.path.join(contexto["pasta"], "pedidos.csv")
+    saida = os.path.join(contexto["pasta"], "planeados.txt")
+    gerar_pedidos_csv(entrada, n)
+    estado = {}
+
+    def planear():
+        estado.update(planear_itinerarios_ficheiro(entrada, caminho_texto=saida, tamanho_bloco=max(1, n // 4)))
+
+    resultados[f"planeador.n={n}"] = _melhor_tempo(planear, contexto["repeticoes"])
+    informacao[f"planeador.percursos.n={n}"] = estado.get("percursos")
+
+# Medição que não pode correr neste ambiente (ex: sem ecrã)
+class _Ignorada(Exception):
+    pass
+
+MEDICOES = {
+    "autocomplete": medir_autocomplete,
+    "itinerarios": medir_itinerarios,
+    "ficheiros": medir_ficheiros,
+    "sementeira": medir_sementeira,
+    "tabela": medir_tabela,
+    "planeamento": medir_planeamento,
+}
+
+# Tamanhos usados nas medições (o modo rápido serve para verificar que tudo corre, não para comparar)
+TAMANHOS = {
+    "normal": {"catalogos": (1000, 10000, 100000), "tamanhos_itinerarios": (100, 1000, 10000),
+               "itinerarios_ficheiro": 50000, "atracoes_lote": (1000, 10000), "pedidos_planeamento": 10000},
+    "rapido": {"catalogos": (1000, 10000), "tamanhos_itinerarios": (100, 1000),
+               "itinerarios_ficheiro": 5000, "atracoes_lote": (1000,), "pedidos_planeamento": 1000},
+}
+
+# Abre uma janela Tk escondida para as medições da interface; None se não houver ecrã
+def _abrir_tk():
+    try:
+        import tkinter as tk
+        raiz = tk.Tk()
+    except Exception:           # ImportError (Tkinter não instalado) ou TclError (sem ecrã)
+        return None
+    raiz.withdraw()
+    return raiz
+
+# Corre as medições indicadas (todas, por omissão) com a base de dados local, o fornecedor de rotas local
+# e caches de rotas temporárias; no fim repõe a configuração anterior
+# Retorna o documento de resultados (tempos em milissegundos, quanto menor melhor)
+def executar_medicoes(nomes=None, rapido=False, repeticoes=3, progresso=None):
+    nomes = list(nomes or MEDICOES)
+    documento = {"formato": FORMATO_MEDICOES, "versao": VERSAO_MEDICOES,
+                 "criado": datetime.now().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "plataforma": platform.platform(),
+                 "rapido": rapido, "repeticoes": repeticoes,
+                 # Com as métricas ligadas os tempos incluem o custo da instrumentação
+                 "metricas": metricas_ativas(),
+                 "resultados": {}, "informacao": {}, "ignoradas": {}}
+    provedor_anterior = rotas.provedor_rotas
+    caminho_cache_anterior = cache_rotas.caminho
+    raiz = None
+    with tempfile.TemporaryDirectory(prefix="medicoes_") as pasta:
+        pool = PoolSQLite(os.path.join(pasta, "base_dados.sqlite"))
+        try:
+            definir_pool(pool)
+            rotas.definir_provedor_rotas("local")
+            cache_pesquisa.limpar()
+            raiz = _abrir_tk() if {"itinerarios", "tabela"} & set(nomes) else None
+            contexto = dict(TAMANHOS["rapido" if rapido else "normal"], pasta=pasta, repeticoes=repeticoes, tk=raiz)
+            for nome in nomes:
+                if progresso is not None:
+                    progresso(nome)
+                # Cada medição começa com a cache de rotas vazia (o resultado não depende da ordem)
+                cache_rotas.mudar_ficheiro(os.path.join(pasta, f"cache_rotas_{nome}.db"))
+                try:
+                    with redirect_stdout(io.StringIO()):       # As funções medidas imprimem mensagens
+                        MEDICOES[nome](contexto, documento["resultados"], documento["informacao"])
+                except _Ignorada as motivo:
+                    documento["ignoradas"][nome] = str(motivo)
+            if raiz is None and "itinerarios" in nomes:
+                documento["ignoradas"].setdefault("itinerarios.painel", "sem ecrã para o Tkinter")
+        finally:
+            if raiz is not None:
+                raiz.destroy()
+            definir_pool(None)
+            pool.fechar()
+            rotas.definir_provedor_rotas(provedor_anterior)
+            cache_rotas.mudar_ficheiro(caminho_cache_anterior)
+            cache_pesquisa.limpar()
+    return documento
+
+# Compara os resultados atuais com uma base gravada antes; uma medição é regressão se ficou mais lenta
+# do que a base em mais de "tolerancia" (fração) e em pelo menos DIFERENCA_MINIMA_MS
+# Retorna uma lista de (nome, base_ms, atual_ms, razao, regressao) das medições presentes nos dois
+def comparar_medicoes(atual, base, tolerancia=0.2):
+    comparacao = []
+    anteriores = base.get("resultados", {})
+    for nome, valor in atual["resultados"].items():
+        anterior = anteriores.get(nome)
+        if anterior is None:
+            continue
+        razao = valor / anterior if anterior > 0 else float("inf")
+        regressao = razao > 1 + tolerancia and valor - anterior >= DIFERENCA_MINIMA_MS
+        comparacao.append((nome, anterior, valor, razao, regressao))
+    return comparacao
+
+# Lê um ficheiro de resultados gravado por medir-desempenho
+def ler_medicoes(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        documento = json.load(f)
+    if not isinstance(documento, dict) or documento.get("formato") != FORMATO_MEDICOES:
+        raise ValueError(f"{caminho} não é um ficheiro de medições de desempenho.")
+    return documento
+
+# Comando sem interface gráfica: python ProjetoFinal_Grupo4_codigo.py medir-desempenho [opções]
+# Retorna 1 se a comparação com a base encontrar regressões (para ser usado antes de uma entrega)
+def comando_medir_desempenho(argumentos):
+    parser = argparse.ArgumentParser(prog="medir-desempenho",
+                                     description="Mede o desempenho dos caminhos mais usados com uma base de dados "
+                                                 "e um fornecedor de rotas locais.")
+    parser.add_argument("--saida", help="ficheiro JSON onde gravar os resultados (por omissão, o ecrã)")
+    parser.add_argument("--comparar", help="ficheiro JSON de uma execução anterior, usado como base")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="abrandamento aceite em relação à base, em fração (por omissão 0.2 = 20%%)")
+    parser.add_argument("--apenas", help="medições a correr, separadas por vírgulas: " + ", ".join(MEDICOES))
+    parser.add_argument("--repeticoes", type=int, default=3, help="repetições de cada medição (conta a melhor)")
+    parser.add_argument("--rapido", action="store_true", help="tamanhos pequenos, só para verificar que tudo corre")
+    args = parser.parse_args(argumentos)
+    nomes = [nome.strip() for nome in args.apenas.split(",")] if args.apenas else None
+    desconhecidas = [nome for nome in nomes or [] if nome not in MEDICOES]
+    if desconhecidas:
+        parser.error(f"medições desconhecidas: {', '.join(desconhecidas)}")
+    if args.repeticoes < 1:
+        parser.error("--repeticoes tem de ser positivo")
+    try:
+        base = ler_medicoes(args.comparar) if args.comparar else None
+    except (OSError, ValueError) as err:
+        print(f"Erro ao ler a base: {err}", file=sys.stderr)
+        return 1
+
+    documento = executar_medicoes(nomes, rapido=args.rapido, repeticoes=args.repeticoes,
+                                  progresso=lambda nome: print(f"A medir: {nome}…", file=sys.stderr))
+    texto = json.dumps(documento, ensure_ascii=False, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+    for nome, motivo in documento["ignoradas"].items():
+        print(f"Ignorada: {nome} ({motivo})", file=sys.stderr)
+    if base is None:
+        for nome, valor in documento["resultados"].items():
+            print(f"{nome:<45} {valor:12.3f} ms", file=sys.stderr)
+        return 0
+
+    comparacao = comparar_medicoes(documento, base, args.tolerancia)
+    for nome, anterior, valor, razao, regressao in comparacao:
+        print(f"{nome:<45} {anterior:12.3f} -> {valor:12.3f} ms  {razao:6.2f}x" + ("  REGRESSÃO" if regressao else ""),
+              file=sys.stderr)
+    regressoes = sum(1 for *_, regressao in comparacao if regressao)
+    print(f"{len(comparacao)} medição(ões) comparada(s); {regressoes} regressão(ões).", file=sys.stderr)
+    return 1 if regressoes else 0
@@ -0,0 +1,116 @@
+# Matriz de distâncias entre atrações (tabela distancias), calculada com pedidos distance_matrix em lote
+import sys                                          # Mensagens de erro (stderr, fora da saída dos comandos)
+import time                                         # Pausa nas consultas à matriz quando a base de dados falha
+import threading                                    # Lock do estado da matriz (consultada por várias threads)
+from .bd import cursor_bd, mysql_connector
+from .cliente_maps import obter_cliente_maps
+from .metricas import contar, contar_cache, medido
+from .util import blocos
+
+# Funções para a matriz de distâncias entre atrações
+# Calcula as distâncias entre cada origem e cada destino com pedidos distance_matrix em lote
+# origens/destinos são listas de (id, morada); retorna linhas prontas a inserir na tabela distancias
+def calcular_distancias(origens, destinos):
+    linhas = []
+    if not origens or not destinos:
+        return linhas
+    # A API aceita no máximo 25 origens, 25 destinos e 100 elementos por pedido
+    tam_origens = min(25, len(origens))
+    tam_destinos = min(25, max(1, 100 // tam_origens))
+    for bloco_origens in blocos(origens, tam_origens):
+        for bloco_destinos in blocos(destinos, tam_destinos):
+            resposta = obter_cliente_maps().distance_matrix([morada for _, morada in bloco_origens],
+                                            [morada for _, morada in bloco_destinos],
+                                            mode="driving", language="pt-pt")
+            for (id_origem, _), linha in zip(bloco_origens, resposta['rows']):
+                for (id_destino, _), elemento in zip(bloco_destinos, linha['elements']):
+                    if id_origem == id_destino:
+                        continue        # A diagonal é guardada à parte (distância zero)
+                    if elemento.get('status') == "OK":
+                        linhas.append((id_origem, id_destino,
+                                       elemento['distance']['value'], elemento['duration']['value'],
+                                       elemento['distance']['text'], elemento['duration']['text']))
+                    else:
+                        linhas.append((id_origem, id_destino, None, None, None, None))
+    return linhas
+
+# Atualiza a tabela distancias de forma incremental: só calcula a linha e a coluna das atrações novas
+# Se ids_novos não for indicado, considera novas as atrações que ainda não têm entrada na diagonal
+@medido("bd.atualizar_distancias")
+def atualizar_distancias(ids_novos=None):
+    try:
+        # Lê as atrações e devolve logo a ligação ao pool (os pedidos à API podem demorar)
+        with cursor_bd() as cursor:
+            cursor.execute("SELECT id, COALESCE(NULLIF(morada, ''), nome) FROM atracoes")
+            todas = cursor.fetchall()
+            if ids_novos is None:
+                cursor.execute("SELECT id_origem FROM distancias WHERE id_origem = id_destino")
+                calculadas = {linha[0] for linha in cursor.fetchall()}
+                ids_novos = [id_atracao for id_atracao, _ in todas if id_atracao not in calculadas]
+        ids_novos = set(ids_novos)
+        novas = [a for a in todas if a[0] in ids_novos]
+        existentes = [a for a in todas if a[0] not in ids_novos]
+        if not novas:
+            return
+        # Nova linha (novas -> todas) e nova coluna (existentes -> novas); a diagonal fica a zero
+        linhas = calcular_distancias(novas, todas) + calcular_distancias(existentes, novas)
+        linhas += [(id_atracao, id_atracao, 0, 0, "0 km", "0 min") for id_atracao, _ in novas]
+        marcadores = ", ".join(["%s"] * len(novas))
+        ids = [id_atracao for id_atracao, _ in novas]
+        with cursor_bd(commit=True) as cursor:
+            # Remove cálculos parciais anteriores destas atrações e insere a linha/coluna completas
+            cursor.execute(f"DELETE FROM distancias WHERE id_origem IN ({marcadores}) OR id_destino IN ({marcadores})",
+                           ids + ids)
+            cursor.executemany(
+                "INSERT INTO distancias (id_origem, id_destino, distancia_m, duracao_s, distancia_texto, duracao_texto) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                linhas
+            )
+        print(f"Distâncias atualizadas para {len(novas)} atração(ões).")
+    except mysql_connector.Error as err:
+        print(f"Erro ao atualizar distâncias: {err}", file=sys.stderr)
+    except Exception as e:
+        print(f"Erro ao calcular distâncias: {e}", file=sys.stderr)     # Erros da API do Google Maps
+
+# Segundos sem consultar a matriz depois de uma falha da base de dados (servidor desligado ou conector em
+# falta): em vez de uma ligação falhada e uma mensagem por perna, as rotas vêm só da cache local e do fornecedor
+PAUSA_MATRIZ_INDISPONIVEL = 60
+_matriz_indisponivel_ate = 0.0
+_matriz_lock = threading.Lock()
+
+# Regista a falha da base de dados e avisa (uma vez por pausa)
+def _matriz_indisponivel(erro):
+    global _matriz_indisponivel_ate
+    with _matriz_lock:
+        if time.monotonic() < _matriz_indisponivel_ate:
+            return          # Outra thread já registou a falha
+        _matriz_indisponivel_ate = time.monotonic() + PAUSA_MATRIZ_INDISPONIVEL
+    contar("bd.matriz_indisponivel")
+    print(f"Erro ao ler distâncias: {erro} (matriz ignorada durante {PAUSA_MATRIZ_INDISPONIVEL} s)", file=sys.stderr)
+
+# Procura na tabela distancias a rota entre duas atrações conhecidas (pelo nome)
+# Retorna o mesmo formato que obter_rota, ou None se o par não estiver calculado
+@medido("bd.ler_distancia_atracoes")
+def ler_distancia_atracoes(origem, destino):
+    if time.monotonic() < _matriz_indisponivel_ate:
+        return None
+    try:
+        with cursor_bd() as cursor:
+            cursor.execute(
+                "SELECT d.distancia_texto, d.duracao_texto, d.distancia_m, d.duracao_s "
+                "FROM atracoes a JOIN distancias d ON d.id_origem = a.id JOIN atracoes b ON b.id = d.id_destino "
+                "WHERE a.nome = %s AND b.nome = %s AND d.distancia_m IS NOT NULL LIMIT 1",
+                (origem, destino)
+            )
+            linha = cursor.fetchone()
+        if linha is None:
+            contar_cache("matriz_distancias", falhas=1)
+            return None
+        contar_cache("matriz_distancias", acertos=1)
+        return {"distancia": linha[0], "duracao": linha[1], "distancia_m": linha[2], "duracao_s": linha[3]}
+    except ImportError as err:
+        _matriz_indisponivel(err)       # Conector MySQL não instalado (tem de vir antes de mysql_connector.Error)
+        return None
+    except mysql_connector.Error as err:
+        _matriz_indisponivel(err)
+        return None
@@ -0,0 +1,196 @@
+# Coordenadas das atrações (geocodificação em lote com cache) e índice espacial em memória
+import sys                                          # Mensagens de erro
+import math                                         # Distâncias entre coordenadas (haversine)
+import threading                                    # Lock da construção do índice espacial
+from collections import defaultdict                 # Células da grelha do índice espacial
+from concurrent.futures import ThreadPoolExecutor   # Pedidos de geocodificação em paralelo
+from .bd import cursor_bd, mysql_connector
+from .cache_local import cache_rotas
+from .cliente_maps import obter_cliente_maps
+from .metricas import cronometrar
+from .util import blocos
+
+# --- Coordenadas das atrações e índice espacial ---
+RAIO_TERRA_KM = 6371.0088
+KM_POR_GRAU = RAIO_TERRA_KM * math.pi / 180     # Comprimento de um grau de latitude (~111,2 km)
+
+# Distância em linha reta (km) entre dois pontos dados em graus (fórmula de haversine)
+def distancia_haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(math.sqrt(a))
+
+# Pede à API as coordenadas de uma morada; retorna (lat, lng) ou (None, None) se não for encontrada
+def geocodificar_morada(morada):
+    resultados = obter_cliente_maps().geocode(morada, language="pt-pt")
+    if not resultados:
+        return None, None
+    local = resultados[0]["geometry"]["location"]
+    return local["lat"], local["lng"]
+
+# Preenche a latitude/longitude das atrações que ainda não as têm (ou só das indicadas em "ids")
+# As moradas são procuradas primeiro na cache local; as que faltam são pedidas à API em paralelo
+# (um pedido por morada, no máximo "paralelos" em simultâneo) e as atualizações gravadas em lote
+# Retorna o número de atrações com coordenadas novas
+def geocodificar_atracoes(ids=None, tamanho_lote=100, paralelos=4):
+    sql = "SELECT id, COALESCE(NULLIF(morada, ''), nome), cidade FROM atracoes WHERE latitude IS NULL"
+    parametros = []
+    if ids is not None:
+        if not ids:
+            return 0
+        sql += " AND id IN (" + ", ".join(["%s"] * len(ids)) + ")"
+        parametros = list(ids)
+    try:
+        with cursor_bd() as cursor:
+            cursor.execute(sql, parametros)
+            pendentes = cursor.fetchall()
+        atualizadas = 0
+        with ThreadPoolExecutor(max_workers=paralelos) as executor:
+            for lote in blocos(pendentes, tamanho_lote):
+                moradas = {id_atracao: f"{morada}, {cidade}" if cidade and cidade not in morada else morada
+                           for id_atracao, morada, cidade in lote}
+                conhecidas = cache_rotas.obter_coordenadas(list(set(moradas.values())))
+                em_falta = [morada for morada in set(moradas.values()) if morada not in conhecidas]
+                novas = dict(zip(em_falta, executor.map(geocodificar_morada, em_falta)))
+                cache_rotas.guardar_coordenadas(novas)      # Também as não encontradas, para não repetir
+                conhecidas.update(novas)
+                linhas = [(conhecidas[morada][0], conhecidas[morada][1], id_atracao)
+                          for id_atracao, morada in moradas.items() if conhecidas[morada][0] is not None]
+                if linhas:
+                    with cursor_bd(commit=True) as cursor:
+                        cursor.executemany("UPDATE atracoes SET latitude = %s, longitude = %s WHERE id = %s", linhas)
+                    atualizadas += len(linhas)
+        if atualizadas:
+            invalidar_indice_espacial()
+        return atualizadas
+    except mysql_connector.Error as err:
+        print(f"Erro ao geocodificar atrações: {err}", file=sys.stderr)
+    except Exception as e:
+        print(f"Erro ao obter coordenadas: {e}", file=sys.stderr)       # Erros da API do Google Maps
+    return 0
+
+# Índice espacial em grelha: cada atração fica numa célula de "tamanho_celula_km" (em graus de latitude)
+# e as pesquisas só percorrem as células que intersetam a zona pedida, filtrando depois pela distância real
+# Há uma grelha com todas as atrações e uma por tipo, para as pesquisas filtradas por tipo
+class IndiceEspacial:
+    def __init__(self, atracoes, tamanho_celula_km=2.0):
+        self.celula = tamanho_celula_km / KM_POR_GRAU        # Tamanho da célula em graus
+        self.atracoes = []                               # (id, nome, tipo, lat, lng)
+        self.radianos = []                               # (lat, lng, cos(lat)) de cada atração, para a distância
+        self.grelhas = defaultdict(lambda: defaultdict(list))      # tipo (ou None) -> célula -> índices
+        self.por_tipo = defaultdict(int)                 # Número de atrações de cada tipo
+        for atracao in atracoes:
+            indice = len(self.atracoes)
+            self.atracoes.append(atracao)
+            lat = math.radians(atracao[3])
+            self.radianos.append((lat, math.radians(atracao[4]), math.cos(lat)))
+            celula = self._celula(atracao[3], atracao[4])
+            self.grelhas[None][celula].append(indice)
+            self.grelhas[atracao[2]][celula].append(indice)
+            self.por_tipo[atracao[2]] += 1
+
+    def __len__(self):
+        return len(self.atracoes)
+
+    # Distância (km) do ponto (em radianos, com o cosseno da latitude já calculado) à atração "indice"
+    def _distancia(self, lat, lng, cos_lat, indice):
+        lat2, lng2, cos_lat2 = self.radianos[indice]
+        a = math.sin((lat2 - lat) / 2) ** 2 + cos_lat * cos_lat2 * math.sin((lng2 - lng) / 2) ** 2
+        return 2 * RAIO_TERRA_KM * math.asin(math.sqrt(a))
+
+    def _celula(self, lat, lng):
+        return int(math.floor(lat / self.celula)), int(math.floor(lng / self.celula))
+
+    # Células que cobrem a caixa [lat_min, lat_max] x [lng_min, lng_max] numa grelha
+    def _na_caixa(self, grelha, lat_min, lng_min, lat_max, lng_max):
+        (y0, x0), (y1, x1) = self._celula(lat_min, lng_min), self._celula(lat_max, lng_max)
+        if (y1 - y0 + 1) * (x1 - x0 + 1) > len(grelha):        # Caixa grande: é mais rápido ver as células ocupadas
+            for (y, x), indices in grelha.items():
+                if y0 <= y <= y1 and x0 <= x <= x1:
+                    yield from indices
+            return
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                yield from grelha.get((y, x), ())
+
+    # Atrações dentro da caixa delimitada pelas coordenadas indicadas, opcionalmente de um tipo
+    def na_caixa(self, lat_min, lng_min, lat_max, lng_max, tipo=None):
+        resultado = []
+        for indice in self._na_caixa(self.grelhas.get(tipo, {}), lat_min, lng_min, lat_max, lng_max):
+            atracao = self.atracoes[indice]
+            if lat_min <= atracao[3] <= lat_max and lng_min <= atracao[4] <= lng_max:
+                resultado.append(atracao)
+        return resultado
+
+    # Atrações a menos de raio_km do ponto, ordenadas pela distância: lista de (distancia_km, atracao)
+    def no_raio(self, lat, lng, raio_km, tipo=None):
+        dlat = raio_km / KM_POR_GRAU
+        dlng = raio_km / (KM_POR_GRAU * max(math.cos(math.radians(min(abs(lat) + dlat, 89.9))), 1e-6))
+        lat_min, lat_max, lng_min, lng_max = lat - dlat, lat + dlat, lng - dlng, lng + dlng
+        lat_r, lng_r = math.radians(lat), math.radians(lng)
+        cos_lat = math.cos(lat_r)
+        resultado = []
+        for indice in self._na_caixa(self.grelhas.get(tipo, {}), lat_min, lng_min, lat_max, lng_max):
+            atracao = self.atracoes[indice]
+            if not (lat_min <= atracao[3] <= lat_max and lng_min <= atracao[4] <= lng_max):
+                continue        # Fora da caixa envolvente: nem é preciso calcular a distância
+            distancia = self._distancia(lat_r, lng_r, cos_lat, indice)
+            if distancia <= raio_km:
+                resultado.append((distancia, atracao))
+        resultado.sort(key=lambda par: par[0])
+        return resultado
+
+    # As k atrações mais próximas do ponto (opcionalmente de um tipo): lista de (distancia_km, atracao)
+    # Procura em anéis de células à volta do ponto até as k encontradas estarem todas mais perto
+    # do que qualquer atração que ainda possa existir fora da zona já vista
+    def mais_proximas(self, lat, lng, k=5, tipo=None):
+        grelha = self.grelhas.get(tipo)
+        if not grelha or k <= 0:
+            return []
+        total = len(self.atracoes) if tipo is None else self.por_tipo[tipo]
+        cy, cx = self._celula(lat, lng)
+        lat_r, lng_r = math.radians(lat), math.radians(lng)
+        cos_lat = math.cos(lat_r)
+        candidatos = []
+        anel = 0
+        while True:
+            if (2 * anel + 1) ** 2 > len(grelha):
+                # Ponto longe de tudo: sai mais barato medir a distância a todas as atrações da grelha
+                candidatos = [(self._distancia(lat_r, lng_r, cos_lat, indice), self.atracoes[indice])
+                              for indices in grelha.values() for indice in indices]
+                candidatos.sort(key=lambda par: par[0])
+                return candidatos[:k]
+            for y in range(cy - anel, cy + anel + 1):
+                passo = 1 if y in (cy - anel, cy + anel) else 2 * anel     # Só o contorno do anel
+                for x in range(cx - anel, cx + anel + 1, max(passo, 1)):
+                    for indice in grelha.get((y, x), ()):
+                        candidatos.append((self._distancia(lat_r, lng_r, cos_lat, indice), self.atracoes[indice]))
+            if len(candidatos) >= min(k, total):
+                candidatos.sort(key=lambda par: par[0])
+                # Distância mínima garantida a qualquer ponto fora dos anéis já percorridos
+                margem = anel * self.celula * KM_POR_GRAU * \
+                    math.cos(math.radians(min(abs(lat) + (anel + 1) * self.celula, 89.9)))
+                if len(candidatos) >= total or candidatos[k - 1][0] <= margem:
+                    return candidatos[:k]
+            anel += 1
+
+# Índice espacial das atrações com coordenadas, construído na primeira pesquisa
+# e descartado sempre que as atrações mudam
+# O lock evita que pesquisas simultâneas (threads em segundo plano) o construam várias vezes e que uma
+# construção já em curso volte a guardar um índice que entretanto foi descartado
+_indice_espacial = None
+_indice_lock = threading.Lock()
+
+def obter_indice_espacial():
+    global _indice_espacial
+    with _indice_lock:
+        if _indice_espacial is None:
+            with cronometrar("bd.construir_indice_espacial"), cursor_bd() as cursor:
+                cursor.execute("SELECT id, nome, tipo, latitude, longitude FROM atracoes WHERE latitude IS NOT NULL")
+                _indice_espacial = IndiceEspacial(cursor.fetchall())
+        return _indice_espacial
+
+def invalidar_indice_espacial():
+    global _indice_espacial
+    with _indice_lock:
+        _indice_espacial = None
@@ -0,0 +1,1228 @@
+# Interface gráfica (Tkinter) da aplicação; a janela só é criada por executar()
+import tkinter as tk                                # Interface gráfica
+from tkinter import ttk, messagebox, filedialog     # Widgets avançados, janelas de aviso e seleção de ficheiros
+import os
+import re                                           # Validação da data e hora do formulário
+import sys                                          # Mensagens de erro
+import threading                                    # Importações em segundo plano
+import time                                         # Limite de tempo de cada passagem pela fila de conclusões
+import queue                                        # Fila de resultados dos pedidos em segundo plano
+from concurrent.futures import ThreadPoolExecutor   # Conjunto de threads para os pedidos de rotas
+from datetime import datetime, timedelta
+from .atracoes import atualizar_dados_atracoes, cache_pesquisa, importar_atracoes_ficheiro, inserir_atracao
+from .autocomplete import IndiceAutocomplete, PesquisaAtracoesBD
+from .bd import cursor_bd, mysql_connector
+from .cache_local import cache_rotas
+from .cliente_maps import estatisticas_maps
+from .espacial import invalidar_indice_espacial
+from .itinerarios import ArmazemItinerarios, Itinerario, agrupar_encadeados, escrever_itinerarios_texto
+from .metricas import cronometrar, medido
+from .otimizacao import planear_visitas, sugerir_atracoes_proximas
+from .persistencia import GravadorItinerarios, iterar_itinerarios_bd
+from .rotas import calcular_rotas_encadeadas, estimador_rotas, obter_rota, obter_rota_guardada
+from .snapshots import e_snapshot, escrever_snapshot, importar_itinerarios_ficheiro
+
+# --- Interface Gráfica ---
+# Entry com autocomplete mostrando sugestões
+class AutocompleteEntry(tk.Entry):
+    ATRASO_MS = 120             # Espera após a última tecla antes de procurar (debounce)
+    LIMITE_SUGESTOES = 50       # Número máximo de sugestões mostradas
+    ALTURA_LISTA = 6            # Linhas visíveis da lista (só estas existem na Listbox)
+
+    # Inicializa o Entry com lista de sugestões (nova classe criada)
+    # suggestion_list pode ser uma lista de nomes, um IndiceAutocomplete já construído (partilhado)
+    # ou uma fonte assíncrona como PesquisaAtracoesBD (pesquisa no servidor em segundo plano)
+    def __init__(self, suggestion_list, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.master = master
+        # Fonte das sugestões (ordenadas alfabeticamente, sem distinguir acentos/maiúsculas)
+        if isinstance(suggestion_list, (IndiceAutocomplete, PesquisaAtracoesBD)):
+            self.fonte = suggestion_list
+        else:
+            self.fonte = IndiceAutocomplete(suggestion_list)
+        self.suggestion_list = self.fonte.nomes
+        self.assincrona = getattr(self.fonte, "assincrona", False)
+        self.pesquisa_pendente = None   # Pesquisa agendada (cancelada se chegar outra tecla)
+        self.pedido_atual = 0           # Número do último pedido (respostas de pedidos antigos são ignoradas)
+        self.texto_pesquisado = ""      # Texto e página da última resposta (para pedir a página seguinte)
+        self.pagina = 0
+        self.tem_mais = False           # A fonte ainda tem mais resultados para este texto
+        # Variável associada ao texto da Entry (campo de texto)
+        self.var = self["textvariable"] = tk.StringVar()
+        # Detecta qualquer alteração no texto para atualizar a lista de sugestões
+        self.var.trace("w", self.changed)
+
+        # Liga eventos do teclado e foco
+        self.bind("<Down>", self.move_down)                # seta para baixo para navegar sugestões
+        self.bind("<Return>", self.select)                 # Enter para selecionar sugestão
+        self.bind("<FocusIn>", self.mostrar_todas_opcoes)  # ao focar no campo, mostra todas sugestões
+
+        self.listbox = None             # Lista para mostrar as sugestões (Listbox, criada uma só vez)
+        self.barra = None               # Barra de scroll da lista
+        self.listbox_open = False       # Estado se a lista está aberta ou fechada
+        self.opcoes = []                # Todas as opções atuais (só ALTURA_LISTA são desenhadas)
+        self.inicio = 0                 # Posição da primeira opção visível
+        self.selecionado = None         # Posição (absoluta) da opção selecionada
+
+    def changed(self, *args):
+        # Função chamada quando o texto na Entry muda: adia a pesquisa até o utilizador parar de escrever
+        if self.pesquisa_pendente is not None:
+            self.after_cancel(self.pesquisa_pendente)
+        self.pesquisa_pendente = self.after(self.ATRASO_MS, self.atualizar_sugestoes)
+
+    def atualizar_sugestoes(self):
+        # Procura as sugestões para o texto atual (chamada depois do debounce)
+        self.pesquisa_pendente = None
+        texto = self.var.get()      # texto atual
+        if texto == '':
+            self.pedido_atual += 1          # ignora respostas ainda pendentes
+            self.close_listbox()            # se texto vazio, fecha lista
+        else:
+            self.pesquisar(texto)           # procura sugestões que contenham o texto
+
+    def pesquisar(self, texto, pagina=0):
+        # Pede as sugestões à fonte: diretamente (índice local) ou numa thread (servidor)
+        self.pedido_atual += 1
+        pedido = self.pedido_atual
+        if not self.assincrona:
+            self.receber_sugestoes(pedido, texto, pagina, self.fonte.procurar(texto, self.LIMITE_SUGESTOES))
+        else:
+            executar_em_segundo_plano(
+                self.fonte.procurar, texto, self.LIMITE_SUGESTOES, pagina,
+                ao_concluir=lambda resultado: self.receber_sugestoes(pedido, texto, pagina, resultado),
+                executor=executor_pesquisas)
+
+    def receber_sugestoes(self, pedido, texto, pagina, resultado):
+        # Mostra as sugestões recebidas (na thread principal), se ainda corresponderem ao último pedido
+        if pedido != self.pedido_atual:
+            return
+        self.texto_pesquisado = texto
+        self.pagina = pagina
+        self.tem_mais = self.assincrona and len(resultado) == self.LIMITE_SUGESTOES
+        if pagina == 0:
+            if resultado:
+                self.mostrar_lista(resultado)   # mostra as sugestões encontradas
+            else:
+                self.close_listbox()            # fecha lista se não há sugestões
+        elif resultado and self.listbox_open:
+            self.opcoes = self.opcoes + resultado   # Página seguinte: acrescenta ao fim da lista
+            self.desenhar_linhas()
+
+    def pedir_mais(self):
+        # Quando a janela visível chega ao fim das opções, pede a página seguinte à fonte
+        if self.tem_mais and self.inicio + self.ALTURA_LISTA >= len(self.opcoes):
+            self.tem_mais = False       # Evita pedir a mesma página duas vezes
+            self.pesquisar(self.texto_pesquisado, self.pagina + 1)
+
+    def mostrar_todas_opcoes(self, event=None):
+        # Mostra todas as sugestões independentemente do texto escrito (só as linhas visíveis são desenhadas)
+        if self.assincrona:
+            self.pesquisar("")          # Primeira página de nomes (as seguintes chegam com o scroll)
+        else:
+            self.mostrar_lista(self.suggestion_list)
+
+    def criar_lista(self):
+        # Cria a Listbox de sugestões uma única vez; depois é só mostrada/escondida e atualizada no lugar
+        self.listbox = tk.Listbox(self.master, height=self.ALTURA_LISTA, exportselection=False)
+        # Liga eventos de clique e Enter para selecionar
+        self.listbox.bind("<Double-Button-1>", self.select)
+        self.listbox.bind("<Return>", self.select)
+        # Navegação e scroll tratados aqui (a Listbox só tem as linhas visíveis)
+        self.listbox.bind("<Down>", lambda event: self.mover_selecao(1))
+        self.listbox.bind("<Up>", lambda event: self.mover_selecao(-1))
+        self.listbox.bind("<Next>", lambda event: self.mover_selecao(self.ALTURA_LISTA))
+        self.listbox.bind("<Prior>", lambda event: self.mover_selecao(-self.ALTURA_LISTA))
+        self.listbox.bind("<MouseWheel>", lambda event: self.deslocar(-1 if event.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda event: self.deslocar(-1))      # Roda do rato em Linux
+        self.listbox.bind("<Button-5>", lambda event: self.deslocar(1))
+        self.listbox.bind("<<ListboxSelect>>", self.clique_lista)
+        # Barra de scroll desenhada por cima da margem direita da lista
+        self.barra = tk.Scrollbar(self.listbox, command=self.comando_barra)
+
+    def mostrar_lista(self, opcoes):
+        # Mostra a lista de sugestões no ecrã (reutiliza a mesma Listbox)
+        if not opcoes:
+            self.close_listbox()    # se não há opções, não mostra nada
+            return
+        if self.listbox is None:
+            self.criar_lista()
+        self.opcoes = opcoes        # Guarda só a referência: nenhuma cópia nem item Tk por opção
+        self.inicio = 0
+        self.selecionado = None
+        self.desenhar_linhas()
+        if not self.listbox_open:
+            # Posiciona a Listbox logo abaixo da Entry, com mesma largura
+            self.listbox.place(in_=self, relx=0, rely=1, relwidth=1)
+            self.listbox.lift()
+            self.listbox_open = True        # marca lista como aberta
+
+    def desenhar_linhas(self):
+        # Atualiza só as linhas visíveis que mudaram (janela de ALTURA_LISTA opções a partir de self.inicio)
+        visiveis = self.opcoes[self.inicio:self.inicio + self.ALTURA_LISTA]
+        atuais = self.listbox.get(0, tk.END)
+        for linha, texto in enumerate(visiveis):
+            if linha >= len(atuais):
+                self.listbox.insert(tk.END, texto)
+            elif atuais[linha] != texto:
+                self.listbox.delete(linha)
+                self.listbox.insert(linha, texto)
+        if len(atuais) > len(visiveis):
+            self.listbox.delete(len(visiveis), tk.END)
+        self.listbox.config(height=len(visiveis))
+        # Seleção (guardada como posição absoluta nas opções)
+        self.listbox.selection_clear(0, tk.END)
+        if self.selecionado is not None and self.inicio <= self.selecionado < self.inicio + len(visiveis):
+            self.listbox.selection_set(self.selecionado - self.inicio)
+            self.listbox.activate(self.selecionado - self.inicio)
+        # Barra de scroll só quando há mais opções do que linhas visíveis
+        total = len(self.opcoes)
+        if total > self.ALTURA_LISTA:
+            self.barra.set(self.inicio / total, (self.inicio + len(visiveis)) / total)
+            self.barra.place(relx=1, rely=0, relheight=1, anchor="ne")
+        else:
+            self.barra.place_forget()
+
+    def deslocar(self, linhas):
+        # Move a janela visível da lista (roda do rato / barra de scroll)
+        maximo = max(0, len(self.opcoes) - self.ALTURA_LISTA)
+        self.inicio = min(max(self.inicio + linhas, 0), maximo)
+        self.desenhar_linhas()
+        self.pedir_mais()
+        return "break"
+
+    def comando_barra(self, acao, valor, unidade=None):
+        # Traduz os comandos da Scrollbar ("moveto" ou "scroll") para a janela visível
+        if acao == "moveto":
+            self.deslocar(int(float(valor) * len(self.opcoes)) - self.inicio)
+        elif unidade == "pages":
+            self.deslocar(int(valor) * self.ALTURA_LISTA)
+        else:
+            self.deslocar(int(valor))
+
+    def mover_selecao(self, passos):
+        # Move a seleção pelas opções, deslocando a janela visível quando chega a uma das pontas
+        if self.selecionado is None:
+            self.selecionado = self.inicio
+        else:
+            self.selecionado = min(max(self.selecionado + passos, 0), len(self.opcoes) - 1)
+        if self.selecionado < self.inicio:
+            self.inicio = self.selecionado
+        elif self.selecionado >= self.inicio + self.ALTURA_LISTA:
+            self.inicio = self.selecionado - self.ALTURA_LISTA + 1
+        self.desenhar_linhas()
+        self.pedir_mais()
+        return "break"      # para evitar comportamento padrão da tecla
+
+    def clique_lista(self, event=None):
+        # Guarda a opção escolhida com o rato (posição absoluta)
+        selecao = self.listbox.curselection()
+        if selecao:
+            self.selecionado = self.inicio + selecao[0]
+
+    def select(self, event=None):
+        # Função para quando o utilizador seleciona uma sugestão
+        if self.listbox_open and self.selecionado is not None:
+            # Pega o texto da sugestão selecionada
+            self.var.set(self.opcoes[self.selecionado])
+            if self.pesquisa_pendente is not None:
+                self.after_cancel(self.pesquisa_pendente)   # Não volta a abrir a lista para o texto escolhido
+                self.pesquisa_pendente = None
+            self.pedido_atual += 1      # Ignora respostas ainda a caminho
+            self.close_listbox()        # fecha a lista
+            self.icursor(tk.END)        # move o cursor para o fim do texto
+            self.focus_set()
+
+    def move_up(self, event):
+        # Mover seleção para cima na lista de sugestões
+        if self.listbox_open:
+            return self.mover_selecao(-1)
+
+    def move_down(self, event):
+        # Mover seleção para baixo (ou abrir a lista)
+        if self.listbox_open and self.opcoes:
+            self.listbox.focus_set()       # foca a lista para navegar com o teclado
+            self.selecionado = None
+            return self.mover_selecao(0)   # seleciona a primeira opção visível
+
+    def open_listbox(self):
+        # Abre a lista de sugestões (se não estiver já aberta)
+        if not self.listbox_open:
+            self.mostrar_lista(self.opcoes or self.suggestion_list)
+
+    def close_listbox(self):
+        # Fecha (esconde) a lista de sugestões, mantendo a Listbox para a próxima vez
+        if self.listbox_open:
+            self.listbox.place_forget()
+            self.listbox_open = False
+
+# Função para limpar todos os campos do formulário, preparando-os para nova entrada
+def limpar_campos():
+    entrada_local.delete(0, tk.END)    # Apaga texto do campo de local
+    entrada_cidade.delete(0, tk.END)   # Apaga texto do campo de cidade
+    var_tipo.set(tipos[0])                  # Reseta o menu de seleção do tipo para o valor padrão
+    entrada_data.delete(0, tk.END)     # Apaga texto do campo de data
+    entrada_hora.delete(0, tk.END)     # Apaga texto do campo de hora
+    entrada_notas.delete(0, tk.END)    # Apaga texto do campo de notas
+
+# Armazém com os itinerários (objetos Itinerario), sempre ordenado por data/hora
+itinerarios_dados = ArmazemItinerarios()
+# As alterações aos itinerários são gravadas na base de dados em segundo plano
+gravador_itinerarios = GravadorItinerarios()
+itinerarios_dados.subscrever(gravador_itinerarios.ao_alterar)
+# Identificador do itinerário selecionado para edição (não muda quando a ordem muda)
+itinerario_selecionado_id = None
+
+# --- Pedidos de rotas em segundo plano ---
+# Os pedidos ao Google Maps correm num conjunto limitado de threads para a janela não bloquear;
+# os resultados são colocados numa fila e aplicados na thread principal através de janela.after
+executor_rotas = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rotas")
+# As pesquisas do autocomplete têm threads próprias, para cada tecla não esperar atrás de pedidos de rotas lentos
+executor_pesquisas = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pesquisas")
+fila_conclusoes = queue.Queue()     # Tuplos (funcao, argumentos) a executar na thread principal
+pedidos_rota = {}                   # id_itinerario -> futuro do pedido de rota pendente
+
+# Pede que funcao(*args) seja executada na thread principal (pode ser chamada de qualquer thread)
+def executar_na_interface(funcao, *args):
+    fila_conclusoes.put((funcao, args))     # Queue é segura entre threads (Tk não é)
+
+# Entrega o resultado de uma tarefa terminada (já na thread principal)
+def _entregar_resultado(futuro, ao_concluir):
+    erro = futuro.exception()
+    if erro is not None:
+        print(f"Erro numa tarefa em segundo plano: {erro}", file=sys.stderr)
+    elif ao_concluir is not None:
+        ao_concluir(futuro.result())
+
+# Envia uma função para um conjunto de threads (por omissão o dos pedidos de rotas);
+# ao_concluir(resultado) é chamada depois na thread principal
+def executar_em_segundo_plano(funcao, *args, ao_concluir=None, executor=None):
+    futuro = (executor or executor_rotas).submit(funcao, *args)
+    def _terminado(f):
+        if not f.cancelled():
+            executar_na_interface(_entregar_resultado, f, ao_concluir)
+    futuro.add_done_callback(_terminado)
+    return futuro
+
+# Executa na interface o que já chegou à fila e volta a agendar-se (chamada via janela.after)
+# Cada passagem tem um limite de tempo para a janela continuar a responder durante importações grandes
+def processar_conclusoes():
+    limite = time.perf_counter() + 0.03
+    try:
+        while time.perf_counter() < limite:
+            funcao, args = fila_conclusoes.get_nowait()
+            try:
+                # Cada resultado aplicado corre na thread da interface: um lento bloqueia a janela
+                with cronometrar(f"interface.{getattr(funcao, '__name__', 'tarefa')}"):
+                    funcao(*args)
+            except Exception as e:
+                print(f"Erro ao atualizar a interface: {e}", file=sys.stderr)
+    except queue.Empty:
+        pass
+    finally:
+        janela.after(50, processar_conclusoes)      # Reagenda mesmo que um resultado falhe
+
+# Cancela o pedido de rota pendente de um itinerário (quando é editado ou apagado)
+# Um pedido partilhado por uma cadeia de itinerários só é cancelado quando já nenhum deles está à espera
+def cancelar_pedido_rota(id_itinerario):
+    futuro = pedidos_rota.pop(id_itinerario, None)
+    if futuro is not None and futuro not in pedidos_rota.values():
+        futuro.cancel()     # Se já estiver a correr, o resultado é ignorado ao chegar
+
+# Texto mostrado enquanto só há uma estimativa da rota (ou quando não há ligação ao serviço de rotas)
+def texto_estimativa(rota, aviso="estimativa"):
+    return f"Distância - ≈ {rota['distancia']} ({aviso})\n     Duração - ≈ {rota['duracao']}"
+
+# Calcula a rota (corre numa thread do conjunto, nunca na thread da interface)
+# Se a rota ainda não for conhecida, ao_estimar(texto) recebe primeiro uma estimativa offline,
+# que fica visível enquanto o fornecedor de rotas responde e também se este falhar (sem rede)
+# Retorna o dicionário da rota, ou o texto a mostrar quando não há rota
+def calcular_rota_itinerario(origem, destino, ao_estimar=None):
+    estimativa = None
+    try:
+        rota = obter_rota_guardada(origem, destino, modo="driving", idioma="pt-pt")
+        if rota is None:
+            estimativa = estimador_rotas.rota(origem, destino)
+            if estimativa is not None and ao_estimar is not None:
+                ao_estimar(texto_estimativa(estimativa))
+            rota = obter_rota(origem, destino, modo="driving", idioma="pt-pt")
+        return rota if rota else "Rota não encontrada."
+    except Exception as e:
+        if estimativa is not None:
+            print(f"Erro ao calcular rota (fica a estimativa): {e}", file=sys.stderr)
+            return texto_estimativa(estimativa, "estimativa, sem ligação ao serviço de rotas")
+        return f"Erro ao calcular rota: {e}"
+
+# Pede a rota de um itinerário em segundo plano e preenche a distância/duração quando o resultado chegar
+def pedir_rota_itinerario(id_itinerario, origem, destino):
+    cancelar_pedido_rota(id_itinerario)
+
+    def aplicar(resultado):
+        if pedidos_rota.get(id_itinerario) is not futuro:
+            return      # O itinerário foi editado/apagado entretanto: resultado obsoleto
+        del pedidos_rota[id_itinerario]
+        itinerario = itinerarios_dados.obter(id_itinerario)
+        if itinerario is None:
+            return
+        if isinstance(resultado, dict):
+            itinerario.definir_rota(resultado)
+        else:
+            itinerario.estado_rota = resultado      # Rota não encontrada / erro
+        itinerarios_dados.atualizar(itinerario)     # Avisa os ouvintes (a posição não muda)
+
+    # Mostra a estimativa enquanto a rota real não chega
+    def aplicar_estimativa(texto):
+        itinerario = itinerarios_dados.obter(id_itinerario)
+        if pedidos_rota.get(id_itinerario) is futuro and itinerario is not None and itinerario.distancia_m is None:
+            itinerario.estado_rota = texto
+            itinerarios_dados.atualizar(itinerario)
+
+    futuro = executar_em_segundo_plano(calcular_rota_itinerario, origem, destino,
+                                       lambda texto: executar_na_interface(aplicar_estimativa, texto),
+                                       ao_concluir=aplicar)
+    pedidos_rota[id_itinerario] = futuro
+
+# Pede de uma só vez as rotas de uma cadeia de itinerários do mesmo dia (A -> B, B -> C, ...):
+# um único pedido com paragens intermédias, cujas pernas são depois distribuídas pelos itinerários
+def pedir_rotas_cadeia(grupo):
+    ids = [itinerario.id for itinerario in grupo]
+    for id_itinerario in ids:
+        cancelar_pedido_rota(id_itinerario)
+
+    def aplicar(resultado):
+        _, resultados = resultado
+        for id_itinerario, rota in zip(ids, resultados):
+            if pedidos_rota.get(id_itinerario) is not futuro:
+                continue    # Este itinerário foi editado/apagado entretanto
+            del pedidos_rota[id_itinerario]
+            itinerario = itinerarios_dados.obter(id_itinerario)
+            if itinerario is None:
+                continue
+            if isinstance(rota, dict):
+                itinerario.definir_rota(rota)
+            else:
+                itinerario.estado_rota = rota
+            itinerarios_dados.atualizar(itinerario)
+
+    locais = [grupo[0].origem] + [itinerario.destino for itinerario in grupo]
+    futuro = executar_em_segundo_plano(calcular_rotas_encadeadas, locais, ao_concluir=aplicar)
+    for id_itinerario in ids:
+        pedidos_rota[id_itinerario] = futuro
+
+# Pede as rotas de vários itinerários, juntando os seguidos do mesmo dia que formam uma cadeia
+def pedir_rotas_itinerarios(itinerarios):
+    for grupo in agrupar_encadeados(sorted(itinerarios)):
+        if len(grupo) == 1:
+            pedir_rota_itinerario(grupo[0].id, grupo[0].origem, grupo[0].destino)
+        else:
+            pedir_rotas_cadeia(grupo)
+
+# Função para adicionar ou atualizar um itinerário baseado nos dados do formulário
+def adicionar_itinerario():
+    global itinerario_selecionado_id        # Garantir acesso à variável global que controla a seleção
+    # Ler valores dos campos do formulário, removendo espaços em branco nas extremidades
+    local = entrada_local.get().strip()
+    cidade = entrada_cidade.get().strip()
+    tipo = var_tipo.get()
+    data = entrada_data.get().strip()
+    hora = entrada_hora.get().strip()
+    notas = entrada_notas.get().strip()
+
+    # Verificar se os campos obrigatórios estão preenchidos
+    if not (local and cidade and tipo and data and hora):
+        messagebox.showwarning("Campos obrigatórios", "Preencha todos os campos obrigatórios.")
+        return
+    # Validar formato da data (DD/MM/YYYY)
+    if not re.match(r"^(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/([0-9]{4})$", data):
+        messagebox.showerror("Data inválida", "A data deve estar no formato DD/MM/YYYY.")
+        return
+    # Validar formato da hora (HH:MM no formato 24h)
+    if not re.match(r"^([01]\d|2[0-3]):[0-5]\d$", hora):
+        messagebox.showerror("Hora inválida", "A hora deve estar no formato 24:00.")
+        return
+    # Converter data e hora em objeto datetime para manipulação e ordenação
+    try:
+        data_hora_obj = datetime.strptime(f"{data} {hora}", "%d/%m/%Y %H:%M")
+    except ValueError:
+        messagebox.showerror("Erro", "Data e hora inválidas.")
+        return
+    # Definir origem e destino para cálculo de rota via API Google Maps
+    origem = local
+    destino = cidade
+    # Criar o registo do itinerário; a rota fica "a calcular…" até o pedido terminar
+    itinerario = Itinerario(origem, destino, tipo, data_hora_obj, notas)
+    # Se um itinerário está selecionado, atualiza o existente; senão, adiciona novo
+    # (o armazém coloca-o na posição certa e avisa a interface)
+    if itinerario_selecionado_id is not None and itinerario_selecionado_id in itinerarios_dados:
+        itinerario.id = itinerario_selecionado_id       # Mantém o mesmo identificador
+        itinerarios_dados.atualizar(itinerario)
+        messagebox.showinfo("Atualização", "Itinerário atualizado com sucesso!")
+    else:
+        itinerarios_dados.inserir(itinerario)
+    # Pede a rota em segundo plano (cancela o pedido anterior se o itinerário foi editado)
+    pedir_rota_itinerario(itinerario.id, origem, destino)
+    # Resetar seleção e limpar formulário
+    itinerario_selecionado_id = None
+    limpar_campos()
+
+# Mostra os itinerários do armazém no widget Text, uma página de cada vez, e atualiza só os blocos afetados
+# Cada bloco de texto tem uma tag "it_<id>" que delimita o seu intervalo no widget, por isso inserir,
+# atualizar ou apagar um itinerário custa apenas as operações Tk desse bloco (sem recursão nem redesenho total)
+class PainelItinerarios:
+    TAMANHO_PAGINA = 200        # Número máximo de itinerários mostrados de cada vez
+
+    def __init__(self, texto, armazem, etiqueta_pagina=None):
+        self.texto = texto                      # Widget Text onde os blocos são desenhados
+        self.armazem = armazem
+        self.etiqueta_pagina = etiqueta_pagina  # Label "Página x de y" (opcional)
+        self.pagina = 0
+        self.mostrados = []                     # Ids dos itinerários desenhados, pela ordem do widget
+
+    @staticmethod
+    def tag(id_itinerario):
+        return f"it_{id_itinerario}"
+
+    # Ids que devem estar visíveis na página atual (ajusta a página se tiver deixado de existir)
+    def ids_pagina(self):
+        paginas = max(1, -(-len(self.armazem) // self.TAMANHO_PAGINA))
+        self.pagina = min(self.pagina, paginas - 1)
+        inicio = self.pagina * self.TAMANHO_PAGINA
+        fim = min(len(self.armazem), inicio + self.TAMANHO_PAGINA)
+        return [self.armazem[posicao].id for posicao in range(inicio, fim)]
+
+    # Id do itinerário cujo bloco contém a posição indicada do widget (ou None fora dos blocos)
+    def id_em(self, indice):
+        for tag in self.texto.tag_names(indice):
+            if tag.startswith("it_"):
+                return tag[3:]
+        return None
+
+    def _apagar_bloco(self, id_itinerario):
+        tag = self.tag(id_itinerario)
+        intervalo = self.texto.tag_ranges(tag)
+        if intervalo:
+            self.texto.delete(intervalo[0], intervalo[-1])
+        self.texto.tag_delete(tag)
+
+    # Insere o bloco de um itinerário antes do bloco indicado (ou no fim)
+    def _inserir_bloco(self, id_itinerario, antes_de=None):
+        indice = tk.END
+        if antes_de is not None:
+            indice = self.texto.tag_ranges(self.tag(antes_de))[0]
+        self.texto.insert(indice, self.armazem.obter(id_itinerario).resumo() + "\n\n", (self.tag(id_itinerario),))
+
+    # Acerta os blocos desenhados com a página atual: remove os que saíram e insere os que entraram
+    # (a ordem relativa dos blocos que ficam não muda, por isso basta percorrer as duas listas uma vez)
+    def _reconciliar(self):
+        desejados = self.ids_pagina()
+        conjunto = set(desejados)
+        for id_itinerario in [i for i in self.mostrados if i not in conjunto]:
+            self._apagar_bloco(id_itinerario)
+        self.mostrados = [i for i in self.mostrados if i in conjunto]
+        for posicao, id_itinerario in enumerate(desejados):
+            if posicao < len(self.mostrados) and self.mostrados[posicao] == id_itinerario:
+                continue
+            antes_de = self.mostrados[posicao] if posicao < len(self.mostrados) else None
+            self._inserir_bloco(id_itinerario, antes_de)
+            self.mostrados.insert(posicao, id_itinerario)
+        self._atualizar_etiqueta()
+
+    # Chamado pelo armazém sempre que há uma alteração
+    @medido("interface.painel_ao_alterar")
+    def ao_alterar(self, evento, **dados):
+        if evento in ("limpo", "carregado"):
+            self.redesenhar_pagina()
+            return
+        self.texto.config(state=tk.NORMAL)
+        if evento == "atualizado" and dados["itinerario"].id in self.mostrados:
+            # O texto mudou: apaga o bloco antigo para ser desenhado de novo na posição certa
+            self._apagar_bloco(dados["itinerario"].id)
+            self.mostrados.remove(dados["itinerario"].id)
+        self._reconciliar()
+        self.texto.config(state=tk.DISABLED)
+
+    # Desenha de novo a página atual inteira (num único insert ao widget)
+    @medido("interface.redesenhar_pagina")
+    def redesenhar_pagina(self):
+        self.texto.config(state=tk.NORMAL)              # Permite editar o widget de texto antes de fazer alterações
+        self.texto.delete("1.0", tk.END)
+        for id_itinerario in self.mostrados:
+            self.texto.tag_delete(self.tag(id_itinerario))
+        self.mostrados = self.ids_pagina()
+        argumentos = []
+        for id_itinerario in self.mostrados:
+            argumentos += [self.armazem.obter(id_itinerario).resumo() + "\n\n", (self.tag(id_itinerario),)]
+        if argumentos:
+            self.texto.insert(tk.END, *argumentos)
+        self.texto.config(state=tk.DISABLED)            # Torna o widget de texto somente leitura novamente
+        self._atualizar_etiqueta()
+
+    def mudar_pagina(self, passo):
+        self.pagina = max(0, self.pagina + passo)
+        self.redesenhar_pagina()
+        self.texto.yview_moveto(0)
+
+    def _atualizar_etiqueta(self):
+        if self.etiqueta_pagina is not None:
+            paginas = max(1, -(-len(self.armazem) // self.TAMANHO_PAGINA))
+            self.etiqueta_pagina.config(text=f"Página {self.pagina + 1} de {paginas}")
+
+# Redesenha a página atual da área de texto com os itinerários ordenados
+@medido("interface.atualizar_texto_itinerarios")
+def atualizar_texto_itinerarios():
+    painel_itinerarios.redesenhar_pagina()
+
+# Função que detecta o clique num itinerário listado e carrega os seus dados no formulário para edição
+def clicar_registo(event):
+    global itinerario_selecionado_id
+
+    # Obtém a posição do cursor no widget de texto com base nas coordenadas do clique
+    index = texto_itinerarios.index(f"@{event.x},{event.y}")
+    # A tag do bloco nessa posição indica diretamente qual é o itinerário (sem ler o texto do widget)
+    id_itinerario = painel_itinerarios.id_em(index)
+    itinerario = itinerarios_dados.obter(id_itinerario) if id_itinerario else None
+    if itinerario is not None:
+        itinerario_selecionado_id = itinerario.id   # Guarda o identificador do itinerário selecionado
+        preencher_formulario(itinerario)            # Preenche o formulário com os dados do itinerário selecionado
+
+# Preenche os campos do formulário com os dados do itinerário selecionado (sem voltar a ler o texto)
+def preencher_formulario(itinerario):
+    entrada_local.delete(0, tk.END)
+    entrada_local.insert(0, itinerario.origem)
+    entrada_cidade.delete(0, tk.END)
+    entrada_cidade.insert(0, itinerario.destino)
+    var_tipo.set(itinerario.tipo)
+    entrada_data.delete(0, tk.END)
+    entrada_data.insert(0, f"{itinerario.data_hora:%d/%m/%Y}")
+    entrada_hora.delete(0, tk.END)
+    entrada_hora.insert(0, f"{itinerario.data_hora:%H:%M}")
+    entrada_notas.delete(0, tk.END)
+    entrada_notas.insert(0, itinerario.notas)
+
+# Apaga todos os itinerários após confirmação do utilizador
+def apagar_registos():
+    global itinerario_selecionado_id        # Usa a variável global do programa
+    confirmar = messagebox.askyesno("Apagar Registos",
+                                    "Tem a certeza que deseja apagar todos os itinerários?")  # Pergunta ao utilizador
+    if confirmar:
+        for id_itinerario in list(pedidos_rota):
+            cancelar_pedido_rota(id_itinerario) # Cancela as rotas ainda a calcular
+        itinerarios_dados.limpar()              # Limpa e apaga da base de dados os itinerários da lista
+                                                # (a área de texto é atualizada pelo evento)
+        itinerario_selecionado_id = None        # Reseta a seleção
+
+# Carrega os itinerários guardados na base de dados com data no intervalo [inicio, fim), página a página,
+# numa thread à parte. Cada página é juntada à lista na thread principal sem voltar a ser gravada; os que
+# já estão na lista (intervalos sobrepostos) ficam como estão e os que ficaram a calcular numa sessão
+# anterior voltam a pedir a rota
+def carregar_itinerarios_guardados(inicio=None, fim=None):
+    def receber_pagina(pagina):
+        novos = [itinerario for itinerario in pagina if itinerario.id not in itinerarios_dados]
+        with gravador_itinerarios.sem_gravar():
+            itinerarios_dados.inserir_varios(novos)
+        pedir_rotas_itinerarios([itinerario for itinerario in novos if itinerario.rota_pendente()])
+
+    def trabalhar():
+        try:
+            for pagina in iterar_itinerarios_bd(inicio, fim):
+                executar_na_interface(receber_pagina, pagina)
+        except mysql_connector.Error as err:
+            print(f"Erro ao carregar itinerários: {err}", file=sys.stderr)
+
+    threading.Thread(target=trabalhar, daemon=True).start()
+
+# No arranque só são lidos os itinerários de hoje em diante (os outros períodos são lidos a pedido)
+def carregar_itinerarios_iniciais():
+    carregar_itinerarios_guardados(inicio=datetime.now().replace(hour=0, minute=0, second=0, microsecond=0))
+
+# Abre uma janela para ler da base de dados os itinerários de um período (datas vazias: sem limite)
+def abrir_janela_carregar_periodo():
+    janela_periodo = tk.Toplevel(janela)
+    janela_periodo.title("Carregar Período")
+    janela_periodo.geometry("320x150")
+    janela_periodo.configure(bg="#f0f4f7")
+
+    frame = tk.Frame(janela_periodo, bg="#f0f4f7", padx=20, pady=10)
+    frame.pack(expand=True, fill="both")
+    tk.Label(frame, text="De (DD/MM/YYYY):", bg="#f0f4f7").grid(row=0, column=0, sticky="w")
+    entrada_de = tk.Entry(frame, width=14)
+    entrada_de.grid(row=0, column=1, pady=5)
+    tk.Label(frame, text="Até (DD/MM/YYYY):", bg="#f0f4f7").grid(row=1, column=0, sticky="w")
+    entrada_ate = tk.Entry(frame, width=14)
+    entrada_ate.grid(row=1, column=1, pady=5)
+
+    def carregar():
+        try:
+            inicio, fim = [datetime.strptime(texto, "%d/%m/%Y") if texto else None
+                           for texto in (entrada_de.get().strip(), entrada_ate.get().strip())]
+        except ValueError:
+            messagebox.showerror("Erro", "As datas devem estar no formato DD/MM/YYYY.")
+            return
+        if inicio is not None and fim is not None and fim < inicio:
+            messagebox.showerror("Erro", "A data final é anterior à inicial.")
+            return
+        # O dia final conta inteiro
+        carregar_itinerarios_guardados(inicio, fim + timedelta(days=1) if fim is not None else None)
+        janela_periodo.destroy()
+
+    tk.Button(frame, text="Carregar", command=carregar, bg="#2a4d69", fg="white").grid(row=2, column=0,
+                                                                                      columnspan=2, pady=10)
+
+# Tipos de ficheiro aceites ao exportar/importar itinerários (texto legível ou snapshot)
+TIPOS_FICHEIRO_ITINERARIOS = [("Text files", "*.txt"), ("Snapshot JSONL", "*.jsonl"),
+                              ("Snapshot comprimido", "*.jsonl.gz")]
+
+# Função para exportar a lista de itinerários para um ficheiro .txt ou para um snapshot (.jsonl / .jsonl.gz)
+def exportar_itinerarios():
+    # Verifica se há itinerários para exportar
+    if not itinerarios_dados:
+        messagebox.showinfo("Exportar", "Nenhum itinerário para exportar.")
+        return
+    # Abre diálogo para escolher o local e nome do ficheiro a salvar
+    caminho = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=TIPOS_FICHEIRO_ITINERARIOS)
+    if caminho:
+        try:
+            if e_snapshot(caminho):
+                escrever_snapshot(caminho, itinerarios_dados)
+            else:
+                # Escreve cada resumo de itinerário no ficheiro, separado por linhas em branco
+                escrever_itinerarios_texto(caminho, itinerarios_dados)
+            messagebox.showinfo("Exportar", f"Itinerários exportados com sucesso para {caminho}")
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao exportar: {e}")
+
+# Função para importar itinerários a partir de um ficheiro .txt ou de um snapshot (.jsonl / .jsonl.gz)
+# O ficheiro é lido numa thread à parte e os itinerários chegam à interface em lotes, com progresso e cancelamento
+def importar_itinerarios():
+    # Abre diálogo para escolher o ficheiro a importar
+    caminho = filedialog.askopenfilename(filetypes=TIPOS_FICHEIRO_ITINERARIOS)
+    if not caminho:
+        return
+
+    # Limpa os itinerários atuais antes de importar novos (só da lista: os guardados na base de dados ficam)
+    for id_itinerario in list(pedidos_rota):
+        cancelar_pedido_rota(id_itinerario)
+    with gravador_itinerarios.sem_gravar():
+        itinerarios_dados.limpar()
+
+    # Janela de progresso
+    janela_importacao = tk.Toplevel(janela)
+    janela_importacao.title("Importar Itinerários")
+    janela_importacao.geometry("380x140")
+    janela_importacao.configure(bg="#f0f4f7")
+    barra = ttk.Progressbar(janela_importacao, maximum=1.0, length=340)
+    barra.pack(pady=(20, 10))
+    etiqueta = tk.Label(janela_importacao, text="A importar…", bg="#f0f4f7")
+    etiqueta.pack()
+    cancelar = threading.Event()
+    tk.Button(janela_importacao, text="Cancelar", command=cancelar.set).pack(pady=5)
+    janela_importacao.protocol("WM_DELETE_WINDOW", cancelar.set)
+
+    # Estas três funções correm na thread principal (chamadas através da fila de conclusões)
+    def receber_lote(lote, estado):
+        itinerarios_dados.inserir_varios(lote)      # Uma ordenação e um redesenho por lote
+        barra["value"] = estado["fracao"]
+        etiqueta.config(text=f"Importados: {estado['importados']}   Ignorados: {estado['ignorados']}")
+
+    def terminar(estado):
+        janela_importacao.destroy()
+        mensagem = f"{estado['importados']} itinerário(s) importado(s)."
+        if cancelar.is_set():
+            mensagem = "Importação cancelada. " + mensagem
+        if estado["ignorados"]:
+            linhas = ", ".join(str(numero) for numero in estado["linhas_ignoradas"])
+            mensagem += f"\n{estado['ignorados']} bloco(s) ignorado(s) por estarem mal formados (linhas {linhas}"
+            mensagem += ", …)" if estado["ignorados"] > len(estado["linhas_ignoradas"]) else ")"
+        messagebox.showinfo("Importar", mensagem)
+
+    def falhar(erro):
+        janela_importacao.destroy()
+        messagebox.showerror("Erro", f"Erro ao importar: {erro}")
+
+    # Corre na thread de importação: nunca mexe diretamente na interface
+    def trabalhar():
+        try:
+            estado = importar_itinerarios_ficheiro(
+                caminho, lambda lote, estado: executar_na_interface(receber_lote, lote, estado), cancelar=cancelar)
+            executar_na_interface(terminar, estado)
+        except Exception as e:
+            executar_na_interface(falhar, e)
+
+    threading.Thread(target=trabalhar, daemon=True).start()
+
+# Carrega os dados da base de dados na tabela (Treeview) de atrações, substituindo as linhas anteriores
+@medido("interface.carregar_tabela")
+def carregar_tabela(tree):
+    # Cada atualização usa uma ligação do pool em vez de manter uma ligação aberta com a janela
+    with cursor_bd() as cursor:
+        cursor.execute("SELECT * FROM atracoes")
+        atracoes = cursor.fetchall()
+    # Limpa a tabela antes de inserir dados novos (uma só chamada ao Tk para todas as linhas)
+    tree.delete(*tree.get_children())
+    for atracao in atracoes:
+        tree.insert("", "end", values=atracao)
+
+# Abre uma nova janela para adicionar uma atração turística, com campos para nome, morada, cidade e tipo
+def abrir_janela_adicionar_atracao():
+    nova_janela = tk.Toplevel(janela)
+    nova_janela.title("Adicionar Atração")
+    nova_janela.geometry("400x200")
+    nova_janela.configure(bg="#f0f4f7")
+
+    # Frame para organizar widgets na janela
+    frame = tk.Frame(nova_janela, bg="#f0f4f7", padx=20, pady=20)
+    frame.pack(expand=True, fill="both")
+    # Campo Nome
+    tk.Label(frame, text="Nome:", bg="#f0f4f7").grid(row=0, column=0, sticky="w")
+    entry_nome = tk.Entry(frame, width=50)
+    entry_nome.grid(row=0, column=1, pady=5)
+    # Campo Morada
+    tk.Label(frame, text="Morada:", bg="#f0f4f7").grid(row=1, column=0, sticky="w")
+    entry_morada = tk.Entry(frame, width=50)
+    entry_morada.grid(row=1, column=1, pady=5)
+    # Campo Cidade
+    tk.Label(frame, text="Cidade:", bg="#f0f4f7").grid(row=2, column=0, sticky="w")
+    entry_cidade = tk.Entry(frame, width=50)
+    entry_cidade.grid(row=2, column=1, pady=5)
+    # Campo Tipo
+    tipos = ["Cultural", "Desportiva", "Gastronómica", "Outro"]
+    var_tipo = tk.StringVar(value=tipos[0])
+    tk.Label(frame, text="Tipo:", bg="#f0f4f7").grid(row=3, column=0, sticky="w")
+    dropdown_tipo = tk.OptionMenu(frame, var_tipo, *tipos)
+    dropdown_tipo.config(width=44)
+    dropdown_tipo.grid(row=3, column=1, pady=5)
+
+    # Função interna para guardar a atração na base de dados
+    def guardar_atracao():
+        nome = entry_nome.get()
+        morada = entry_morada.get()
+        cidade = entry_cidade.get()
+        tipo = var_tipo.get()
+
+        # Verifica se todos os campos estão preenchidos
+        if nome and morada and cidade and tipo:
+            try:
+                id_novo = inserir_atracao(nome, morada, cidade, tipo, atualizar_dados=False)
+            except mysql_connector.Error as err:
+                messagebox.showerror("Erro", f"Erro ao adicionar atração: {err}")
+                return
+            if id_novo is None:
+                messagebox.showwarning("Duplicado", "Já existe uma atração com este nome e morada.")
+                return
+            # Distâncias e coordenadas da nova atração pedidas à API sem bloquear a janela
+            executar_em_segundo_plano(atualizar_dados_atracoes, [id_novo])
+            messagebox.showinfo("Sucesso", "Atração adicionada com sucesso!")
+            nova_janela.destroy()       # Fecha a janela após adicionar
+        else:
+            messagebox.showwarning("Campos vazios", "Por favor, preencha todos os campos.")
+
+    # Botão para guardar os dados da atração
+    btn_guardar = tk.Button(frame, text="Guardar Atração", command=guardar_atracao, bg="#2a4d69", fg="white")
+    btn_guardar.grid(row=4, column=0, columnspan=2, pady=20)
+
+# Abre uma janela com a lista de atrações da base de dados, permitindo apagar uma atração selecionada
+def abrir_janela_apagar_atracao():
+    # Cria uma nova janela para mostrar a tabela de atrações
+    janela_tabela = tk.Toplevel(janela)
+    janela_tabela.title("Lista de Atrações da Base de Dados")
+    janela_tabela.geometry("900x400")
+
+    # Configura a tabela (Treeview) com colunas para ID, Nome, Morada, Cidade e Tipo
+    tree = ttk.Treeview(janela_tabela, columns=("ID", "Nome", "Morada", "Cidade", "Tipo"), show="headings")
+    tree.heading("ID", text="ID")
+    tree.heading("Nome", text="Nome")
+    tree.heading("Morada", text="Morada")
+    tree.heading("Cidade", text="Cidade")
+    tree.heading("Tipo", text="Tipo")
+
+    # Define larguras para as colunas
+    tree.column("ID", width=50)
+    tree.column("Nome", width=200)
+    tree.column("Morada", width=400)
+    tree.column("Cidade", width=100)
+    tree.column("Tipo", width=100)
+    tree.pack(fill="both", expand=True)
+
+    carregar_tabela(tree)
+
+    # Função que apaga a atração selecionada pelo seu ID
+    def apagar_atracao(id_atracao):
+        resposta = messagebox.askyesno("Confirmar", "Tem certeza que quer apagar esta atração?")
+        if resposta:
+            try:
+                with cursor_bd(commit=True) as cursor:
+                    cursor.execute("DELETE FROM atracoes WHERE id = %s", (id_atracao,))
+                cache_pesquisa.limpar()
+                invalidar_indice_espacial()
+                messagebox.showinfo("Sucesso", "Atração apagada com sucesso.")
+                carregar_tabela(tree)  # Atualiza a tabela após apagar
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao apagar: {e}")
+        else:
+            messagebox.showinfo("Cancelado", "Ação cancelada.")
+
+    # Função chamada ao clicar no botão apagar, que verifica se algo foi selecionado
+    def botao_apagar_click():
+        selecionado = tree.selection()
+        if not selecionado:
+            messagebox.showwarning("Aviso", "Por favor, selecione uma atração para apagar.")
+            return
+        valores = tree.item(selecionado)["values"]
+        if not valores:
+            messagebox.showerror("Erro", "Erro ao obter os dados da seleção.")
+            return
+        id_atracao = valores[0]
+        apagar_atracao(id_atracao)
+
+    # Botão para apagar a atração selecionada na tabela
+    btn_apagar = tk.Button(janela_tabela, text="Apagar Atração Selecionada", command=botao_apagar_click)
+    btn_apagar.pack(pady=10)
+
+# Abre uma janela para planear um dia de visitas: escolhe-se o ponto de partida e as atrações (com horário
+# de abertura opcional, ou sugeridas pela proximidade à partida), e a ordem de visita é otimizada em segundo
+# plano; o resultado entra na lista de itinerários
+def abrir_janela_otimizar_visitas():
+    janela_visitas = tk.Toplevel(janela)
+    janela_visitas.title("Otimizar Visitas")
+    janela_visitas.geometry("420x600")
+    janela_visitas.configure(bg="#f0f4f7")
+
+    frame = tk.Frame(janela_visitas, bg="#f0f4f7")
+    frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+    tk.Label(frame, text="Partida:", bg="#f0f4f7", font=("Arial", 11)).pack(anchor="w")
+    entrada_partida = AutocompleteEntry(fonte_locais, frame, font=("Arial", 11))
+    entrada_partida.pack(fill=tk.X, pady=(0, 5))
+
+    # As atrações são escolhidas uma a uma com o autocomplete (pesquisa no servidor), sem carregar o catálogo
+    tk.Label(frame, text="Atração a visitar:", bg="#f0f4f7", font=("Arial", 11)).pack(anchor="w")
+    entrada_atracao = AutocompleteEntry(fonte_locais, frame, font=("Arial", 11))
+    entrada_atracao.pack(fill=tk.X, pady=(0, 5))
+    tk.Label(frame, text="Horário (opcional, HH:MM-HH:MM):", bg="#f0f4f7", font=("Arial", 11)).pack(anchor="w")
+    frame_horario = tk.Frame(frame, bg="#f0f4f7")
+    frame_horario.pack(fill=tk.X, pady=(0, 5))
+    entrada_horario = tk.Entry(frame_horario, font=("Arial", 11), width=12)
+    entrada_horario.pack(side=tk.LEFT)
+
+    paragens = []       # (nome, (abertura, fecho) ou None), pela ordem em que foram acrescentadas
+    lista = tk.Listbox(frame, height=8, exportselection=False)
+
+    def adicionar_paragem(event=None):
+        nome = entrada_atracao.get().strip()
+        horario = entrada_horario.get().strip()
+        if not nome:
+            return
+        janela_horario = None
+        if horario:
+            horas = re.fullmatch(r"((?:[01]\d|2[0-3]):[0-5]\d)\s*-\s*((?:[01]\d|2[0-3]):[0-5]\d)", horario)
+            if not horas or horas[1] >= horas[2]:
+                messagebox.showerror("Erro", "O horário deve estar no formato HH:MM-HH:MM (abertura antes do fecho).")
+                return
+            janela_horario = horas.groups()
+        if any(existente == nome for existente, _ in paragens):
+            messagebox.showwarning("Repetida", "Essa atração já está na lista.")
+            return
+        acrescentar_paragem(nome, janela_horario)
+        entrada_atracao.delete(0, tk.END)
+        entrada_horario.delete(0, tk.END)
+
+    def acrescentar_paragem(nome, janela_horario=None):
+        paragens.append((nome, janela_horario))
+        lista.insert(tk.END, f"{nome} ({janela_horario[0]}-{janela_horario[1]})" if janela_horario else nome)
+
+    def remover_paragem():
+        for indice in reversed(lista.curselection()):
+            lista.delete(indice)
+            del paragens[indice]
+
+    # Acrescenta as atrações mais próximas da partida (índice espacial, em segundo plano)
+    def sugerir_proximas():
+        partida = entrada_partida.get().strip()
+        if not partida:
+            messagebox.showwarning("Campos obrigatórios", "Escolha primeiro a partida.")
+            return
+
+        def receber(nomes):
+            if isinstance(nomes, str):
+                messagebox.showerror("Erro", nomes)
+            elif not nomes:
+                messagebox.showinfo("Sugerir Próximas", "Não foram encontradas atrações próximas dessa partida.")
+            elif janela_visitas.winfo_exists():
+                for nome in nomes:
+                    if all(existente != nome for existente, _ in paragens):
+                        acrescentar_paragem(nome)
+
+        def procurar(partida, excluir):
+            try:
+                return sugerir_atracoes_proximas(partida, excluir=excluir)
+            except Exception as e:
+                return f"Erro ao procurar atrações próximas: {e}"
+
+        executar_em_segundo_plano(procurar, partida, [nome for nome, _ in paragens], ao_concluir=receber)
+
+    tk.Button(frame_horario, text="Adicionar", command=adicionar_paragem).pack(side=tk.LEFT, padx=5)
+    tk.Button(frame_horario, text="Remover", command=remover_paragem).pack(side=tk.LEFT)
+    tk.Button(frame_horario, text="Sugerir próximas", command=sugerir_proximas).pack(side=tk.LEFT, padx=5)
+    entrada_horario.bind("<Return>", adicionar_paragem)
+    lista.pack(fill=tk.BOTH, expand=True, pady=(0, 5))
+
+    # Data e hora de partida: por omissão as do formulário principal
+    tk.Label(frame, text="Data (DD/MM/AAAA) e hora (HH:MM):", bg="#f0f4f7", font=("Arial", 11)).pack(anchor="w")
+    frame_data = tk.Frame(frame, bg="#f0f4f7")
+    frame_data.pack(fill=tk.X, pady=(0, 5))
+    entrada_dia = tk.Entry(frame_data, font=("Arial", 11), width=12)
+    entrada_dia.insert(0, entrada_data.get().strip() or datetime.now().strftime("%d/%m/%Y"))
+    entrada_dia.pack(side=tk.LEFT)
+    entrada_hora_partida = tk.Entry(frame_data, font=("Arial", 11), width=6)
+    entrada_hora_partida.insert(0, entrada_hora.get().strip() or "09:00")
+    entrada_hora_partida.pack(side=tk.LEFT, padx=5)
+
+    tk.Label(frame, text="Tempo em cada atração (min):", bg="#f0f4f7", font=("Arial", 11)).pack(anchor="w")
+    entrada_visita = tk.Entry(frame, font=("Arial", 11), width=6)
+    entrada_visita.insert(0, "60")
+    entrada_visita.pack(anchor="w", pady=(0, 5))
+
+    # Junta os itinerários planeados à lista e pede as rotas que só foram estimadas
+    def aplicar(resultado):
+        if isinstance(resultado, str):
+            messagebox.showerror("Erro", resultado)
+            return
+        itinerarios_dados.inserir_varios(resultado)
+        # As deslocações seguidas do dia vão num só pedido de rotas
+        pedir_rotas_itinerarios([itinerario for itinerario in resultado if itinerario.distancia_m is None])
+        messagebox.showinfo("Otimizar Visitas", f"Plano com {len(resultado)} deslocação(ões) adicionado.")
+
+    # Corre em segundo plano: os erros (base de dados, atrações desconhecidas) voltam como texto
+    def calcular(nomes, partida, data_hora, tipo, visita_min, janelas):
+        try:
+            return planear_visitas(nomes, partida, data_hora, tipo, visita_min, janelas)
+        except Exception as e:
+            return f"Erro ao otimizar visitas: {e}"
+
+    def otimizar():
+        partida = entrada_partida.get().strip()
+        nomes = [nome for nome, _ in paragens]
+        janelas = {nome: janela_horario for nome, janela_horario in paragens if janela_horario}
+        if not partida or not nomes:
+            messagebox.showwarning("Campos obrigatórios", "Escolha a partida e acrescente pelo menos uma atração.")
+            return
+        try:
+            data_hora = datetime.strptime(f"{entrada_dia.get().strip()} {entrada_hora_partida.get().strip()}",
+                                          "%d/%m/%Y %H:%M")
+            visita_min = int(entrada_visita.get().strip())
+        except ValueError:
+            messagebox.showerror("Erro", "Data, hora ou tempo de visita inválidos.")
+            return
+        executar_em_segundo_plano(calcular, nomes, partida, data_hora, var_tipo.get(), visita_min, janelas or None,
+                                  ao_concluir=aplicar)
+        janela_visitas.destroy()
+
+    tk.Button(frame, text="Otimizar", command=otimizar, bg="#2a4d69", fg="white",
+              font=("Arial", 12, "bold")).pack(pady=10)
+
+# Abre uma janela que importa um ficheiro CSV/JSONL de atrações em segundo plano, mostrando o progresso
+def abrir_janela_importar_atracoes():
+    caminho = filedialog.askopenfilename(filetypes=[("Atrações (CSV/JSONL)", "*.csv *.jsonl *.ndjson"),
+                                                    ("Todos os ficheiros", "*.*")])
+    if not caminho:
+        return
+    caminho_relatorio = os.path.splitext(caminho)[0] + "_rejeitadas.csv"   # Relatório ao lado do ficheiro
+
+    janela_importacao = tk.Toplevel(janela)
+    janela_importacao.title("Importar Atrações")
+    janela_importacao.geometry("420x150")
+    janela_importacao.configure(bg="#f0f4f7")
+    barra = ttk.Progressbar(janela_importacao, maximum=1.0, length=380)
+    barra.pack(pady=(20, 10))
+    etiqueta = tk.Label(janela_importacao, text="A importar…", bg="#f0f4f7")
+    etiqueta.pack()
+
+    cancelar = threading.Event()
+    estado = {"lidas": 0, "inseridas": 0, "ignoradas": 0, "rejeitadas": 0, "fracao": 0.0}
+    resultado = {}      # Preenchido pela thread de importação: "fim" ou "erro"
+
+    # Corre numa thread à parte; só atualiza dicionários (a interface é atualizada pela thread principal)
+    def importar():
+        try:
+            importar_atracoes_ficheiro(caminho, caminho_relatorio=caminho_relatorio,
+                                       progresso=estado.update, cancelar=cancelar)
+            resultado["fim"] = True
+        except Exception as e:
+            resultado["erro"] = e
+
+    # Atualiza a barra de progresso periodicamente até a importação terminar
+    def acompanhar():
+        barra["value"] = estado["fracao"]
+        etiqueta.config(text=f"Lidas: {estado['lidas']}   Inseridas: {estado['inseridas']}   "
+                             f"Ignoradas: {estado['ignoradas']}   Rejeitadas: {estado['rejeitadas']}")
+        if not resultado:
+            janela_importacao.after(200, acompanhar)
+            return
+        if "erro" in resultado:
+            messagebox.showerror("Erro", f"Erro ao importar atrações: {resultado['erro']}")
+        else:
+            mensagem = f"Importação concluída: {estado['inseridas']} atração(ões) inserida(s)."
+            if estado["rejeitadas"]:
+                mensagem += f"\n{estado['rejeitadas']} linha(s) rejeitada(s), ver {caminho_relatorio}"
+            messagebox.showinfo("Importar Atrações", mensagem)
+        janela_importacao.destroy()
+
+    # Fechar a janela a meio cancela a importação (os lotes já gravados ficam na base de dados)
+    janela_importacao.protocol("WM_DELETE_WINDOW", cancelar.set)
+    threading.Thread(target=importar, daemon=True).start()
+    acompanhar()
+
+# Função auxiliar para criar um campo do formulário com um rótulo e um widget (ex: Entry, Text)
+def criar_campo_formulario(label_texto, widget):
+    # Cria um label com o texto fornecido, com estilo e cor de fundo definidos
+    tk.Label(frame_formulario, text=label_texto, bg="#f0f4f7", font=("Arial", 13, "bold")).pack(anchor="w", pady=(5, 0))
+    # Empacota (exibe) o widget fornecido abaixo do label, ocupando toda a largura disponível com margem horizontal
+    widget.pack(fill=tk.X, padx=5)
+
+
+# Cria a janela principal e fica à espera dos eventos até ser fechada
+# Os widgets usados pelas funções acima (formulário, área de texto, ...) ficam em variáveis globais do módulo
+def executar():
+    global janela, frame_formulario, fonte_locais, entrada_local, entrada_cidade, tipos, var_tipo
+    global dropdown_tipo, entrada_data, entrada_hora, entrada_notas, texto_itinerarios, etiqueta_pagina
+    global painel_itinerarios
+
+    # --- Configuração da janela principal ---
+    janela = tk.Tk()
+    janela.title("Formulário de Planeamento de Viagens")
+    janela.geometry("800x600")
+    janela.configure(bg="#f0f4f7")
+
+    # --- Container principal que divide a janela em duas áreas ---
+    container_principal = tk.Frame(janela, bg="#f0f4f7")
+    container_principal.pack(fill=tk.BOTH, expand=False, padx=10, pady=10)
+
+    # Frame do formulário (lado esquerdo)
+    frame_formulario = tk.Frame(container_principal, bg="#f0f4f7")
+    frame_formulario.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
+
+    # Frame dos registos (lado direito)
+    frame_registos = tk.Frame(container_principal, bg="#f0f4f7")
+    frame_registos.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10)
+
+    # --- Cabeçalhos ---
+    tk.Label(frame_formulario, text="📌 Planeamento de Itinerário", font=("Arial", 20, "bold"),
+             bg="#f0f4f7", fg="#2a4d69").pack(pady=10)
+    tk.Label(frame_registos, text="🧾 Itinerários Registados", font=("Arial", 20, "bold"),
+             bg="#f0f4f7", fg="#2a4d69").pack(pady=10)
+
+    # --- Campos do formulário com autocomplete ---
+    fonte_locais = PesquisaAtracoesBD()  # sugestões pedidas ao servidor a cada pesquisa (nada carregado no arranque)
+
+    entrada_local = AutocompleteEntry(fonte_locais, frame_formulario, font=("Arial", 11))
+    criar_campo_formulario("Localização Atual:", entrada_local)
+
+    entrada_cidade = AutocompleteEntry(fonte_locais, frame_formulario, font=("Arial", 11))
+    criar_campo_formulario("Para Onde Deseja Ir:", entrada_cidade)
+
+    # --- Dropdown para tipo ---
+    tipos = ["Cultural", "Desportiva", "Gastronómica", "Outro"]
+    var_tipo = tk.StringVar(value=tipos[0])
+    dropdown_tipo = tk.OptionMenu(frame_formulario, var_tipo, *tipos)
+    dropdown_tipo.config(font=("Arial", 11), width=20)
+    criar_campo_formulario("Tipo de Atividade:", dropdown_tipo)
+
+    # --- Outros campos do formulário ---
+    entrada_data = tk.Entry(frame_formulario, font=("Arial", 11))
+    criar_campo_formulario("Data (DD/MM/YYYY):", entrada_data)
+
+    entrada_hora = tk.Entry(frame_formulario, font=("Arial", 11))
+    criar_campo_formulario("Hora (HH:MM):", entrada_hora)
+
+    entrada_notas = tk.Entry(frame_formulario, font=("Arial", 11))
+    criar_campo_formulario("Notas:", entrada_notas)
+
+    # --- Botão para adicionar itinerário ---
+    tk.Button(frame_formulario, text="Adicionar Itinerário", command=adicionar_itinerario,
+              bg="#2a4d69", fg="white", font=("Arial", 12, "bold")).pack(pady=10)
+
+    # --- Botões para gerenciar atrações ---
+    frame_botoes_atracoes = tk.Frame(frame_formulario, bg="#f0f4f7")
+    frame_botoes_atracoes.pack(pady=10)
+
+    btn_adicionar_atracao = tk.Button(frame_botoes_atracoes, text="Adicionar Atração",
+                                    command=abrir_janela_adicionar_atracao,
+                                    bg="#4CAF50", fg="white", font=("Arial", 12, "bold"))
+    btn_adicionar_atracao.pack(side=tk.LEFT, padx=5)
+
+    btn_apagar_atracao = tk.Button(frame_botoes_atracoes, text="Apagar Atração",
+                                   command=abrir_janela_apagar_atracao,
+                                   bg="#c0392b", fg="white", font=("Arial", 12, "bold"))
+    btn_apagar_atracao.pack(side=tk.LEFT, padx=5)
+
+    btn_importar_atracoes = tk.Button(frame_botoes_atracoes, text="Importar Atrações",
+                                      command=abrir_janela_importar_atracoes,
+                                      bg="#2196F3", fg="white", font=("Arial", 12, "bold"))
+    btn_importar_atracoes.pack(side=tk.LEFT, padx=5)
+
+    btn_otimizar_visitas = tk.Button(frame_botoes_atracoes, text="Otimizar Visitas",
+                                     command=abrir_janela_otimizar_visitas,
+                                     bg="#8e44ad", fg="white", font=("Arial", 12, "bold"))
+    btn_otimizar_visitas.pack(side=tk.LEFT, padx=5)
+
+    # --- Área de texto para mostrar itinerários ---
+    frame_texto = tk.Frame(frame_registos, bg="#f0f4f7")
+    frame_texto.pack(fill=tk.BOTH, expand=True)
+
+    texto_itinerarios = tk.Text(frame_texto, bg="white", font=("Arial", 10), wrap=tk.WORD)
+    texto_itinerarios.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    texto_itinerarios.config(state=tk.DISABLED)
+
+    texto_itinerarios.bind("<Button-1>", clicar_registo)
+
+    # Scrollbar para área de texto
+    scrollbar = tk.Scrollbar(frame_texto, command=texto_itinerarios.yview)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    texto_itinerarios.config(yscrollcommand=scrollbar.set)
+
+    # --- Navegação entre páginas de itinerários (planos muito longos) ---
+    frame_paginas = tk.Frame(frame_registos, bg="#f0f4f7")
+    frame_paginas.pack()
+    etiqueta_pagina = tk.Label(frame_paginas, text="Página 1 de 1", bg="#f0f4f7")
+    painel_itinerarios = PainelItinerarios(texto_itinerarios, itinerarios_dados, etiqueta_pagina)
+    tk.Button(frame_paginas, text="◀", command=lambda: painel_itinerarios.mudar_pagina(-1)).pack(side=tk.LEFT)
+    etiqueta_pagina.pack(side=tk.LEFT, padx=10)
+    tk.Button(frame_paginas, text="▶", command=lambda: painel_itinerarios.mudar_pagina(1)).pack(side=tk.LEFT)
+    # A área de texto acompanha as alterações ao armazém de itinerários (só os blocos afetados)
+    itinerarios_dados.subscrever(painel_itinerarios.ao_alterar)
+
+    # --- Botão para apagar todos os itinerários ---
+    tk.Button(frame_registos, text="Apagar Registos", command=apagar_registos,
+              bg="#c0392b", fg="white", font=("Arial", 12, "bold"), width=18).pack(pady=10)
+
+    # --- Botões para exportar/importar itinerários ---
+    frame_botoes = tk.Frame(frame_registos, bg="#f0f4f7")
+    frame_botoes.pack(pady=10)
+
+    tk.Button(frame_botoes, text="Exportar", command=exportar_itinerarios,
+              bg="#2196F3", fg="white", font=("Arial", 12, "bold"), width=12).pack(side=tk.LEFT, padx=10)
+
+    tk.Button(frame_botoes, text="Importar", command=importar_itinerarios,
+              bg="#2196F3", fg="white", font=("Arial", 12, "bold"), width=12).pack(side=tk.LEFT, padx=10)
+
+    # Itinerários guardados de outros períodos (no arranque só são lidos os de hoje em diante)
+    tk.Button(frame_registos, text="Carregar Período", command=abrir_janela_carregar_periodo,
+              bg="#2196F3", fg="white", font=("Arial", 12, "bold"), width=18).pack()
+
+    # --- Rodapé ---
+    tk.Label(janela, text="Projeto Final Programação Avançada - Grupo 4 ✈️", font=("Arial", 10),
+             bg="#f0f4f7", fg="#888").pack(pady=5)
+
+    # Começa a aplicar os resultados dos pedidos em segundo plano
+    janela.after(50, processar_conclusoes)
+
+    # Inicia o loop principal da interface
+    janela.after(0, carregar_itinerarios_iniciais)      # Itinerários gravados em sessões anteriores
+    janela.mainloop()
+    executor_rotas.shutdown(wait=False, cancel_futures=True)    # Não espera por pedidos pendentes ao sair
+    executor_pesquisas.shutdown(wait=False, cancel_futures=True)
+    gravador_itinerarios.fechar()       # Grava as últimas alterações antes de terminar
+    cache_rotas.fechar()                # Grava os últimos acessos às rotas guardadas
+    estatisticas = estatisticas_maps()
+    if estatisticas is not None:
+        print("Pedidos ao Google Maps:", estatisticas)
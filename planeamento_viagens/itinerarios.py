@@ -0,0 +1,289 @@
+# Modelo dos itinerários: registo Itinerario, armazém ordenado e leitura do formato de texto exportado
+import os                                           # Tamanho dos ficheiros importados (progresso)
+import re                                           # Leitura dos blocos de texto exportados
+import uuid                                         # Identificadores estáveis dos itinerários
+import bisect                                       # Inserção ordenada no armazém
+from datetime import datetime                       # Data/hora de cada itinerário
+
+# --- Itinerários ---
+# Expressões usadas para ler de volta os blocos de texto exportados (compiladas uma única vez)
+PADRAO_CABECALHO = re.compile(r"^📍 De (.*?) até (.*)$")
+PADRAO_CAMPO = re.compile(r"^\s*(Tipo de Atividade|Data|Hora|Distância|Duração|Notas)\s*-\s*(.*)$")
+PADRAO_DISTANCIA = re.compile(r"^(\d+(?:[.,]\d+)?)\s*(km|m)$")
+PADRAO_DURACAO = re.compile(r"(\d+)\s*(dia|dias|hora|horas|h|min|mins|minuto|minutos)\b")
+SEGUNDOS_UNIDADE = {"dia": 86400, "dias": 86400, "hora": 3600, "horas": 3600, "h": 3600,
+                    "min": 60, "mins": 60, "minuto": 60, "minutos": 60}
+TEXTO_A_CALCULAR = "Distância - a calcular…"    # Texto provisório enquanto a rota não chega
+
+# Formata uma distância em metros como a API do Google Maps em pt-pt (ex: "950 m", "1,5 km", "321 km")
+def formatar_distancia(metros):
+    if metros < 1000:
+        return f"{metros} m"
+    if metros < 9950:       # Abaixo de 10 km a API mostra uma casa decimal
+        return f"{metros / 1000:.1f} km".replace(".", ",")
+    return f"{round(metros / 1000)} km"
+
+# Formata uma duração em segundos (ex: "45 min", "1 hora 5 min", "3 horas 9 min", "1 dia 2 horas")
+def formatar_duracao(segundos):
+    minutos = max(1, round(segundos / 60)) if segundos else 0
+    dias, minutos = divmod(minutos, 1440)
+    horas, minutos = divmod(minutos, 60)
+    if dias:
+        return f"{dias} dia{'s' if dias > 1 else ''}" + (f" {horas} hora{'s' if horas != 1 else ''}" if horas else "")
+    if horas:
+        return f"{horas} hora{'s' if horas > 1 else ''}" + (f" {minutos} min" if minutos else "")
+    return f"{minutos} min"
+
+# Converte o texto de uma distância ("321 km", "1,5 km", "950 m") em metros; None se não for reconhecido
+def interpretar_distancia(texto):
+    match = PADRAO_DISTANCIA.match(texto.strip())
+    if not match:
+        return None
+    valor = float(match.group(1).replace(",", "."))      # Decimal com vírgula (ex: "1,5 km")
+    return round(valor * 1000) if match.group(2) == "km" else round(valor)
+
+# Converte o texto de uma duração ("3 horas 9 min", "1 dia 2 horas") em segundos; None se não for reconhecido
+def interpretar_duracao(texto):
+    partes = PADRAO_DURACAO.findall(texto)
+    if not partes:
+        return None
+    return sum(int(valor) * SEGUNDOS_UNIDADE[unidade] for valor, unidade in partes)
+
+# Registo de um itinerário (uma viagem origem -> destino) com campos separados e valores numéricos
+# Usa __slots__ para ocupar pouca memória em planos com milhares de itinerários
+# O texto apresentado ao utilizador só é construído quando é preciso (resumo())
+class Itinerario:
+    __slots__ = ("id", "origem", "destino", "tipo", "data_hora", "distancia_m", "duracao_s", "notas", "estado_rota")
+
+    def __init__(self, origem, destino, tipo, data_hora, notas="", distancia_m=None, duracao_s=None,
+                 estado_rota=None, id=None):
+        self.id = id or uuid.uuid4().hex      # Identificador estável (não depende da posição na lista)
+        self.origem = origem
+        self.destino = destino
+        self.tipo = tipo
+        self.data_hora = data_hora          # datetime de partida
+        self.notas = notas
+        self.distancia_m = distancia_m      # metros (None enquanto a rota não for conhecida)
+        self.duracao_s = duracao_s          # segundos
+        self.estado_rota = estado_rota      # Texto mostrado quando não há rota (a calcular, erro, ...)
+
+    # Chave de ordenação: data/hora e, em caso de empate, o identificador
+    def chave(self):
+        return (self.data_hora, self.id)
+
+    def __lt__(self, outro):
+        return self.chave() < outro.chave()
+
+    # Guarda o resultado de obter_rota (ou None se não houver rota)
+    def definir_rota(self, rota):
+        if rota:
+            self.distancia_m = rota["distancia_m"]
+            self.duracao_s = rota["duracao_s"]
+            self.estado_rota = None
+        else:
+            self.distancia_m = self.duracao_s = None
+            self.estado_rota = "Rota não encontrada."
+
+    # True enquanto a rota não tiver sido obtida: sem distância e sem resultado final ("Rota não encontrada.",
+    # erro); os textos provisórios (a calcular ou só uma estimativa) começam por "Distância - "
+    def rota_pendente(self):
+        return self.distancia_m is None and (self.estado_rota is None or self.estado_rota.startswith("Distância - "))
+
+    # Texto do itinerário tal como é mostrado na interface e exportado para .txt
+    def resumo(self):
+        if self.distancia_m is not None and self.duracao_s is not None:
+            rota_info = f"Distância - {formatar_distancia(self.distancia_m)}\n     " \
+                        f"Duração - {formatar_duracao(self.duracao_s)}"
+        else:
+            rota_info = self.estado_rota or TEXTO_A_CALCULAR
+        texto = (
+            f"📍 De {self.origem} até {self.destino}\n"
+            f"     Tipo de Atividade - Viagem {self.tipo}\n"
+            f"     Data - {self.data_hora:%d/%m/%Y}\n"
+            f"     Hora - {self.data_hora:%H:%M}\n"
+            f"     {rota_info}"
+        )
+        if self.notas:
+            texto += f"\n     Notas - {self.notas}"
+        return texto
+
+    # Cria um itinerário a partir de um bloco de texto exportado (lista de linhas)
+    # Retorna None se o bloco não tiver cabeçalho, data e hora válidos
+    @classmethod
+    def de_texto(cls, linhas):
+        if not linhas:
+            return None
+        cabecalho = PADRAO_CABECALHO.match(linhas[0].strip())
+        if not cabecalho:
+            return None
+        campos = {}
+        estado_rota = None
+        for linha in linhas[1:]:
+            match = PADRAO_CAMPO.match(linha)
+            if match:
+                campos[match.group(1)] = match.group(2).strip()
+            elif linha.strip():
+                estado_rota = linha.strip()         # "Rota não encontrada.", "Erro ao calcular rota: ..."
+        try:
+            data_hora = datetime.strptime(f"{campos['Data']} {campos['Hora']}", "%d/%m/%Y %H:%M")
+        except (KeyError, ValueError):
+            return None
+        tipo = campos.get("Tipo de Atividade", "")
+        if tipo.startswith("Viagem "):
+            tipo = tipo[len("Viagem "):]
+        distancia_m = interpretar_distancia(campos.get("Distância", ""))
+        duracao_s = interpretar_duracao(campos.get("Duração", ""))
+        if distancia_m is None or duracao_s is None:
+            distancia_m = duracao_s = None
+            if campos.get("Distância"):
+                estado_rota = f"Distância - {campos['Distância']}"     # Ex: "a calcular…" quando foi exportado
+        return cls(cabecalho.group(1), cabecalho.group(2), tipo, data_hora, campos.get("Notas", ""),
+                   distancia_m, duracao_s, estado_rota)
+
+
+# Conjunto de itinerários indexado pelo identificador e mantido ordenado por data/hora
+# As inserções/atualizações encontram a posição por pesquisa binária (bisect) em vez de reordenar a lista toda,
+# e cada alteração é comunicada aos ouvintes (interface, gravação, ...) com a posição afetada:
+#   ouvinte("inserido", posicao=, itinerario=)
+#   ouvinte("atualizado", posicao_antiga=, posicao=, itinerario=)
+#   ouvinte("removido", posicao=, itinerario=)
+#   ouvinte("limpo", ids=)                  (ids dos itinerários que a lista tinha)
+#   ouvinte("carregado", itinerarios=)      (vários inseridos de uma vez)
+class ArmazemItinerarios:
+    def __init__(self):
+        self.por_id = {}        # id -> Itinerario
+        self.chaves = []        # (data_hora, id) ordenados; a posição na lista é a posição do itinerário
+        self.ouvintes = []
+
+    def subscrever(self, ouvinte):
+        self.ouvintes.append(ouvinte)
+
+    def _notificar(self, evento, **dados):
+        for ouvinte in self.ouvintes:
+            ouvinte(evento, **dados)
+
+    def __len__(self):
+        return len(self.chaves)
+
+    def __iter__(self):
+        return (self.por_id[id_itinerario] for _, id_itinerario in self.chaves)
+
+    def __getitem__(self, posicao):
+        return self.por_id[self.chaves[posicao][1]]
+
+    def __contains__(self, id_itinerario):
+        return id_itinerario in self.por_id
+
+    def obter(self, id_itinerario):
+        return self.por_id.get(id_itinerario)
+
+    # Posição atual de um itinerário na ordem por data/hora (O(log n))
+    def posicao(self, id_itinerario):
+        return bisect.bisect_left(self.chaves, self.por_id[id_itinerario].chave())
+
+    def inserir(self, itinerario):
+        posicao = bisect.bisect_left(self.chaves, itinerario.chave())
+        self.chaves.insert(posicao, itinerario.chave())
+        self.por_id[itinerario.id] = itinerario
+        self._notificar("inserido", posicao=posicao, itinerario=itinerario)
+
+    # Substitui o itinerário com o mesmo id (pode ser o próprio objeto com a rota preenchida)
+    # Nota: a data/hora não deve ser alterada no objeto guardado; cria-se um novo Itinerario com o mesmo id
+    def atualizar(self, itinerario):
+        posicao_antiga = self.posicao(itinerario.id)
+        del self.chaves[posicao_antiga]
+        posicao = bisect.bisect_left(self.chaves, itinerario.chave())
+        self.chaves.insert(posicao, itinerario.chave())
+        self.por_id[itinerario.id] = itinerario
+        self._notificar("atualizado", posicao_antiga=posicao_antiga, posicao=posicao, itinerario=itinerario)
+
+    def remover(self, id_itinerario):
+        posicao = self.posicao(id_itinerario)
+        del self.chaves[posicao]
+        itinerario = self.por_id.pop(id_itinerario)
+        self._notificar("removido", posicao=posicao, itinerario=itinerario)
+
+    def limpar(self):
+        ids = list(self.por_id)
+        self.por_id.clear()
+        self.chaves.clear()
+        self._notificar("limpo", ids=ids)
+
+    # Junta vários itinerários de uma vez (importação): uma só ordenação e um só evento
+    def inserir_varios(self, itinerarios):
+        itinerarios = list(itinerarios)
+        for itinerario in itinerarios:
+            if itinerario.id in self.por_id:
+                self.chaves.remove(self.por_id[itinerario.id].chave())
+            self.por_id[itinerario.id] = itinerario
+            self.chaves.append(itinerario.chave())
+        self.chaves.sort()
+        self._notificar("carregado", itinerarios=itinerarios)
+
+
+# Escreve os itinerários num ficheiro .txt, no formato mostrado na interface (blocos separados por linhas em branco)
+def escrever_itinerarios_texto(caminho, itinerarios):
+    with open(caminho, "w", encoding="utf-8") as f:
+        for itinerario in itinerarios:
+            f.write(itinerario.resumo() + "\n\n")
+
+# Agrupa itinerários seguidos do mesmo dia que formam uma cadeia (A -> B, B -> C, C -> D, ...), para que as
+# rotas de cada cadeia possam ser pedidas de uma só vez; recebe os itinerários pela ordem em que são feitos
+# e gera listas de itinerários (um itinerário isolado forma uma lista com um só elemento)
+def agrupar_encadeados(itinerarios):
+    grupo = []
+    for itinerario in itinerarios:
+        if grupo and (itinerario.data_hora.date() != grupo[-1].data_hora.date()
+                      or itinerario.origem.strip().lower() != grupo[-1].destino.strip().lower()):
+            yield grupo
+            grupo = []
+        grupo.append(itinerario)
+    if grupo:
+        yield grupo
+
+# Divide um ficheiro de itinerários exportados em blocos (separados por linhas em branco) sem o ler todo
+# "ficheiro" é aberto em modo binário para se poder saber a posição (progresso); gera (numero_linha, linhas)
+def ler_blocos_itinerarios(ficheiro):
+    bloco = []
+    inicio = 0
+    for numero, linha in enumerate(ficheiro, start=1):
+        texto = linha.decode("utf-8", errors="replace").lstrip("﻿").rstrip("\r\n")
+        if texto.strip():
+            if not bloco:
+                inicio = numero
+            bloco.append(texto)
+        elif bloco:
+            yield inicio, bloco
+            bloco = []
+    if bloco:
+        yield inicio, bloco
+
+# Lê um ficheiro .txt exportado e entrega os itinerários em lotes: entregar(lote, estado)
+# Pensada para correr numa thread à parte; cancelar (threading.Event) interrompe a leitura
+# O estado tem importados/ignorados, as primeiras linhas dos blocos ignorados e a fração lida do ficheiro
+def importar_itinerarios_texto(caminho, entregar, tamanho_lote=500, cancelar=None):
+    tamanho_ficheiro = os.path.getsize(caminho) or 1
+    estado = {"importados": 0, "ignorados": 0, "linhas_ignoradas": [], "fracao": 0.0}
+    lote = []
+    with open(caminho, "rb") as f:
+        for numero, linhas in ler_blocos_itinerarios(f):
+            if cancelar is not None and cancelar.is_set():
+                break
+            itinerario = Itinerario.de_texto(linhas)
+            if itinerario is None:
+                estado["ignorados"] += 1
+                if len(estado["linhas_ignoradas"]) < 20:     # Guarda só alguns exemplos para o relatório
+                    estado["linhas_ignoradas"].append(numero)
+                continue
+            lote.append(itinerario)
+            if len(lote) >= tamanho_lote:
+                estado["importados"] += len(lote)
+                estado["fracao"] = min(1.0, f.tell() / tamanho_ficheiro)
+                entregar(lote, dict(estado))
+                lote = []
+    if lote:
+        estado["importados"] += len(lote)
+        estado["fracao"] = 1.0
+        entregar(lote, dict(estado))
+    estado["fracao"] = 1.0
+    return estado
@@ -0,0 +1,266 @@
+# Instrumentação: tempos (histogramas), contadores, taxas de acerto das caches e registo de operações lentas
+# Desligada por omissão: cada função medida custa só uma verificação de um atributo até ser ativada
+# (variável de ambiente METRICAS=1 ou ativar_metricas()); os resultados podem ser gravados em JSON ou no
+# formato de texto do Prometheus, num ficheiro ou servidos num endereço HTTP local
+import os                                           # Configuração pelo ambiente e gravação atómica
+import sys                                          # Aviso das operações lentas
+import json                                         # Exportação em JSON
+import time                                         # Cronómetro (perf_counter) e instantes das operações lentas
+import bisect                                       # Intervalo do histograma de cada medição
+import functools                                    # Decorador que mantém o nome da função medida
+import threading                                    # Lock dos contadores e servidor HTTP em segundo plano
+from collections import deque                       # Últimas operações lentas
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Métricas ---
+# Limites superiores (segundos) dos intervalos dos histogramas de duração
+LIMITES_HISTOGRAMA = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# A partir de quantos segundos uma operação é registada como lenta, pelo prefixo do nome (o mais longo ganha)
+LIMITES_LENTAS = {
+    "": 0.5,
+    "bd.": 0.2,             # Uma consulta MySQL acima disto já se nota na interface
+    "maps.": 1.5,
+    "rotas.": 2.0,
+    "interface.": 0.1,      # Tudo o que corre na thread da interface bloqueia a janela
+}
+MAX_LENTAS = 200            # Número de operações lentas guardadas (as mais antigas são esquecidas)
+
+# Estatísticas de duração de uma operação: histograma, total, número de chamadas e máximo
+class _Duracoes:
+    __slots__ = ("intervalos", "soma", "total", "maximo", "erros")
+
+    def __init__(self):
+        self.intervalos = [0] * (len(LIMITES_HISTOGRAMA) + 1)      # O último é "acima do maior limite"
+        self.soma = 0.0
+        self.total = 0
+        self.maximo = 0.0
+        self.erros = 0
+
+# Guarda todas as medições do processo (partilhado pelas threads)
+class RegistoMetricas:
+    def __init__(self, ativo=False):
+        self.ativo = ativo
+        self.lock = threading.Lock()
+        self.limpar()
+
+    def limpar(self):
+        with self.lock:
+            self.duracoes = {}          # nome -> _Duracoes
+            self.contadores = {}        # nome -> valor
+            self.caches = {}            # nome -> [acertos, falhas]
+            self.lentas = deque(maxlen=MAX_LENTAS)
+            self.inicio = time.time()
+
+    # Limite de operação lenta para um nome (ex: "bd.ler_todas_atracoes" usa o de "bd.")
+    @staticmethod
+    def limite_lenta(nome):
+        prefixo = max((p for p in LIMITES_LENTAS if nome.startswith(p)), key=len)
+        return LIMITES_LENTAS[prefixo]
+
+    def registar_duracao(self, nome, segundos, erro=False):
+        with self.lock:
+            duracoes = self.duracoes.get(nome)
+            if duracoes is None:
+                duracoes = self.duracoes[nome] = _Duracoes()
+            duracoes.intervalos[bisect.bisect_left(LIMITES_HISTOGRAMA, segundos)] += 1
+            duracoes.soma += segundos
+            duracoes.total += 1
+            duracoes.maximo = max(duracoes.maximo, segundos)
+            if erro:
+                duracoes.erros += 1
+        if segundos >= self.limite_lenta(nome):
+            self.lentas.append({"instante": datetime.now().isoformat(timespec="milliseconds"), "operacao": nome,
+                                "segundos": round(segundos, 6), "thread": threading.current_thread().name})
+            print(f"Operação lenta: {nome} demorou {segundos:.3f} s", file=sys.stderr)
+
+    def contar(self, nome, quantidade=1):
+        with self.lock:
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def contar_cache(self, nome, acertos=0, falhas=0):
+        with self.lock:
+            valores = self.caches.setdefault(nome, [0, 0])
+            valores[0] += acertos
+            valores[1] += falhas
+
+    # Fotografia das métricas num dicionário serializável em JSON
+    def para_dict(self):
+        with self.lock:
+            operacoes = {}
+            for nome, d in sorted(self.duracoes.items()):
+                operacoes[nome] = {
+                    "chamadas": d.total, "erros": d.erros, "soma_s": round(d.soma, 6),
+                    "media_ms": round(d.soma / d.total * 1000, 3) if d.total else 0.0,
+                    "max_ms": round(d.maximo * 1000, 3),
+                    "histograma": {("+Inf" if i == len(LIMITES_HISTOGRAMA) else str(LIMITES_HISTOGRAMA[i])): n
+                                   for i, n in enumerate(d.intervalos) if n},
+                }
+            caches = {nome: {"acertos": a, "falhas": f, "taxa_acertos": round(a / (a + f), 4) if a + f else None}
+                      for nome, (a, f) in sorted(self.caches.items())}
+            return {"criado": datetime.now().isoformat(timespec="seconds"),
+                    "desde": datetime.fromtimestamp(self.inicio).isoformat(timespec="seconds"),
+                    "ativo": self.ativo, "operacoes": operacoes, "contadores": dict(sorted(self.contadores.items())),
+                    "caches": caches, "lentas": list(self.lentas)}
+
+    # Métricas no formato de texto do Prometheus (histogramas cumulativos, contadores e taxas das caches)
+    def para_prometheus(self):
+        dados = self.para_dict()
+        linhas = ["# HELP planeamento_duracao_segundos Duração das operações medidas.",
+                  "# TYPE planeamento_duracao_segundos histogram"]
+        with self.lock:
+            duracoes = sorted((nome, list(d.intervalos), d.soma, d.total) for nome, d in self.duracoes.items())
+        for nome, intervalos, soma, total in duracoes:
+            etiqueta = f'operacao="{_escapar_etiqueta(nome)}"'
+            acumulado = 0
+            for limite, quantidade in zip(LIMITES_HISTOGRAMA + (float("inf"),), intervalos):
+                acumulado += quantidade
+                texto_limite = "+Inf" if limite == float("inf") else repr(limite)
+                linhas.append(f'planeamento_duracao_segundos_bucket{{{etiqueta},le="{texto_limite}"}} {acumulado}')
+            linhas.append(f"planeamento_duracao_segundos_sum{{{etiqueta}}} {soma!r}")
+            linhas.append(f"planeamento_duracao_segundos_count{{{etiqueta}}} {total}")
+        linhas += ["# HELP planeamento_erros_total Operações medidas que terminaram com erro.",
+                   "# TYPE planeamento_erros_total counter"]
+        linhas += [f'planeamento_erros_total{{operacao="{_escapar_etiqueta(nome)}"}} {valores["erros"]}'
+                   for nome, valores in dados["operacoes"].items()]
+        linhas += ["# HELP planeamento_eventos_total Contadores de eventos.", "# TYPE planeamento_eventos_total counter"]
+        linhas += [f'planeamento_eventos_total{{evento="{_escapar_etiqueta(nome)}"}} {valor}'
+                   for nome, valor in dados["contadores"].items()]
+        linhas += ["# HELP planeamento_cache_pedidos_total Consultas às caches, por resultado.",
+                   "# TYPE planeamento_cache_pedidos_total counter"]
+        for nome, valores in dados["caches"].items():
+            for resultado in ("acertos", "falhas"):
+                linhas.append(f'planeamento_cache_pedidos_total{{cache="{_escapar_etiqueta(nome)}",'
+                              f'resultado="{resultado}"}} {valores[resultado]}')
+        linhas += ["# HELP planeamento_cache_taxa_acertos Fração das consultas respondidas pela cache.",
+                   "# TYPE planeamento_cache_taxa_acertos gauge"]
+        linhas += [f'planeamento_cache_taxa_acertos{{cache="{_escapar_etiqueta(nome)}"}} {valores["taxa_acertos"]}'
+                   for nome, valores in dados["caches"].items() if valores["taxa_acertos"] is not None]
+        linhas += ["# HELP planeamento_operacoes_lentas Operações lentas guardadas no registo.",
+                   "# TYPE planeamento_operacoes_lentas gauge", f"planeamento_operacoes_lentas {len(dados['lentas'])}"]
+        return "\n".join(linhas) + "\n"
+
+# Escapa um valor de etiqueta do Prometheus (barras, aspas e mudanças de linha)
+def _escapar_etiqueta(texto):
+    return texto.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+registo_metricas = RegistoMetricas(ativo=os.environ.get("METRICAS", "") not in ("", "0"))
+
+# Liga ou desliga a recolha de métricas
+def ativar_metricas(ativo=True):
+    registo_metricas.ativo = ativo
+
+def metricas_ativas():
+    return registo_metricas.ativo
+
+# Decorador que mede a duração (e os erros) de cada chamada da função com o nome indicado
+# Desligado, a função original é chamada diretamente depois de uma única verificação
+def medido(nome):
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not registo_metricas.ativo:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            erro = True
+            try:
+                resultado = funcao(*args, **kwargs)
+                erro = False
+                return resultado
+            finally:
+                registo_metricas.registar_duracao(nome, time.perf_counter() - inicio, erro)
+        return envolvida
+    return decorador
+
+# Gestor de contexto que mede um bloco de código: with cronometrar("interface.importar"): ...
+class _Cronometro:
+    __slots__ = ("nome", "inicio")
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo_erro, erro, traceback):
+        registo_metricas.registar_duracao(self.nome, time.perf_counter() - self.inicio, tipo_erro is not None)
+        return False
+
+# Gestor de contexto sem efeito, usado quando as métricas estão desligadas
+class _SemMedicao:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, traceback):
+        return False
+
+_SEM_MEDICAO = _SemMedicao()
+
+def cronometrar(nome):
+    return _Cronometro(nome) if registo_metricas.ativo else _SEM_MEDICAO
+
+# Soma um valor a um contador (ex: pedidos agrupados, linhas inseridas)
+def contar(nome, quantidade=1):
+    if registo_metricas.ativo:
+        registo_metricas.contar(nome, quantidade)
+
+# Regista acertos/falhas de uma cache (a taxa de acertos é calculada na exportação)
+def contar_cache(nome, acertos=0, falhas=0):
+    if registo_metricas.ativo:
+        registo_metricas.contar_cache(nome, acertos, falhas)
+
+# Grava as métricas num ficheiro: Prometheus se terminar em ".prom", senão JSON
+# Escreve primeiro num ficheiro temporário, para quem lê o ficheiro nunca ver uma versão incompleta
+def gravar_metricas(caminho):
+    if caminho.lower().endswith(".prom"):
+        texto = registo_metricas.para_prometheus()
+    else:
+        texto = json.dumps(registo_metricas.para_dict(), ensure_ascii=False, indent=2) + "\n"
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        f.write(texto)
+    os.replace(temporario, caminho)
+
+# Responde a GET /metrics (Prometheus) e GET /metrics.json
+class _PedidoMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            corpo, tipo = registo_metricas.para_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/metrics.json":
+            corpo, tipo = json.dumps(registo_metricas.para_dict(), ensure_ascii=False), "application/json"
+        else:
+            self.send_error(404)
+            return
+        dados = corpo.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, formato, *args):
+        pass        # Sem uma linha no terminal por cada leitura das métricas
+
+# Serve as métricas em http://endereco:porta/metrics numa thread em segundo plano; retorna o servidor
+# (por omissão só aceita ligações da própria máquina)
+def iniciar_servidor_metricas(porta, endereco="127.0.0.1"):
+    servidor = ThreadingHTTPServer((endereco, porta), _PedidoMetricas)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="metricas-http", daemon=True).start()
+    return servidor
+
+# Aplica a configuração das variáveis de ambiente: METRICAS_PORTA inicia o servidor HTTP
+# (e ativa as métricas); retorna o caminho de METRICAS_FICHEIRO, onde gravar no fim, ou None
+def configurar_metricas_ambiente():
+    caminho = os.environ.get("METRICAS_FICHEIRO") or None
+    porta = os.environ.get("METRICAS_PORTA")
+    if caminho or porta:
+        ativar_metricas()
+    if porta:
+        try:
+            servidor = iniciar_servidor_metricas(int(porta))
+            print(f"Métricas em http://127.0.0.1:{servidor.server_address[1]}/metrics", file=sys.stderr)
+        except (ValueError, OSError) as err:
+            print(f"Erro ao iniciar o servidor de métricas: {err}", file=sys.stderr)
+    return caminho
@@ -0,0 +1,390 @@
+# Otimização da ordem de visita das atrações de um dia (o NumPy só é importado quando é usado)
+from datetime import timedelta
+from .bd import cursor_bd
+from .espacial import obter_indice_espacial
+from .itinerarios import Itinerario
+from .metricas import medido
+from .rotas import estimador_rotas
+from .util import ModuloPreguicoso, blocos
+
+np = ModuloPreguicoso("numpy")                      # Matrizes de distâncias
+
+# --- Otimização da ordem das visitas ---
+# Dado um ponto de partida e um conjunto de atrações, procura uma ordem de visita quase ótima:
+# semente pelo vizinho mais próximo e melhoria local 2-opt e Or-opt sobre uma matriz NumPy de durações.
+# As durações vêm da tabela distancias; os pares em falta são estimados a partir dos conhecidos,
+# por isso a procura nunca faz pedidos à API do Google Maps.
+PENALIZACAO_ATRASO = 10     # Cada segundo de chegada depois do fecho conta como 10 segundos de viagem
+CANDIDATOS_JANELAS = (32, 128)     # Com janelas, alterações simuladas por iteração, em duas rondas (ver _aplicar_melhor)
+LIMITE_SEMENTE = 10         # Com janelas, sementes que começam mais de 10 vezes pior do que a melhor são ignoradas
+
+# Lê da tabela distancias as durações (s) e distâncias (m) entre as atrações indicadas (por id)
+# Retorna duas matrizes n x n com NaN nos pares que ainda não foram calculados
+@medido("bd.ler_matriz_atracoes")
+def ler_matriz_atracoes(ids):
+    n = len(ids)
+    duracoes = np.full((n, n), np.nan)
+    distancias = np.full((n, n), np.nan)
+    np.fill_diagonal(duracoes, 0)
+    np.fill_diagonal(distancias, 0)
+    indice = {id_atracao: i for i, id_atracao in enumerate(ids)}
+    with cursor_bd() as cursor:
+        for bloco in blocos(list(ids), 500):
+            marcadores = ", ".join(["%s"] * len(bloco))
+            cursor.execute(f"SELECT id_origem, id_destino, distancia_m, duracao_s FROM distancias "
+                           f"WHERE id_origem IN ({marcadores}) AND duracao_s IS NOT NULL", bloco)
+            for id_origem, id_destino, distancia_m, duracao_s in cursor.fetchall():
+                if id_destino in indice:
+                    duracoes[indice[id_origem], indice[id_destino]] = duracao_s
+                    distancias[indice[id_origem], indice[id_destino]] = distancia_m
+    return duracoes, distancias
+
+# Preenche os pares em falta de uma matriz com o menor entre o sentido inverso e o caminho mais curto
+# através de pares conhecidos (Floyd-Warshall vetorizado); os valores conhecidos não são alterados e o
+# que continuar sem ligação fica com o dobro do maior valor. Retorna (matriz completa, máscara dos estimados)
+def estimar_matriz(matriz):
+    estimados = np.isnan(matriz)
+    completa = np.where(estimados, matriz.T, matriz)
+    if estimados.any():
+        caminhos = np.where(np.isnan(completa), np.inf, completa)
+        for k in range(len(caminhos)):
+            np.minimum(caminhos, caminhos[:, k, None] + caminhos[None, k, :], out=caminhos)
+        completa = np.where(estimados, caminhos, completa)
+    finitos = completa[np.isfinite(completa)]
+    maximo = finitos.max() if finitos.size else 0
+    completa[np.isinf(completa)] = 2 * maximo if maximo else 3600
+    return completa, estimados
+
+# Simula o percurso e retorna (custo, chegadas): o custo é o tempo total até à última visita
+# (viagens, esperas e visitas) mais a penalização por chegar depois do fecho das janelas
+# ordem inclui o ponto de partida na posição 0; partida, visita e janelas estão em segundos
+def avaliar_ordem(ordem, duracoes, partida=0, visita=None, janelas=None):
+    tempo = partida
+    atraso = 0
+    chegadas = [partida]
+    for anterior, atual in zip(ordem, ordem[1:]):
+        tempo += duracoes[anterior, atual] + (visita[anterior] if visita is not None else 0)
+        if janelas is not None and janelas[atual] is not None:
+            abertura, fecho = janelas[atual]
+            tempo = max(tempo, abertura)            # Chegou antes de abrir: espera
+            atraso += max(0, tempo - fecho)
+        chegadas.append(tempo)
+    return tempo - partida + PENALIZACAO_ATRASO * atraso, chegadas
+
+# Chegadas (s) a cada posição de várias ordens de uma vez (uma ordem por linha; abertura é -inf sem janela)
+# Sem ciclo pelas posições: a chegada à posição u é S[u] + max(abertura[v] - S[v]) para v <= u, em que
+# S são as viagens acumuladas (com as visitas) e a partida conta como a abertura da posição 0
+def _chegadas(ordens, duracoes, partida, visita, abertura):
+    viagens = duracoes[ordens[..., :-1], ordens[..., 1:]] + visita[ordens[..., :-1]]
+    acumuladas = np.concatenate((np.zeros(ordens.shape[:-1] + (1,)), np.cumsum(viagens, axis=-1)), axis=-1)
+    aberturas = abertura[ordens]
+    aberturas[..., 0] = partida
+    return acumuladas + np.maximum.accumulate(aberturas - acumuladas, axis=-1)
+
+# Custo (o mesmo de avaliar_ordem) de várias ordens de uma vez: ordens é uma matriz com uma ordem por linha;
+# abertura/fecho são -inf/inf sem janela
+def _avaliar_ordens(ordens, duracoes, partida, visita, abertura, fecho):
+    chegadas = _chegadas(ordens, duracoes, partida, visita, abertura)
+    atraso = np.maximum(0, chegadas[:, 1:] - fecho[ordens[:, 1:]]).sum(axis=1)
+    return chegadas[:, -1] - partida + PENALIZACAO_ATRASO * atraso
+
+# Estado do percurso usado para estimar o custo das alterações com janelas (por posição da ordem):
+# chegadas, atrasos (s depois do fecho), pesos e fecho da janela. O peso de uma posição é quanto o custo
+# aumenta por cada segundo de atraso na chegada a ela: conta a penalização se já chegar depois do fecho
+# e passa às posições seguintes até uma em que se espera pela abertura (a espera absorve o atraso);
+# tem mais um elemento no fim, com peso 1 (o fim do percurso)
+def _estado_percurso(ordem, duracoes, partida, visita, abertura, fecho):
+    ordem = np.asarray(ordem)
+    n = len(ordem)
+    chegadas = _chegadas(ordem, duracoes, partida, visita, abertura)
+    fechos = fecho[ordem]
+    atrasos = np.maximum(0, chegadas - fechos)
+    atrasos[0] = 0                                  # A janela da partida não conta (como em avaliar_ordem)
+    # Esperou pela abertura: chegaria antes dela vindo da posição anterior
+    livres = np.zeros(n + 1, dtype=bool)
+    livres[1:n] = chegadas[:-1] + duracoes[ordem[:-1], ordem[1:]] + visita[ordem[:-1]] < abertura[ordem[1:]]
+    # Peso = penalizações acumuladas até à próxima posição com espera (exclusive), mais 1 se não houver nenhuma
+    restantes = np.append(np.cumsum((PENALIZACAO_ATRASO * (atrasos > 0))[::-1])[::-1], 0)
+    proxima = np.minimum.accumulate(np.where(livres, np.arange(n + 1), n)[::-1])[::-1]
+    proxima = np.append(proxima[1:], n)
+    pesos = restantes - restantes[proxima] + (proxima == n)
+    return chegadas, atrasos, pesos, fechos
+
+# Semente: a partir do início, visita sempre a atração que se alcança (ou abre) mais cedo;
+# com janelas dá prioridade às que fecham antes
+def _vizinho_mais_proximo(duracoes, inicio, partida, visita, janelas):
+    n = len(duracoes)
+    por_visitar = np.ones(n, dtype=bool)
+    por_visitar[inicio] = False
+    abertura = np.array([j[0] if j else -np.inf for j in janelas]) if janelas is not None else None
+    fecho = np.array([j[1] if j else np.inf for j in janelas]) if janelas is not None else None
+    ordem = [inicio]
+    tempo = partida
+    while por_visitar.any():
+        atual = ordem[-1]
+        chegada = tempo + duracoes[atual] + (visita[atual] if visita is not None else 0)
+        if abertura is not None:
+            chegada = np.maximum(chegada, abertura)
+            custo = chegada - tempo + PENALIZACAO_ATRASO * np.maximum(0, chegada - fecho)
+        else:
+            custo = chegada - tempo
+        custo = np.where(por_visitar, custo, np.inf)
+        seguinte = int(np.argmin(custo))
+        ordem.append(seguinte)
+        por_visitar[seguinte] = False
+        tempo = chegada[seguinte]
+    return ordem
+
+# Melhoria 2-opt (inverte um troço) num percurso aberto com o início fixo
+# Avalia todas as inversões de uma vez com NumPy e suporta matrizes assimétricas:
+# o custo interno do troço invertido é calculado com somas acumuladas nos dois sentidos
+# Com janelas, estado(ordem) dá as chegadas, atrasos e pesos do percurso atual (ver _estado_percurso)
+def _dois_opt(ordem, m, escolher, estado=None):
+    melhorou = False
+    n = len(ordem)
+    i = np.arange(1, n - 1)                         # Inverte as posições i..j (a posição n é o nó final fictício)
+    j = np.arange(1, n)
+    validos = j[None, :] > i[:, None]
+    if estado is not None:
+        # Índices (na matriz achatada de somas por antidiagonal, ver abaixo) das somas das linhas i..j na coluna i + j
+        fim = (j[None, :] + 1) * (2 * n) + (i[:, None] + j[None, :])
+        inicio = i[:, None] * (2 * n) + (i[:, None] + j[None, :])
+    while True:
+        r = np.array(ordem + [len(m) - 1])          # Nó final fictício (custo zero de e para todos)
+        frente = np.concatenate(([0], np.cumsum(m[r[:-1], r[1:]])))
+        tras = np.concatenate(([0], np.cumsum(m[r[1:], r[:-1]])))
+        delta = (m[r[i - 1]][:, r[j]] + m[r[i]][:, r[j + 1]] - m[r[i - 1], r[i]][:, None] - m[r[j], r[j + 1]][None, :]
+                 + (tras[j][None, :] - tras[i][:, None]) - (frente[j][None, :] - frente[i][:, None]))
+        estimativa = None
+        if estado is not None:
+            chegadas, atrasos, pesos, fecho = estado(ordem)
+            # O nó da posição p passa para a posição i + j - p e o seu atraso é estimado com a chegada atual
+            # dessa posição; para somar ao longo das antidiagonais (p + q = i + j) a linha p da matriz
+            # atraso_em[p, q] é deslocada p colunas para a direita, e cada antidiagonal fica numa coluna
+            atraso_em = np.maximum(0, chegadas[None, :] - fecho[:, None])
+            deslocada = np.concatenate((atraso_em, np.zeros((n, n + 1))), axis=1).ravel()[:2 * n * n]
+            acumulada = np.concatenate((np.zeros(2 * n), np.cumsum(deslocada.reshape(n, 2 * n), axis=0).ravel()))
+            atraso_total = np.concatenate(([0], np.cumsum(atrasos)))
+            novo_atraso = (acumulada.take(fim) - acumulada.take(inicio)
+                           - (atraso_total[j + 1][None, :] - atraso_total[i][:, None]))
+            estimativa = np.where(validos, delta * pesos[j + 1][None, :] + PENALIZACAO_ATRASO * novo_atraso, np.inf)
+        delta = np.where(validos, delta, np.inf)
+        if not _aplicar_melhor(delta, escolher, lambda a, b: _inverter(r[:-1], a, b), ordem, estimativa):
+            return melhorou
+        melhorou = True
+
+# Melhoria Or-opt: move um troço de 1 a 3 atrações (sem o inverter) para outra posição
+def _or_opt(ordem, m, escolher, estado=None):
+    melhorou = False
+    continuar = True
+    while continuar:
+        continuar = False
+        for tamanho in (1, 2, 3):
+            r = np.array(ordem + [len(m) - 1])
+            inicios = np.arange(1, len(r) - tamanho)[:, None]      # Primeiro nó do troço
+            if inicios.size == 0:
+                continue
+            anterior, primeiro = r[inicios - 1], r[inicios]
+            ultimo, seguinte = r[inicios + tamanho - 1], r[inicios + tamanho]
+            ganho = m[anterior, primeiro] + m[ultimo, seguinte] - m[anterior, seguinte]
+            k = np.arange(0, len(r) - 1)[None, :]                  # Inserir entre r[k] e r[k + 1]
+            custo = m[r[k], primeiro] + m[ultimo, r[k + 1]] - m[r[k], r[k + 1]]
+            validos = (k < inicios - 1) | (k >= inicios + tamanho)
+            delta = np.where(validos, custo - ganho, np.inf)
+            estimativa = None
+            if estado is not None:
+                chegadas, atrasos, pesos, fecho = estado(ordem)
+                atrasadas = np.concatenate(([0], np.cumsum(atrasos > 0)))     # Posições atrasadas antes de cada uma
+                para_tras = k < inicios - 1
+                # Levar o troço para trás atrasa (em "custo") os nós entre k + 1 e o troço; levá-lo para a frente
+                # adianta (em "ganho") os nós entre o troço e k. O troço passa a chegar logo a seguir a r[k]
+                saida = np.where(para_tras, chegadas[k], chegadas[k] - ganho)
+                desvio = saida + m[r[k], primeiro] - chegadas[inicios]
+                entre = np.where(para_tras, atrasadas[inicios] - atrasadas[np.minimum(k + 1, inicios)],
+                                 atrasadas[np.maximum(k + 1, inicios + tamanho)] - atrasadas[inicios + tamanho])
+                novo_atraso = np.where(para_tras, custo, -ganho) * entre
+                for q in range(tamanho):
+                    novo_atraso = novo_atraso + np.maximum(0, chegadas[inicios + q] + desvio - fecho[inicios + q]) \
+                        - atrasos[inicios + q]
+                depois = np.where(para_tras, inicios + tamanho, k + 1)
+                estimativa = np.where(validos, (custo - ganho) * pesos[depois] + PENALIZACAO_ATRASO * novo_atraso,
+                                      np.inf)
+
+            if _aplicar_melhor(delta, escolher, lambda a, b, tamanho=tamanho: _mover(r[:-1], a, b, tamanho),
+                               ordem, estimativa):
+                melhorou = continuar = True
+    return melhorou
+
+# Ordens obtidas invertendo, para cada par (a[c], b[c]), as posições a + 1 .. b + 1 de "ordem" (uma por linha)
+def _inverter(ordem, a, b):
+    p = np.arange(len(ordem))[None, :]
+    a, b = a[:, None], b[:, None]
+    return ordem[np.where((p > a) & (p <= b + 1), a + b + 2 - p, p)]
+
+# Ordens obtidas movendo, para cada par (a[c], b[c]), o troço de "tamanho" nós que começa na posição a + 1
+# para depois da posição b (com b < a o troço vai para trás, com b > a para a frente)
+def _mover(ordem, a, b, tamanho):
+    p = np.arange(len(ordem))[None, :]
+    a, b = a[:, None], b[:, None]
+    para_tras = b < a
+    return ordem[np.select([para_tras & (p > b) & (p <= b + tamanho),              # O troço, no novo lugar
+                            para_tras & (p > b + tamanho) & (p <= a + tamanho),    # Os nós que ele passou
+                            ~para_tras & (p > a) & (p <= b - tamanho),
+                            ~para_tras & (p > b - tamanho) & (p <= b)],
+                           [p + a - b, p - tamanho, p + tamanho, p + a - b + tamanho], p)]
+
+# Aplica (no lugar) a melhor alteração e retorna True se alguma melhorar o percurso
+# construir(a, b) devolve as ordens (uma por linha) das alterações nas posições (a[c], b[c]) da matriz delta
+# Sem janelas horárias (escolher None) o delta é a variação exata do custo e aplica-se o menor negativo;
+# com janelas o delta ignora esperas e atrasos (uma alteração que aumenta a viagem pode acabar com um
+# atraso), por isso "escolher" compara o custo completo de uma lista curta de alterações: as de menor
+# custo estimado (com atrasos) e as de menor delta; se nenhuma melhorar, tenta uma lista maior
+def _aplicar_melhor(delta, escolher, construir, ordem, estimativa=None):
+    if delta.size == 0:
+        return False
+    if escolher is None:
+        posicao = int(np.argmin(delta))
+        if not delta.flat[posicao] < -1e-9:
+            return False
+        a, b = np.unravel_index([posicao], delta.shape)
+        ordem[:] = construir(a, b)[0].tolist()
+        return True
+    vistas = np.zeros(0, dtype=np.intp)
+    for limite in CANDIDATOS_JANELAS:
+        posicoes = _menores(delta, limite)
+        if estimativa is not None:
+            posicoes = np.union1d(posicoes, _menores(estimativa, limite))
+        por_ver = np.setdiff1d(posicoes, vistas)
+        if por_ver.size:
+            novas = construir(*np.unravel_index(por_ver, delta.shape))
+            melhor = escolher(novas)
+            if melhor is not None:
+                ordem[:] = novas[melhor].tolist()
+                return True
+        vistas = posicoes
+    return False
+
+# Posições (no array achatado) dos k menores valores finitos
+def _menores(valores, k):
+    valores = valores.ravel()
+    posicoes = np.argpartition(valores, k)[:k] if k < valores.size else np.arange(valores.size)
+    return posicoes[np.isfinite(valores[posicoes])]
+
+# Procura uma boa ordem de visita. duracoes: matriz n x n (s) sem valores em falta; inicio: índice da partida;
+# partida: instante de partida (s); visita: tempo gasto em cada atração (s); janelas: (abertura, fecho) ou None
+# por atração. Retorna (ordem, custo, chegadas), com a ordem a começar no índice de partida
+def otimizar_ordem(duracoes, inicio=0, partida=0, visita=None, janelas=None):
+    n = len(duracoes)
+    if n <= 2:
+        ordem = [inicio] + [i for i in range(n) if i != inicio]
+        return (ordem,) + tuple(avaliar_ordem(ordem, duracoes, partida, visita, janelas))
+    # Matriz alargada com um nó final fictício; o tempo de visita da origem soma-se às viagens que saem dela
+    m = np.zeros((n + 1, n + 1))
+    m[:n, :n] = duracoes + (visita[:, None] if visita is not None else 0)
+    m[np.arange(n), np.arange(n)] = 0
+    ordem = _vizinho_mais_proximo(duracoes, inicio, partida, visita, janelas)
+    if janelas is None:
+        # Sem janelas o delta da matriz já é a variação exata do custo
+        while _dois_opt(ordem, m, None) | _or_opt(ordem, m, None):
+            pass
+        return (ordem,) + tuple(avaliar_ordem(ordem, duracoes, partida, visita, janelas))
+    abertura = np.array([j[0] if j else -np.inf for j in janelas], dtype=float)
+    fecho = np.array([j[1] if j else np.inf for j in janelas], dtype=float)
+    tempos_visita = visita if visita is not None else np.zeros(n)
+    # Com janelas a melhoria local fica presa mais facilmente: parte também da ordem de fecho das janelas
+    # (as atrações sem janela no fim) e fica com o melhor dos dois percursos; uma semente que já começa
+    # muito pior do que a outra (típico do vizinho mais próximo com muitas paragens) não é melhorada
+    por_fecho = [inicio] + sorted((i for i in range(n) if i != inicio), key=lambda i: (fecho[i], abertura[i]))
+    sementes = sorted(((avaliar_ordem(semente, duracoes, partida, visita, janelas)[0], semente)
+                       for semente in (ordem, por_fecho)), key=lambda par: par[0])
+
+    def estado(ordem):
+        return _estado_percurso(ordem, duracoes, partida, tempos_visita, abertura, fecho)
+
+    melhor_ordem, melhor_custo = None, np.inf
+    for custo_inicial, ordem in sementes:
+        if custo_inicial > LIMITE_SEMENTE * sementes[0][0]:
+            continue
+        custo_atual = [custo_inicial]
+
+        # Índice da alteração de menor custo completo, ou None se nenhuma melhorar o percurso atual
+        def escolher(novas, custo_atual=custo_atual):
+            custos = _avaliar_ordens(novas, duracoes, partida, tempos_visita, abertura, fecho)
+            melhor = int(np.argmin(custos))
+            if custos[melhor] < custo_atual[0] - 1e-9:
+                custo_atual[0] = custos[melhor]
+                return melhor
+            return None
+
+        while _dois_opt(ordem, m, escolher, estado) | _or_opt(ordem, m, escolher, estado):
+            pass
+        if custo_atual[0] < melhor_custo:
+            melhor_ordem, melhor_custo = ordem, custo_atual[0]
+    return (melhor_ordem,) + tuple(avaliar_ordem(melhor_ordem, duracoes, partida, visita, janelas))
+
+# Planeia um dia de visitas às atrações indicadas (nomes) a partir do local "inicio" à hora "data_hora"
+# O início pode ser uma atração ou outro local (ex: hotel, cidade); visita_min: minutos passados em cada
+# atração; janelas: {nome: ("HH:MM", "HH:MM")} com o horário de abertura
+# Retorna a lista de Itinerario (um por deslocação) pela ordem encontrada; as deslocações com duração
+# estimada ficam sem rota (podem ser pedidas depois, fora da otimização)
+def planear_visitas(nomes, inicio, data_hora, tipo="Outro", visita_min=60, janelas=None):
+    nomes = list(dict.fromkeys([inicio] + [nome for nome in nomes if nome != inicio]))     # Sem repetidos
+    with cursor_bd() as cursor:
+        cursor.execute("SELECT nome, MIN(id) FROM atracoes WHERE nome IN (" + ", ".join(["%s"] * len(nomes)) + ") "
+                       "GROUP BY nome", nomes)
+        ids_por_nome = dict(cursor.fetchall())
+    em_falta = [nome for nome in nomes[1:] if nome not in ids_por_nome]
+    if em_falta:
+        raise ValueError("Atrações desconhecidas: " + ", ".join(em_falta))
+    duracoes, distancias = ler_matriz_atracoes([ids_por_nome.get(nome) for nome in nomes])
+    inicio_e_atracao = inicio in ids_por_nome
+    if not inicio_e_atracao:
+        # Fora da matriz: as deslocações de e para o início são estimadas pelas coordenadas conhecidas
+        # (sem pedidos à rede) e ficam marcadas como estimadas, para a rota real ser pedida depois
+        for i, nome in enumerate(nomes[1:], 1):
+            rota = estimador_rotas.rota(inicio, nome)
+            if rota is not None:
+                duracoes[0, i] = duracoes[i, 0] = rota["duracao_s"]
+                distancias[0, i] = distancias[i, 0] = rota["distancia_m"]
+    duracoes, estimados = estimar_matriz(duracoes)
+    if not inicio_e_atracao:
+        estimados[0, 1:] = estimados[1:, 0] = True
+    distancias, _ = estimar_matriz(distancias)
+
+    dia = data_hora.replace(hour=0, minute=0, second=0, microsecond=0)
+    partida = (data_hora - dia).total_seconds()
+    visita = np.full(len(nomes), visita_min * 60.0)
+    visita[0] = 0       # Não se "visita" o ponto de partida
+    lista_janelas = None
+    if janelas:
+        def segundos(hora):
+            horas, minutos = hora.split(":")
+            return int(horas) * 3600 + int(minutos) * 60
+        lista_janelas = [(segundos(janelas[nome][0]), segundos(janelas[nome][1])) if nome in janelas else None
+                         for nome in nomes]
+    ordem, _, chegadas = otimizar_ordem(duracoes, 0, partida, visita, lista_janelas)
+
+    itinerarios = []
+    for (origem, destino), chegada in zip(zip(ordem, ordem[1:]), chegadas):
+        saida = dia + timedelta(seconds=round(chegada + visita[origem]))
+        itinerario = Itinerario(nomes[origem], nomes[destino], tipo, saida.replace(second=0))
+        if not estimados[origem, destino]:
+            itinerario.distancia_m = int(distancias[origem, destino])
+            itinerario.duracao_s = int(duracoes[origem, destino])
+        itinerarios.append(itinerario)
+    return itinerarios
+
+# Sugere as k atrações mais próximas (em linha reta, pelo índice espacial) de um local: uma atração, uma
+# cidade ou uma morada já geocodificada. "excluir" são os nomes que já estão no plano
+# Retorna os nomes, da mais próxima para a mais afastada (lista vazia se o local não tiver coordenadas)
+def sugerir_atracoes_proximas(local, k=5, excluir=()):
+    coordenadas = estimador_rotas.coordenadas_local(local)
+    if coordenadas is None:
+        return []
+    excluir = set(excluir) | {local}
+    nomes = []
+    # Pede mais do que k: as excluídas e as atrações com o mesmo nome (moradas diferentes) não contam
+    for _, atracao in obter_indice_espacial().mais_proximas(*coordenadas, k=2 * k + len(excluir)):
+        if atracao[1] not in excluir and atracao[1] not in nomes:
+            nomes.append(atracao[1])
+    return nomes[:k]
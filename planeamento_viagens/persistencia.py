@@ -0,0 +1,217 @@
+# Itinerários guardados na base de dados (tabela itinerarios) e gravação em segundo plano
+import sys                                          # Mensagens de erro
+import threading                                    # Thread e lock da gravação em segundo plano
+from collections import OrderedDict                 # Fila de alterações pendentes (por ordem de chegada)
+from contextlib import contextmanager
+from .bd import cursor_bd, mysql_connector
+from .itinerarios import Itinerario
+from .metricas import medido
+from .util import blocos
+
+# Funções CRUD para itinerários
+# Função para inserir um novo itinerário na base de dados
+@medido("bd.inserir_itinerario")
+def inserir_itinerario(id_utilizador, nome_itinerario, data_inicio, data_fim):
+    try:
+        # Obtém um cursor de uma ligação do pool (a ligação é devolvida e a alteração confirmada no fim)
+        with cursor_bd(commit=True) as cursor:
+            # Executa a instrução SQL para inserir um novo registo na tabela 'itinerarios'
+            # Os valores são passados em forma de tupla (para evitar SQL injection)
+            cursor.execute(
+                "INSERT INTO itinerarios (id_utilizador, nome_itinerario, data_inicio, data_fim) VALUES (%s, %s, %s, %s)",
+                (id_utilizador, nome_itinerario, data_inicio, data_fim)
+            )
+        print(f"Itinerário '{nome_itinerario}' inserido.")      # Mensagem a indicar sucesso
+    # Captura e mostra erros que possam ocorrer durante a inserção
+    except mysql_connector.Error as err:
+        print(f"Erro ao inserir itinerário: {err}", file=sys.stderr)
+
+# Função para ler (listar) todos os itinerários da base de dados
+@medido("bd.ler_todos_itinerarios")
+def ler_todos_itinerarios():
+    try:
+        with cursor_bd() as cursor:
+            cursor.execute("SELECT * FROM itinerarios")     # Executa um comando SQL para obter todos os registos da tabela 'itinerarios'
+            return cursor.fetchall()        # Retorna todos os resultados como uma lista de tuplas
+    # Se houver algum erro durante a ligação ou execução do SQL, é tratado aqui
+    except mysql_connector.Error as err:
+        print(f"Erro ao ler itinerários: {err}", file=sys.stderr)
+        return []       # Retorna uma lista vazia em caso de erro
+
+# Função para apagar os dados da tabela itinerários da base de dados
+@medido("bd.apagar_todos_itinerarios")
+def apagar_todos_itinerarios():
+    try:
+        with cursor_bd(commit=True) as cursor:
+            # Executa comando SQL para apagar todos os registros da tabela itinerarios
+            cursor.execute("DELETE FROM itinerarios")
+        print("Itinerarios apagados.")  # Mensagem de sucesso
+    except mysql_connector.Error as err:
+        print(f"Erro ao apagar dados: {err}", file=sys.stderr)
+
+# --- Persistência dos itinerários ---
+# Cada itinerário (uma viagem origem -> destino) é uma linha da tabela itinerarios, identificada pela
+# "chave" (o id estável do Itinerario) e associada a um utilizador (por omissão o utilizador local)
+UTILIZADOR_PADRAO = "local"
+_id_utilizador_padrao = None
+
+# Devolve o id do utilizador local, criando-o se ainda não existir
+# O "id = LAST_INSERT_ID(id)" faz com que lastrowid devolva o id existente quando o nome já está registado
+@medido("bd.obter_utilizador_padrao")
+def obter_utilizador_padrao():
+    global _id_utilizador_padrao
+    if _id_utilizador_padrao is None:
+        with cursor_bd(commit=True) as cursor:
+            cursor.execute("INSERT INTO utilizadores (nome) VALUES (%s) ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)",
+                           (UTILIZADOR_PADRAO,))
+            _id_utilizador_padrao = cursor.lastrowid
+    return _id_utilizador_padrao
+
+COLUNAS_ITINERARIO_BD = ("chave", "origem", "destino", "tipo", "data_inicio", "notas",
+                         "distancia_m", "duracao_s", "estado_rota")
+SQL_INSERIR_ITINERARIO = (
+    "INSERT INTO itinerarios (id_utilizador, nome_itinerario, " + ", ".join(COLUNAS_ITINERARIO_BD) + ") "
+    "VALUES (%s, %s, " + ", ".join(["%s"] * len(COLUNAS_ITINERARIO_BD)) + ")"
+)
+
+# Converte um itinerário numa linha (tuplo) pela ordem de COLUNAS_ITINERARIO_BD
+# É feito no momento da alteração para a gravação em segundo plano não ler um objeto que entretanto mude
+def linha_itinerario(itinerario):
+    return (itinerario.id, itinerario.origem, itinerario.destino, itinerario.tipo, itinerario.data_hora,
+            itinerario.notas, itinerario.distancia_m, itinerario.duracao_s, itinerario.estado_rota)
+
+# Grava e apaga itinerários numa só transação
+# A gravação é feita com DELETE + INSERT das chaves afetadas (o VALUES() do ON DUPLICATE KEY UPDATE
+# está obsoleto e, com raise_on_warnings, o aviso seria tratado como erro)
+@medido("bd.gravar_itinerarios_bd")
+def gravar_itinerarios_bd(linhas, chaves_apagar=()):
+    id_utilizador = obter_utilizador_padrao()
+    with cursor_bd(commit=True) as cursor:
+        chaves = list(chaves_apagar) + [linha[0] for linha in linhas]
+        for bloco in blocos(chaves, 500):
+            cursor.execute("DELETE FROM itinerarios WHERE chave IN (" + ", ".join(["%s"] * len(bloco)) + ")", bloco)
+        if linhas:
+            cursor.executemany(SQL_INSERIR_ITINERARIO,
+                               [(id_utilizador, f"{linha[1]} → {linha[2]}"[:255]) + linha for linha in linhas])
+
+# Lê uma página de itinerários guardados, ordenados por data/hora, opcionalmente num intervalo [inicio, fim)
+# Paginação por chave (keyset): "depois" é a (data_inicio, chave) do último itinerário da página anterior,
+# o que usa o índice (id_utilizador, data_inicio, chave) em vez de percorrer as linhas de um OFFSET
+@medido("bd.ler_itinerarios_bd")
+def ler_itinerarios_bd(inicio=None, fim=None, depois=None, limite=500):
+    condicoes = ["id_utilizador = %s"]
+    parametros = [obter_utilizador_padrao()]
+    if inicio is not None:
+        condicoes.append("data_inicio >= %s")
+        parametros.append(inicio)
+    if fim is not None:
+        condicoes.append("data_inicio < %s")
+        parametros.append(fim)
+    if depois is not None:
+        condicoes.append("(data_inicio > %s OR (data_inicio = %s AND chave > %s))")
+        parametros += [depois[0], depois[0], depois[1]]
+    sql = ("SELECT " + ", ".join(COLUNAS_ITINERARIO_BD) + " FROM itinerarios WHERE " + " AND ".join(condicoes) +
+           " ORDER BY data_inicio, chave LIMIT %s")
+    with cursor_bd() as cursor:
+        cursor.execute(sql, parametros + [limite])
+        linhas = cursor.fetchall()
+    return [Itinerario(origem, destino, tipo or "", data_inicio, notas or "", distancia_m, duracao_s, estado_rota,
+                       chave)
+            for chave, origem, destino, tipo, data_inicio, notas, distancia_m, duracao_s, estado_rota in linhas]
+
+# Percorre os itinerários guardados página a página (cada página é uma lista de Itinerario)
+def iterar_itinerarios_bd(inicio=None, fim=None, tamanho_pagina=500):
+    depois = None
+    while True:
+        pagina = ler_itinerarios_bd(inicio, fim, depois, tamanho_pagina)
+        if not pagina:
+            return
+        yield pagina
+        if len(pagina) < tamanho_pagina:
+            return
+        depois = (pagina[-1].data_hora, pagina[-1].id)
+
+# Gravação "write-behind": as alterações ao ArmazemItinerarios são registadas numa fila em memória
+# e gravadas em lotes por uma thread própria, para a interface nunca esperar por um commit.
+# Várias alterações ao mesmo itinerário antes da gravação resultam numa única escrita.
+# Limpar a lista só apaga os itinerários que ela tinha (os de outros períodos, não carregados, ficam guardados).
+class GravadorItinerarios:
+    def __init__(self, intervalo=0.5, tamanho_lote=500):
+        self.intervalo = intervalo          # Tempo (s) entre gravações
+        self.tamanho_lote = tamanho_lote    # Máximo de itinerários por transação
+        self.pendentes = OrderedDict()      # chave -> linha a gravar, ou None para apagar
+        self.lock = threading.Lock()
+        self.acordar = threading.Event()
+        self.parar = threading.Event()
+        self.suspenso = False               # Enquanto True as alterações não são gravadas (ver sem_gravar)
+        self.thread = None
+
+    # Ouvinte do ArmazemItinerarios (corre na thread principal: só regista a alteração)
+    def ao_alterar(self, evento, **dados):
+        if self.suspenso:
+            return
+        with self.lock:
+            if evento in ("inserido", "atualizado"):
+                self.pendentes[dados["itinerario"].id] = linha_itinerario(dados["itinerario"])
+            elif evento == "carregado":
+                for itinerario in dados["itinerarios"]:
+                    self.pendentes[itinerario.id] = linha_itinerario(itinerario)
+            elif evento == "removido":
+                self.pendentes[dados["itinerario"].id] = None
+            elif evento == "limpo":
+                for chave in dados["ids"]:
+                    self.pendentes[chave] = None
+        self._iniciar()
+
+    # Alterações feitas dentro deste bloco não são gravadas (ex: itinerários acabados de ler da base de dados)
+    @contextmanager
+    def sem_gravar(self):
+        self.suspenso = True
+        try:
+            yield
+        finally:
+            self.suspenso = False
+
+    # Inicia a thread de gravação, ou volta a iniciá-la se tiver terminado por um erro inesperado
+    def _iniciar(self):
+        if self.parar.is_set():
+            return
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._ciclo, daemon=True)
+            self.thread.start()
+
+    def _ciclo(self):
+        while not self.parar.is_set():
+            self.acordar.wait(self.intervalo)
+            self.acordar.clear()
+            self.gravar()
+
+    # Grava tudo o que estiver pendente; em caso de erro (de qualquer tipo, para a thread não terminar)
+    # as alterações voltam para a fila sem substituir as que entretanto chegaram (ex: uma limpeza da lista
+    # marca as chaves para apagar e a linha antiga já não é reposta) e são tentadas de novo na próxima passagem
+    def gravar(self):
+        while True:
+            with self.lock:
+                if not self.pendentes:
+                    return
+                lote = [self.pendentes.popitem(last=False)
+                        for _ in range(min(self.tamanho_lote, len(self.pendentes)))]
+            try:
+                gravar_itinerarios_bd([linha for _, linha in lote if linha is not None],
+                                      [chave for chave, linha in lote if linha is None])
+            except Exception as err:
+                print(f"Erro ao gravar itinerários: {err!r}", file=sys.stderr)
+                with self.lock:
+                    for chave, linha in reversed(lote):
+                        if chave not in self.pendentes:
+                            self.pendentes[chave] = linha
+                            self.pendentes.move_to_end(chave, last=False)
+                return
+
+    # Para a thread e grava o que ainda estiver pendente (chamar ao sair da aplicação)
+    def fechar(self):
+        self.parar.set()
+        self.acordar.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+        self.gravar()
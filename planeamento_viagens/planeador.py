@@ -0,0 +1,234 @@
+# Planeamento de itinerários em lote, sem interface gráfica (ex: trabalho noturno com milhares de viagens)
+import os                                           # Ficheiros temporários dos blocos ordenados
+import re                                           # Validação da data e da hora
+import sys                                          # Progresso e saída para o terminal
+import csv                                          # Relatório das linhas rejeitadas
+import json                                         # Blocos ordenados em JSONL
+import heapq                                        # Junção ordenada dos blocos (merge sort externo)
+import argparse                                     # Opções do comando
+import tempfile                                     # Pasta dos blocos ordenados
+from collections import deque                       # Pedidos de rota em curso, pela ordem de leitura
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from .atracoes import ler_registos_atracoes, remover_acentos
+from .itinerarios import Itinerario, agrupar_encadeados
+from .rotas import PROVEDORES_ROTAS, calcular_rotas_encadeadas, definir_provedor_rotas
+from .snapshots import escrever_snapshot, itinerario_de_dict, itinerario_para_dict
+
+# --- Planeamento em lote ---
+# Nomes de colunas aceites para cada campo de um pedido de viagem (CSV com cabeçalho ou JSONL)
+COLUNAS_PEDIDO = {
+    "origem": ("origem", "local", "origin", "from"),
+    "destino": ("destino", "cidade", "destination", "to"),
+    "tipo": ("tipo", "type"),
+    "data": ("data", "date"),
+    "hora": ("hora", "time"),
+    "data_hora": ("data_hora", "datetime"),
+    "notas": ("notas", "notes"),
+}
+# Tipos de viagem da interface (pelo início da palavra, sem acentos)
+TIPOS_VIAGEM = {"cultur": "Cultural", "desport": "Desportiva", "gastron": "Gastronómica"}
+# Mesmos formatos que o formulário da interface (DD/MM/YYYY e HH:MM)
+PADRAO_DATA = re.compile(r"^(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/([0-9]{4})$")
+PADRAO_HORA = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")
+MAX_ROTAS_MEMORIA = 100000      # Percursos lembrados por execução (as rotas anteriores ficam na cache local)
+
+# Valida um pedido lido do ficheiro e cria o itinerário correspondente (ainda sem rota)
+# A data/hora vem das colunas data + hora ou de uma coluna data_hora em ISO (ex: 2025-06-01T09:30)
+# Lança ValueError com o motivo se o pedido for rejeitado
+def normalizar_pedido(registo):
+    chaves = {str(chave).strip().lower(): valor for chave, valor in registo.items() if chave is not None}
+    campos = {}
+    for campo, nomes in COLUNAS_PEDIDO.items():
+        valor = next((chaves[nome] for nome in nomes if chaves.get(nome) not in (None, "")), "")
+        campos[campo] = " ".join(str(valor).split())
+    if not campos["origem"] or not campos["destino"]:
+        raise ValueError("origem ou destino em falta")
+    if campos["data_hora"]:
+        try:
+            data_hora = datetime.fromisoformat(campos["data_hora"]).replace(second=0, microsecond=0, tzinfo=None)
+        except ValueError:
+            raise ValueError("data_hora inválida") from None
+    else:
+        if not PADRAO_DATA.match(campos["data"]):
+            raise ValueError("a data deve estar no formato DD/MM/YYYY")
+        if not PADRAO_HORA.match(campos["hora"]):
+            raise ValueError("a hora deve estar no formato HH:MM")
+        try:
+            data_hora = datetime.strptime(f"{campos['data']} {campos['hora']}", "%d/%m/%Y %H:%M")
+        except ValueError:
+            raise ValueError("data e hora inválidas") from None
+    tipo = remover_acentos(campos["tipo"]).lower()
+    tipo = next((normal for prefixo, normal in TIPOS_VIAGEM.items() if tipo.startswith(prefixo)), "Outro")
+    return Itinerario(campos["origem"], campos["destino"], tipo, data_hora, campos["notas"])
+
+# Grava um bloco de itinerários já ordenado num ficheiro JSONL temporário e retorna o caminho
+def _gravar_bloco(pasta, numero, itinerarios):
+    caminho = os.path.join(pasta, f"bloco_{numero:05d}.jsonl")
+    with open(caminho, "w", encoding="utf-8", newline="\n") as f:
+        for itinerario in itinerarios:
+            f.write(json.dumps(itinerario_para_dict(itinerario), ensure_ascii=False, separators=(",", ":")) + "\n")
+    return caminho
+
+# Lê de volta um bloco ordenado, um itinerário de cada vez
+def _ler_bloco(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        for linha in f:
+            yield itinerario_de_dict(json.loads(linha))
+
+# Escreve os itinerários (já ordenados) no formato de texto exportado e/ou num snapshot JSONL,
+# numa só passagem; "-" como caminho de texto escreve no terminal (stdout)
+# Retorna o número de itinerários escritos
+def escrever_resultados(itinerarios, caminho_texto=None, caminho_snapshot=None):
+    if caminho_texto == "-":
+        texto = sys.stdout
+    else:
+        texto = open(caminho_texto, "w", encoding="utf-8") if caminho_texto else None
+    try:
+        # O texto é escrito à medida que os itinerários passam (o snapshot consome o mesmo gerador)
+        def passar():
+            for itinerario in itinerarios:
+                if texto is not None:
+                    texto.write(itinerario.resumo() + "\n\n")
+                yield itinerario
+        if caminho_snapshot:
+            return escrever_snapshot(caminho_snapshot, passar())
+        return sum(1 for _ in passar())
+    finally:
+        if texto is not None and texto is not sys.stdout:
+            texto.close()
+
+# Planeia em lote os pedidos de viagem de um ficheiro CSV ou JSONL:
+# - o ficheiro é lido em streaming e as rotas são pedidas em paralelo (no máximo "paralelos" threads e
+#   "paralelos * 4" pedidos em curso), passando pela matriz de distâncias e pela cache local de rotas;
+#   os pedidos seguidos do mesmo dia encadeados (A -> B, B -> C, ...) formam um só percurso com paragens,
+#   pedido de uma vez, e o mesmo percurso é pedido uma só vez por execução
+# - com otimizar=True o fornecedor pode reordenar as paragens intermédias de cada percurso; a origem e o
+#   destino dos itinerários (pela ordem lida) passam a seguir a nova ordem
+# - os itinerários são ordenados por data/hora com um merge sort externo: blocos de "tamanho_bloco"
+#   itinerários são ordenados em memória e gravados em ficheiros temporários, que no fim são juntos
+#   (heapq.merge) diretamente para os ficheiros de saída; só um bloco está em memória de cada vez
+# - as linhas rejeitadas são escritas no relatório CSV indicado; progresso(estado) é chamada periodicamente
+# Retorna o dicionário com o estado final
+def planear_itinerarios_ficheiro(caminho, caminho_texto=None, caminho_snapshot=None, paralelos=8,
+                                 tamanho_bloco=50000, caminho_relatorio=None, pasta_temporaria=None,
+                                 progresso=None, otimizar=False):
+    formato = "jsonl" if caminho.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+    estado = {"lidos": 0, "planeados": 0, "rejeitados": 0, "sem_rota": 0, "erros": 0, "percursos": 0,
+              "blocos": 0, "escritos": 0}
+    relatorio = open(caminho_relatorio, "w", encoding="utf-8", newline="") if caminho_relatorio else None
+    escritor = csv.writer(relatorio) if relatorio else None
+    if escritor:
+        escritor.writerow(["linha", "motivo", "registo"])
+    max_em_curso = max(1, paralelos) * 4
+    rotas_pedidas = {}      # Locais do percurso normalizados -> futuro partilhado pelos percursos repetidos
+    em_curso = deque()      # (grupo de itinerários, futuro) pela ordem de leitura
+    bloco = []              # Itinerários com rota ainda por ordenar/gravar
+    blocos_gravados = []
+
+    with tempfile.TemporaryDirectory(prefix="planeador_", dir=pasta_temporaria) as pasta:
+        # Aplica as rotas ao grupo mais antigo em curso e, se o bloco encher, ordena-o e grava-o
+        def concluir_mais_antigo():
+            grupo, futuro = em_curso.popleft()
+            paragens, resultados = futuro.result()
+            for itinerario, origem, destino, resultado in zip(grupo, paragens, paragens[1:], resultados):
+                itinerario.origem, itinerario.destino = origem, destino     # Só mudam se o percurso foi otimizado
+                if isinstance(resultado, dict):
+                    itinerario.definir_rota(resultado)
+                else:
+                    itinerario.estado_rota = resultado
+                    estado["erros" if resultado.startswith("Erro") else "sem_rota"] += 1
+                bloco.append(itinerario)
+            estado["planeados"] += len(grupo)
+            if len(bloco) >= tamanho_bloco:
+                bloco.sort()
+                blocos_gravados.append(_gravar_bloco(pasta, len(blocos_gravados), bloco))
+                bloco.clear()
+                estado["blocos"] = len(blocos_gravados)
+            if progresso is not None and estado["planeados"] // 1000 != (estado["planeados"] - len(grupo)) // 1000:
+                progresso(dict(estado))
+
+        # Gera os pedidos válidos pela ordem do ficheiro (os rejeitados vão diretamente para o relatório)
+        def pedidos_validos(f):
+            for numero, registo, erro in ler_registos_atracoes(f, formato):
+                estado["lidos"] += 1
+                if erro is None:
+                    try:
+                        yield normalizar_pedido(registo)
+                        continue
+                    except ValueError as e:
+                        erro = str(e)
+                estado["rejeitados"] += 1
+                if escritor:
+                    escritor.writerow([numero, erro, json.dumps(registo, ensure_ascii=False) if registo else ""])
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, paralelos), thread_name_prefix="planeador") as executor, \
+                    open(caminho, "r", encoding="utf-8-sig", newline="") as f:
+                for grupo in agrupar_encadeados(pedidos_validos(f)):
+                    locais = [grupo[0].origem] + [itinerario.destino for itinerario in grupo]
+                    chave = tuple(local.lower() for local in locais)
+                    futuro = rotas_pedidas.get(chave)
+                    if futuro is None:
+                        if len(rotas_pedidas) >= MAX_ROTAS_MEMORIA:
+                            rotas_pedidas.clear()
+                        futuro = rotas_pedidas[chave] = executor.submit(calcular_rotas_encadeadas, locais, otimizar)
+                        estado["percursos"] += 1
+                    em_curso.append((grupo, futuro))
+                    if len(em_curso) >= max_em_curso:
+                        concluir_mais_antigo()
+                while em_curso:
+                    concluir_mais_antigo()
+        finally:
+            if relatorio:
+                relatorio.close()
+
+        # Junta os blocos gravados com o que ficou em memória, já por ordem de data/hora
+        bloco.sort()
+        ordenados = heapq.merge(*(_ler_bloco(c) for c in blocos_gravados), bloco) if blocos_gravados else bloco
+        estado["escritos"] = escrever_resultados(ordenados, caminho_texto, caminho_snapshot)
+    return estado
+
+# Comando sem interface gráfica: python ProjetoFinal_Grupo4_codigo.py planear-itinerarios FICHEIRO [opções]
+def comando_planear_itinerarios(argumentos):
+    parser = argparse.ArgumentParser(prog="planear-itinerarios",
+                                     description="Calcula as rotas de um ficheiro de pedidos de viagem (CSV ou "
+                                                 "JSONL com origem, destino, tipo, data, hora e notas) e grava "
+                                                 "os itinerários ordenados por data/hora.")
+    parser.add_argument("ficheiro", help="ficheiro .csv ou .jsonl com os pedidos de viagem")
+    parser.add_argument("--texto", help="ficheiro .txt de saída, no formato exportado pela interface ('-' para o ecrã)")
+    parser.add_argument("--snapshot", help="ficheiro .jsonl ou .jsonl.gz de saída (snapshot de itinerários)")
+    parser.add_argument("--paralelos", type=int, default=8, help="pedidos de rota em simultâneo (por omissão 8)")
+    parser.add_argument("--bloco", type=int, default=50000,
+                        help="itinerários ordenados em memória de cada vez (por omissão 50000)")
+    parser.add_argument("--relatorio", help="ficheiro CSV onde escrever as linhas rejeitadas")
+    parser.add_argument("--provedor", choices=sorted(PROVEDORES_ROTAS),
+                        help="fornecedor de rotas (por omissão o da variável PROVEDOR_ROTAS, ou google)")
+    parser.add_argument("--otimizar-paragens", action="store_true",
+                        help="deixar o fornecedor de rotas reordenar as paragens intermédias de cada dia")
+    parser.add_argument("--temp", help="pasta para os ficheiros temporários da ordenação")
+    args = parser.parse_args(argumentos)
+    if not args.texto and not args.snapshot:
+        parser.error("indique pelo menos um ficheiro de saída (--texto e/ou --snapshot)")
+    if args.paralelos < 1 or args.bloco < 1:
+        parser.error("--paralelos e --bloco têm de ser positivos")
+    if args.provedor:
+        definir_provedor_rotas(args.provedor)
+
+    def mostrar_progresso(estado):
+        print(f"\rlidos: {estado['lidos']}  planeados: {estado['planeados']}  rejeitados: {estado['rejeitados']}  "
+              f"percursos: {estado['percursos']}", end="", file=sys.stderr)
+
+    try:
+        estado = planear_itinerarios_ficheiro(args.ficheiro, args.texto, args.snapshot, paralelos=args.paralelos,
+                                              tamanho_bloco=args.bloco, caminho_relatorio=args.relatorio,
+                                              pasta_temporaria=args.temp, progresso=mostrar_progresso,
+                                              otimizar=args.otimizar_paragens)
+    except OSError as err:
+        print(f"Erro ao planear itinerários: {err}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    print(f"Pedidos lidos: {estado['lidos']}; planeados: {estado['planeados']} "
+          f"(sem rota: {estado['sem_rota']}, com erro: {estado['erros']}); rejeitados: {estado['rejeitados']}; "
+          f"percursos distintos: {estado['percursos']}", file=sys.stderr)
+    return 0
@@ -0,0 +1,49 @@
+# Ponto de entrada: comandos sem interface gráfica ou preparação da base de dados e abertura da janela
+import sys
+from .atracoes import comando_importar_atracoes, existem_atracoes, inserir_atracoes_exemplo, ler_todas_atracoes
+from .bd import criar_base_de_dados, criar_tabelas
+from .desempenho import comando_medir_desempenho
+from .espacial import geocodificar_atracoes
+from .metricas import configurar_metricas_ambiente, gravar_metricas
+from .planeador import comando_planear_itinerarios
+
+# Executa a aplicação: "importar-atracoes", "planear-itinerarios" e "medir-desempenho" correm sem interface
+# gráfica; sem argumentos prepara a base de dados (esquema e, se estiver vazia, atrações de exemplo) e abre a
+# janela principal
+# As métricas são configuradas pelo ambiente (METRICAS, METRICAS_FICHEIRO, METRICAS_PORTA) e gravadas no fim
+def main(argumentos=None):
+    argumentos = sys.argv[1:] if argumentos is None else argumentos
+    caminho_metricas = configurar_metricas_ambiente()
+    try:
+        return _executar(argumentos)
+    finally:
+        if caminho_metricas:
+            gravar_metricas(caminho_metricas)
+
+# Escolhe o comando pedido (ou a aplicação gráfica) e retorna o código de saída
+def _executar(argumentos):
+    # Comando sem interface gráfica para importar ficheiros grandes de atrações
+    if argumentos and argumentos[0] == "importar-atracoes":
+        return comando_importar_atracoes(argumentos[1:])
+    # Planeamento em lote de um ficheiro de pedidos de viagem (sem interface gráfica)
+    if argumentos and argumentos[0] == "planear-itinerarios":
+        return comando_planear_itinerarios(argumentos[1:])
+    # Medições de desempenho com substitutos locais da base de dados e do serviço de rotas
+    if argumentos and argumentos[0] == "medir-desempenho":
+        return comando_medir_desempenho(argumentos[1:])
+    # Cria a base de dados
+    criar_base_de_dados()
+    # Chama a função para criar a base de dados e as tabelas (caso ainda não existam)
+    criar_tabelas()
+    # Insere atrações de exemplo só numa base de dados sem atrações (para povoar a tabela 'atracoes'); as que
+    # já existem ficam, com as distâncias e coordenadas calculadas em arranques anteriores
+    if existem_atracoes() is False:
+        inserir_atracoes_exemplo()
+    # Obtém as coordenadas das atrações (as moradas já conhecidas vêm da cache local)
+    geocodificar_atracoes()
+    # Imprime todas as atrações existentes na tabela 'atracoes'
+    print("Atrações:", ler_todas_atracoes())
+    # A interface (e o Tkinter) só é importada aqui, quando é mesmo precisa
+    from .interface import executar
+    executar()
+    return 0
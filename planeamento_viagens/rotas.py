@@ -0,0 +1,238 @@
+# Fornecedores de rotas (Google Maps, local determinístico e estimativa offline) e obtenção de rotas
+import os                                           # Escolha do fornecedor pela variável de ambiente
+import hashlib                                      # Rotas determinísticas do fornecedor local
+import threading                                    # Lock das coordenadas conhecidas pela estimativa
+import time                                         # Validade dos locais sem coordenadas
+from .bd import cursor_bd, mysql_connector
+from .cache_local import cache_rotas
+from .cliente_maps import obter_cliente_maps
+from .distancias import ler_distancia_atracoes
+from .espacial import distancia_haversine_km
+from .itinerarios import formatar_distancia, formatar_duracao
+from .metricas import contar_cache, cronometrar, medido
+
+# --- Fornecedores de rotas ---
+# Todos têm o mesmo método rota(origem, destino, modo, idioma), que retorna um dicionário
+# {distancia, duracao, distancia_m, duracao_s} ou None se não houver rota; "guardar_em_cache" indica
+# se vale a pena guardar o resultado na cache local de rotas
+
+# Rotas reais pedidas à API Directions do Google Maps
+class ProvedorGoogle:
+    nome = "google"
+    guardar_em_cache = True
+
+    def rota(self, origem, destino, modo="driving", idioma="pt-pt"):
+        direcoes = obter_cliente_maps().directions(origem, destino, mode=modo, language=idioma)
+        if not direcoes:
+            return None
+        return _rota_de_perna(direcoes[0]['legs'][0])
+
+    # Rotas de um percurso com várias paragens num só pedido (as paragens intermédias vão como waypoints)
+    # Retorna (ordem, rotas): índices de "locais" pela ordem em que são visitados e a rota de cada perna;
+    # com otimizar=True o Google pode trocar as paragens intermédias (a partida e a chegada ficam fixas)
+    def rotas_encadeadas(self, locais, modo="driving", idioma="pt-pt", otimizar=False):
+        direcoes = obter_cliente_maps().directions(locais[0], locais[-1], mode=modo, language=idioma,
+                                                   waypoints=locais[1:-1] or None, optimize_waypoints=otimizar)
+        if not direcoes:
+            return list(range(len(locais))), [None] * (len(locais) - 1)
+        percurso = direcoes[0]
+        intermedias = percurso.get('waypoint_order') or range(len(locais) - 2)
+        ordem = [0] + [indice + 1 for indice in intermedias] + [len(locais) - 1]
+        return ordem, [_rota_de_perna(perna) for perna in percurso['legs']]
+
+# Converte uma perna ("leg") da resposta da API Directions no formato usado pelas rotas
+def _rota_de_perna(perna):
+    return {
+        "distancia": perna['distance']['text'],     # ex: "321 km"
+        "duracao": perna['duration']['text'],       # ex: "3 horas 9 min"
+        "distancia_m": perna['distance']['value'],  # metros
+        "duracao_s": perna['duration']['value']     # segundos
+    }
+
+# Fator entre a distância em linha reta e a distância por estrada, e velocidade média (km/h) de cada modo
+PERFIS_MODO = {
+    "driving": (1.2, 80),
+    "bicycling": (1.25, 15),
+    "walking": (1.2, 5),
+    "transit": (1.4, 35),
+}
+
+# Constrói um resultado no mesmo formato que a API a partir de metros e segundos
+def _rota_de_valores(distancia_m, duracao_s, estimada=False):
+    rota = {"distancia": formatar_distancia(distancia_m), "duracao": formatar_duracao(duracao_s),
+            "distancia_m": distancia_m, "duracao_s": duracao_s}
+    if estimada:
+        rota["estimada"] = True
+    return rota
+
+# Fornecedor local determinístico (sem rede nem base de dados), para testes e medições de desempenho:
+# o mesmo par de locais dá sempre a mesma rota, nos dois sentidos
+class ProvedorLocal:
+    nome = "local"
+    guardar_em_cache = False
+
+    def rota(self, origem, destino, modo="driving", idioma="pt-pt"):
+        a, b = sorted((origem.strip().lower(), destino.strip().lower()))
+        if a == b:
+            return _rota_de_valores(0, 0)
+        resumo = hashlib.sha1(f"{a}\n{b}".encode("utf-8")).digest()
+        distancia_m = 1000 + int.from_bytes(resumo[:4], "big") % 300000      # Entre 1 e 301 km
+        _, velocidade = PERFIS_MODO.get(modo, PERFIS_MODO["driving"])
+        return _rota_de_valores(distancia_m, round(distancia_m / 1000 / velocidade * 3600))
+
+# Estimativa offline: distância em linha reta entre as coordenadas conhecidas dos dois locais,
+# multiplicada por um fator de estrada, e duração pela velocidade média do modo de transporte
+# As coordenadas de um local vêm da atração com esse nome, do centro das atrações dessa cidade
+# ou das moradas já geocodificadas (cache local); nunca faz pedidos à rede
+# Um local sem coordenadas só volta a ser procurado passados VALIDADE_SEM_COORDENADAS segundos (a atração
+# pode ser acrescentada ou geocodificada entretanto)
+VALIDADE_SEM_COORDENADAS = 60
+
+class ProvedorEstimativa:
+    nome = "estimativa"
+    guardar_em_cache = False
+
+    def __init__(self):
+        self.coordenadas = {}       # Local (normalizado) -> (lat, lng), para não repetir consultas
+        self.sem_coordenadas = {}   # Local (normalizado) -> instante (time.monotonic) da última procura sem resultado
+        self.lock = threading.Lock()
+
+    def coordenadas_local(self, local):
+        chave = local.strip().lower()
+        with self.lock:
+            if chave in self.coordenadas:
+                return self.coordenadas[chave]
+            procurado = self.sem_coordenadas.get(chave)
+            if procurado is not None and time.monotonic() - procurado < VALIDADE_SEM_COORDENADAS:
+                return None
+        resultado = None
+        try:
+            with cursor_bd() as cursor:
+                cursor.execute("SELECT latitude, longitude FROM atracoes WHERE nome = %s AND latitude IS NOT NULL "
+                               "LIMIT 1", (local,))
+                resultado = cursor.fetchone()
+                if resultado is None:
+                    cursor.execute("SELECT AVG(latitude), AVG(longitude) FROM atracoes "
+                                   "WHERE cidade = %s AND latitude IS NOT NULL", (local,))
+                    resultado = cursor.fetchone()
+        except ImportError:
+            resultado = None            # Sem o conector MySQL: tenta só a cache local
+        except mysql_connector.Error:
+            resultado = None            # Sem base de dados: tenta só a cache local
+        if not resultado or resultado[0] is None:
+            resultado = cache_rotas.obter_coordenadas([local]).get(local)
+        resultado = tuple(resultado) if resultado and resultado[0] is not None else None
+        with self.lock:
+            if resultado is None:
+                self.sem_coordenadas[chave] = time.monotonic()
+            else:
+                self.coordenadas[chave] = resultado
+                self.sem_coordenadas.pop(chave, None)
+        return resultado
+
+    def rota(self, origem, destino, modo="driving", idioma="pt-pt"):
+        inicio, fim = self.coordenadas_local(origem), self.coordenadas_local(destino)
+        if inicio is None or fim is None:
+            return None
+        fator, velocidade = PERFIS_MODO.get(modo, PERFIS_MODO["driving"])
+        km = distancia_haversine_km(*inicio, *fim) * fator
+        return _rota_de_valores(round(km * 1000), round(km / velocidade * 3600), estimada=True)
+
+PROVEDORES_ROTAS = {"google": ProvedorGoogle, "local": ProvedorLocal, "estimativa": ProvedorEstimativa}
+# Fornecedor usado por obter_rota (pode ser escolhido com a variável de ambiente PROVEDOR_ROTAS)
+provedor_rotas = PROVEDORES_ROTAS.get(os.environ.get("PROVEDOR_ROTAS", "google"), ProvedorGoogle)()
+estimador_rotas = ProvedorEstimativa()      # Estimativas instantâneas enquanto a rota real não chega
+
+# Troca o fornecedor de rotas (pelo nome em PROVEDORES_ROTAS ou por um objeto com o método rota)
+def definir_provedor_rotas(provedor):
+    global provedor_rotas
+    provedor_rotas = PROVEDORES_ROTAS[provedor]() if isinstance(provedor, str) else provedor
+
+# Procura uma rota já conhecida: na matriz de distâncias entre atrações (base de dados) ou na cache local
+# A matriz tem rotas do Google Maps, por isso só é consultada com esse fornecedor (os outros, como o local
+# usado pelo planeador em lote e nas medições, não precisam da base de dados)
+# Retorna None se a rota ainda não tiver sido calculada
+def obter_rota_guardada(origem, destino, modo="driving", idioma="pt-pt"):
+    rota = None
+    # A matriz é calculada com estes parâmetros
+    if getattr(provedor_rotas, "nome", None) == "google" and modo == "driving" and idioma == "pt-pt":
+        rota = ler_distancia_atracoes(origem, destino)
+    if rota is None:
+        rota = cache_rotas.obter(origem, destino, modo, idioma)
+    contar_cache("rotas_guardadas", acertos=int(rota is not None), falhas=int(rota is None))
+    return rota
+
+# Obtém a rota entre origem e destino: primeiro as rotas já conhecidas (matriz de distâncias e cache local)
+# e só em último caso o fornecedor de rotas (por omissão, a API do Google Maps)
+# Retorna um dicionário com distância/duração (texto e valor numérico) ou None se não houver rota
+@medido("rotas.obter_rota")
+def obter_rota(origem, destino, modo="driving", idioma="pt-pt"):
+    rota = obter_rota_guardada(origem, destino, modo, idioma)
+    if rota is not None:
+        return rota
+    with cronometrar(f"rotas.provedor.{getattr(provedor_rotas, 'nome', 'outro')}"):
+        rota = provedor_rotas.rota(origem, destino, modo, idioma)
+    if rota is not None and provedor_rotas.guardar_em_cache:
+        cache_rotas.guardar(origem, destino, modo, idioma, rota)
+    return rota
+
+# --- Percursos com várias paragens ---
+# Máximo de paragens intermédias (waypoints) aceites pela API Directions num só pedido
+MAX_PARAGENS_INTERMEDIAS = 25
+
+# Pede ao fornecedor as rotas de um percurso, em pedidos de no máximo MAX_PARAGENS_INTERMEDIAS + 2 locais
+# (blocos seguidos partilham o local onde um acaba e o outro começa); os fornecedores sem rotas_encadeadas
+# respondem perna a perna. Guarda as pernas obtidas na cache local e retorna (ordem, rotas)
+def _pedir_percurso(locais, modo, idioma, otimizar=False):
+    provedor = provedor_rotas
+    ordem, rotas = [0], []
+    for inicio in range(0, len(locais) - 1, MAX_PARAGENS_INTERMEDIAS + 1):
+        bloco = locais[inicio:inicio + MAX_PARAGENS_INTERMEDIAS + 2]
+        with cronometrar(f"rotas.provedor.{getattr(provedor, 'nome', 'outro')}.percurso"):
+            if hasattr(provedor, "rotas_encadeadas"):
+                ordem_bloco, rotas_bloco = provedor.rotas_encadeadas(bloco, modo, idioma, otimizar)
+            else:
+                ordem_bloco = list(range(len(bloco)))
+                rotas_bloco = [provedor.rota(a, b, modo, idioma) for a, b in zip(bloco, bloco[1:])]
+        ordem.extend(inicio + indice for indice in ordem_bloco[1:])
+        rotas.extend(rotas_bloco)
+    if provedor.guardar_em_cache:
+        pernas = [(locais[a], locais[b], rota) for a, b, rota in zip(ordem, ordem[1:], rotas) if rota is not None]
+        if pernas:
+            cache_rotas.guardar_varios(pernas, modo, idioma)
+    return ordem, rotas
+
+# Obtém as rotas de um percurso com várias paragens (A -> B -> C -> ...), uma por perna
+# As pernas já conhecidas (matriz de distâncias e cache local) não são pedidas, e cada sequência de pernas
+# em falta é pedida ao fornecedor de uma só vez, em vez de um pedido por perna
+# Com otimizar=True o percurso é pedido inteiro e o fornecedor pode reordenar as paragens intermédias
+# Retorna (ordem, rotas): índices de "locais" pela ordem a visitar e a rota (ou None) de cada perna dessa ordem
+@medido("rotas.obter_rotas_encadeadas")
+def obter_rotas_encadeadas(locais, modo="driving", idioma="pt-pt", otimizar=False):
+    if len(locais) < 2:
+        return list(range(len(locais))), []
+    if otimizar and len(locais) > 3:
+        return _pedir_percurso(locais, modo, idioma, otimizar=True)
+    rotas = [obter_rota_guardada(a, b, modo, idioma) for a, b in zip(locais, locais[1:])]
+    inicio = 0
+    while inicio < len(rotas):
+        if rotas[inicio] is not None:
+            inicio += 1
+            continue
+        fim = inicio
+        while fim < len(rotas) and rotas[fim] is None:
+            fim += 1
+        rotas[inicio:fim] = _pedir_percurso(locais[inicio:fim + 1], modo, idioma)[1]
+        inicio = fim
+    return list(range(len(locais))), rotas
+
+# Calcula as rotas de uma cadeia de itinerários do mesmo dia (ver agrupar_encadeados) com um só pedido,
+# a partir dos locais percorridos: [origem do 1º, destino do 1º, destino do 2º, ...]
+# Retorna (paragens, resultados): os locais pela ordem a visitar (diferente só com otimizar=True) e, para cada
+# itinerário, o dicionário da rota ou o texto a mostrar quando não há rota
+def calcular_rotas_encadeadas(locais, otimizar=False):
+    try:
+        ordem, rotas = obter_rotas_encadeadas(locais, modo="driving", idioma="pt-pt", otimizar=otimizar)
+    except Exception as e:
+        return list(locais), [f"Erro ao calcular rota: {e}"] * (len(locais) - 1)
+    return [locais[indice] for indice in ordem], [rota if rota else "Rota não encontrada." for rota in rotas]
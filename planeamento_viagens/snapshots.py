@@ -0,0 +1,188 @@
+# Snapshots de itinerários em JSONL (opcionalmente comprimidos com gzip)
+import os                                           # Substituição atómica e tamanho dos ficheiros
+import json                                         # Uma linha JSON por itinerário
+import gzip                                         # Snapshots comprimidos
+import mmap                                         # Leitura preguiçosa de snapshots grandes
+from datetime import datetime
+from .cache_local import cache_rotas
+from .itinerarios import Itinerario, formatar_distancia, formatar_duracao, importar_itinerarios_texto
+
+# --- Snapshots de itinerários (JSONL, opcionalmente comprimido com gzip) ---
+# Formato para gravar/reabrir planos sem perda: a 1ª linha é um cabeçalho com formato e versão,
+# cada linha seguinte é um itinerário com os campos separados e a distância/duração em valores numéricos.
+# Um ficheiro terminado em ".gz" é comprimido; tanto a escrita como a leitura são feitas numa só passagem.
+FORMATO_SNAPSHOT = "itinerarios"
+VERSAO_SNAPSHOT = 1
+EXTENSOES_SNAPSHOT = (".jsonl", ".jsonl.gz")
+
+# Indica se o caminho corresponde a um snapshot (pela extensão)
+def e_snapshot(caminho):
+    return caminho.lower().endswith(EXTENSOES_SNAPSHOT)
+
+# Converte um itinerário num dicionário serializável em JSON
+def itinerario_para_dict(itinerario):
+    return {
+        "id": itinerario.id,
+        "origem": itinerario.origem,
+        "destino": itinerario.destino,
+        "tipo": itinerario.tipo,
+        "data_hora": itinerario.data_hora.isoformat(timespec="minutes"),
+        "notas": itinerario.notas,
+        "distancia_m": itinerario.distancia_m,
+        "duracao_s": itinerario.duracao_s,
+        "estado_rota": itinerario.estado_rota,
+    }
+
+# Reconstrói um itinerário a partir de um dicionário lido do snapshot
+def itinerario_de_dict(dados):
+    return Itinerario(dados["origem"], dados["destino"], dados.get("tipo", ""),
+                      datetime.fromisoformat(dados["data_hora"]), dados.get("notas", ""),
+                      dados.get("distancia_m"), dados.get("duracao_s"), dados.get("estado_rota"), dados.get("id"))
+
+# Grava os itinerários num snapshot; escreve primeiro num ficheiro temporário para não deixar
+# um snapshot incompleto se algo falhar a meio
+def escrever_snapshot(caminho, itinerarios):
+    temporario = caminho + ".tmp"
+    abrir = gzip.open if caminho.lower().endswith(".gz") else open
+    cabecalho = {"formato": FORMATO_SNAPSHOT, "versao": VERSAO_SNAPSHOT,
+                 "criado": datetime.now().isoformat(timespec="seconds"),
+                 "rota": {"modo": "driving", "idioma": "pt-pt"}}     # Parâmetros com que as rotas foram obtidas
+    total = 0
+    try:
+        with abrir(temporario, "wt", encoding="utf-8", newline="\n") as f:
+            f.write(json.dumps(cabecalho, ensure_ascii=False) + "\n")
+            for itinerario in itinerarios:
+                f.write(json.dumps(itinerario_para_dict(itinerario), ensure_ascii=False, separators=(",", ":")) + "\n")
+                total += 1
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    return total
+
+# Valida a linha de cabeçalho de um snapshot e devolve-a como dicionário
+def ler_cabecalho_snapshot(linha):
+    try:
+        cabecalho = json.loads(linha)
+    except ValueError:
+        cabecalho = None
+    if not isinstance(cabecalho, dict) or cabecalho.get("formato") != FORMATO_SNAPSHOT:
+        raise ValueError("O ficheiro não é um snapshot de itinerários.")
+    if cabecalho.get("versao", 0) > VERSAO_SNAPSHOT:
+        raise ValueError(f"Versão do snapshot não suportada: {cabecalho.get('versao')}")
+    return cabecalho
+
+# Guarda na cache de rotas as distâncias/durações de um lote de itinerários,
+# para que editar ou recalcular um itinerário reaberto não volte a chamar a API
+def semear_cache_rotas(itinerarios, cabecalho):
+    parametros = cabecalho.get("rota", {})
+    try:
+        criado = datetime.fromisoformat(cabecalho["criado"]).timestamp()     # A validade conta desde a gravação
+    except (KeyError, ValueError):
+        criado = None
+    rotas = [(it.origem, it.destino, {"distancia": formatar_distancia(it.distancia_m),
+                                      "duracao": formatar_duracao(it.duracao_s),
+                                      "distancia_m": it.distancia_m, "duracao_s": it.duracao_s})
+             for it in itinerarios if it.distancia_m is not None and it.duracao_s is not None]
+    if rotas:
+        cache_rotas.guardar_varios(rotas, parametros.get("modo", "driving"), parametros.get("idioma", "pt-pt"), criado)
+
+# Lê um snapshot e entrega os itinerários em lotes: entregar(lote, estado) (mesmo contrato que
+# importar_itinerarios_texto, para a interface tratar os dois formatos da mesma maneira)
+def importar_itinerarios_snapshot(caminho, entregar, tamanho_lote=500, cancelar=None):
+    tamanho_ficheiro = os.path.getsize(caminho) or 1
+    estado = {"importados": 0, "ignorados": 0, "linhas_ignoradas": [], "fracao": 0.0}
+    lote = []
+
+    def enviar(fracao):
+        semear_cache_rotas(lote, cabecalho)
+        estado["importados"] += len(lote)
+        estado["fracao"] = fracao
+        entregar(lote, dict(estado))
+
+    with open(caminho, "rb") as bruto:
+        # O progresso é medido no ficheiro em disco (comprimido ou não)
+        f = gzip.GzipFile(fileobj=bruto, mode="rb") if caminho.lower().endswith(".gz") else bruto
+        cabecalho = ler_cabecalho_snapshot(f.readline().decode("utf-8-sig"))
+        for numero, linha in enumerate(f, start=2):
+            if cancelar is not None and cancelar.is_set():
+                break
+            if not linha.strip():
+                continue
+            try:
+                lote.append(itinerario_de_dict(json.loads(linha)))
+            except (ValueError, KeyError, TypeError):
+                estado["ignorados"] += 1
+                if len(estado["linhas_ignoradas"]) < 20:
+                    estado["linhas_ignoradas"].append(numero)
+                continue
+            if len(lote) >= tamanho_lote:
+                enviar(min(1.0, bruto.tell() / tamanho_ficheiro))
+                lote = []
+    if lote:
+        enviar(1.0)
+    estado["fracao"] = 1.0
+    return estado
+
+# Escolhe o importador certo para o ficheiro (.txt exportado ou snapshot .jsonl/.jsonl.gz)
+def importar_itinerarios_ficheiro(caminho, entregar, tamanho_lote=500, cancelar=None):
+    importador = importar_itinerarios_snapshot if e_snapshot(caminho) else importar_itinerarios_texto
+    return importador(caminho, entregar, tamanho_lote, cancelar)
+
+# Acesso preguiçoso a um snapshot .jsonl grande: o ficheiro é mapeado em memória (mmap) e só se
+# guarda a posição de cada linha; cada itinerário é interpretado apenas quando é pedido
+# (útil para mostrar uma página ou procurar alguns itinerários sem carregar o plano inteiro)
+# Os snapshots comprimidos não podem ser mapeados: use importar_itinerarios_snapshot para esses
+class SnapshotItinerarios:
+    def __init__(self, caminho):
+        if caminho.lower().endswith(".gz"):
+            raise ValueError("Os snapshots comprimidos (.gz) só podem ser lidos sequencialmente.")
+        self.ficheiro = open(caminho, "rb")
+        try:
+            # O mmap não aceita ficheiros vazios (ValueError pouco claro)
+            if os.fstat(self.ficheiro.fileno()).st_size == 0:
+                raise ValueError("Snapshot inválido: o ficheiro está vazio.")
+            self.mapa = mmap.mmap(self.ficheiro.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self.ficheiro.close()
+            raise
+        fim = self.mapa.find(b"\n")
+        fim = len(self.mapa) if fim == -1 else fim
+        try:
+            self.cabecalho = ler_cabecalho_snapshot(self.mapa[:fim].decode("utf-8-sig", errors="replace"))
+        except ValueError as erro:
+            self.fechar()
+            raise ValueError(f"Snapshot inválido: {erro}") from None
+        # Posições de início de cada linha de dados não vazia (o fim de cada uma é procurado ao lê-la)
+        self.posicoes = []
+        inicio = fim + 1
+        while inicio < len(self.mapa):
+            fim = self.mapa.find(b"\n", inicio)
+            if fim == -1:
+                fim = len(self.mapa)
+            if fim > inicio:
+                self.posicoes.append(inicio)
+            inicio = fim + 1
+
+    def __len__(self):
+        return len(self.posicoes)
+
+    # Interpreta só a linha pedida
+    def __getitem__(self, indice):
+        inicio = self.posicoes[indice]
+        fim = self.mapa.find(b"\n", inicio)
+        return itinerario_de_dict(json.loads(self.mapa[inicio:fim if fim != -1 else len(self.mapa)]))
+
+    def __iter__(self):
+        for indice in range(len(self.posicoes)):
+            yield self[indice]
+
+    def fechar(self):
+        self.mapa.close()
+        self.ficheiro.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()
@@ -0,0 +1,20 @@
+# Funções auxiliares partilhadas pelos módulos do pacote
+import importlib                                    # Importação adiada de bibliotecas pesadas
+
+
+# Módulo importado só no primeiro acesso a um atributo (ex: mysql.connector, googlemaps, numpy):
+# importar o pacote não carrega bibliotecas que podem nem chegar a ser usadas nesta execução
+class ModuloPreguicoso:
+    def __init__(self, nome):
+        self._nome = nome
+        self._modulo = None
+
+    def __getattr__(self, atributo):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nome)
+        return getattr(self._modulo, atributo)
+
+# Divide uma lista em blocos de tamanho fixo (limites da API, cláusulas IN e lotes de escrita)
+def blocos(lista, tamanho):
+    for i in range(0, len(lista), tamanho):
+        yield lista[i:i + tamanho]
@@ -0,0 +1,5 @@
+# Configuração comum dos testes: permite importar o pacote planeamento_viagens a partir da raiz do projeto
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
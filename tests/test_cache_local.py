@@ -0,0 +1,54 @@
+# Testes da cache local de rotas: acessos gravados em lote e remoção das rotas menos usadas (LRU)
+import sqlite3
+
+import pytest
+
+from planeamento_viagens.cache_local import CacheRotas
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CacheRotas(str(tmp_path / "cache_rotas.db"), max_entradas=3, acessos_por_gravacao=3)
+    yield cache
+    cache.fechar()
+
+def rota(metros):
+    return {"distancia_m": metros, "duracao_s": metros // 10}
+
+# Último acesso gravado no ficheiro (lido por outra ligação)
+def acedido(cache, origem, destino):
+    with sqlite3.connect(cache.caminho) as conn:
+        return conn.execute("SELECT acedido FROM rotas WHERE chave = ?",
+                            (cache.chave(origem, destino, "driving", "pt-pt"),)).fetchone()[0]
+
+
+# Um acerto não escreve no ficheiro; os acessos são gravados de "acessos_por_gravacao" em "acessos_por_gravacao"
+def test_acessos_gravados_em_lote(cache):
+    cache.guardar("A", "B", "driving", "pt-pt", rota(100))
+    gravado = acedido(cache, "A", "B")
+    assert cache.obter("a ", "B", "driving", "pt-pt") == rota(100)
+    cache.obter("A", "B", "driving", "pt-pt")
+    assert acedido(cache, "A", "B") == gravado and len(cache.acessos) == 1
+    cache.guardar("C", "D", "driving", "pt-pt", rota(200))
+    cache.guardar("E", "F", "driving", "pt-pt", rota(300))
+    for origem, destino in [("C", "D"), ("E", "F"), ("A", "B")]:
+        cache.obter(origem, destino, "driving", "pt-pt")
+    assert cache.acessos == {} and acedido(cache, "A", "B") > gravado
+
+# A remoção LRU conta com os acessos ainda não gravados
+def test_lru_usa_acessos_pendentes(cache):
+    for i, (origem, destino) in enumerate([("A", "B"), ("C", "D"), ("E", "F")]):
+        cache.guardar(origem, destino, "driving", "pt-pt", rota(100 * i))
+    cache.obter("A", "B", "driving", "pt-pt")       # A rota mais antiga passa a ser a mais recente
+    cache.guardar("G", "H", "driving", "pt-pt", rota(400))
+    assert cache.obter("A", "B", "driving", "pt-pt") is not None
+    assert cache.obter("C", "D", "driving", "pt-pt") is None
+
+# Fechar (ou mudar de ficheiro) grava os acessos pendentes
+def test_fechar_grava_acessos(cache):
+    cache.guardar("A", "B", "driving", "pt-pt", rota(100))
+    gravado = acedido(cache, "A", "B")
+    cache.obter("A", "B", "driving", "pt-pt")
+    cache.fechar()
+    assert acedido(cache, "A", "B") > gravado
+    assert cache.obter("A", "B", "driving", "pt-pt") == rota(100)     # Volta a abrir o ficheiro
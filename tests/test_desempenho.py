@@ -0,0 +1,48 @@
+# Testes da comparação das medições de desempenho com uma base gravada
+import json
+
+import pytest
+
+from planeamento_viagens.desempenho import DIFERENCA_MINIMA_MS, FORMATO_MEDICOES, comparar_medicoes, ler_medicoes
+
+
+# Documento de medições com os tempos (ms) indicados
+def medicoes(**resultados):
+    return {"formato": FORMATO_MEDICOES, "versao": 1, "resultados": resultados}
+
+
+# Só as medições presentes nos dois documentos são comparadas, pela ordem dos resultados atuais
+def test_compara_medicoes_comuns():
+    atual = medicoes(autocomplete=12.0, tabela=30.0, nova=5.0)
+    base = medicoes(tabela=30.0, autocomplete=10.0, antiga=1.0)
+    assert comparar_medicoes(atual, base) == [("autocomplete", 10.0, 12.0, 1.2, False),
+                                              ("tabela", 30.0, 30.0, 1.0, False)]
+
+@pytest.mark.parametrize("base_ms, atual_ms, regressao", [
+    (10.0, 12.0, False),        # Exatamente no limite da tolerância
+    (10.0, 12.5, True),
+    (10.0, 5.0, False),         # Mais rápida
+    (1.0, 1.4, False),          # 40% mais lenta, mas menos de DIFERENCA_MINIMA_MS
+    (1.0, 1.0 + DIFERENCA_MINIMA_MS, True),
+    (0.0, 0.0, False),          # Base nula sem diferença
+    (0.0, 2.0, True),           # Base nula: razão infinita
+])
+def test_regressao(base_ms, atual_ms, regressao):
+    [(_, _, _, _, obtida)] = comparar_medicoes(medicoes(m=atual_ms), medicoes(m=base_ms))
+    assert obtida is regressao
+
+# A tolerância é configurável e uma base sem resultados não gera comparações
+def test_tolerancia_e_base_vazia():
+    assert comparar_medicoes(medicoes(m=12.5), medicoes(m=10.0), tolerancia=0.3)[0][4] is False
+    assert comparar_medicoes(medicoes(m=12.5), medicoes(m=10.0), tolerancia=0.1)[0][4] is True
+    assert comparar_medicoes(medicoes(m=12.5), {}) == []
+
+# Um ficheiro de medições gravado é lido de volta; outros ficheiros JSON são rejeitados
+def test_ler_medicoes(tmp_path):
+    caminho = tmp_path / "base.json"
+    caminho.write_text(json.dumps(medicoes(tabela=3.5)), encoding="utf-8")
+    assert ler_medicoes(caminho)["resultados"] == {"tabela": 3.5}
+    outro = tmp_path / "outro.json"
+    outro.write_text(json.dumps({"resultados": {}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="não é um ficheiro de medições"):
+        ler_medicoes(outro)
@@ -0,0 +1,105 @@
+# Testes do índice espacial em grelha, comparado com a procura exaustiva pela distância haversine
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from planeamento_viagens import espacial
+from planeamento_viagens.espacial import IndiceEspacial, distancia_haversine_km
+
+TIPOS = ["Cultural", "Desportivo", "Gastronómico", "Outro"]
+
+
+# Atrações (id, nome, tipo, lat, lng) espalhadas por Portugal continental, mais um grupo denso em Lisboa
+@pytest.fixture(scope="module")
+def atracoes():
+    gerador = random.Random(3)
+    pontos = [(gerador.uniform(37.0, 42.1), gerador.uniform(-9.5, -6.2)) for _ in range(1500)]
+    pontos += [(gerador.gauss(38.72, 0.02), gerador.gauss(-9.14, 0.02)) for _ in range(500)]
+    return [(i, f"Atração {i}", gerador.choice(TIPOS), lat, lng) for i, (lat, lng) in enumerate(pontos)]
+
+@pytest.fixture(scope="module")
+def indice(atracoes):
+    return IndiceEspacial(atracoes)
+
+# Pontos de pesquisa: dentro do grupo denso, no meio do país e longe de todas as atrações (no mar e em Espanha)
+PONTOS = [(38.72, -9.14), (38.70, -9.20), (40.2, -8.4), (41.15, -8.61), (37.5, -12.0), (40.4, -3.7), (45.0, -9.0)]
+
+
+# Distâncias a todas as atrações (opcionalmente de um tipo), por ordem crescente
+def forca_bruta(atracoes, lat, lng, tipo=None):
+    return sorted((distancia_haversine_km(lat, lng, a[3], a[4]), a) for a in atracoes if tipo in (None, a[2]))
+
+
+# A distância haversine conhecida entre Lisboa e Porto (~274 km) e simétrica
+def test_distancia_haversine():
+    lisboa, porto = (38.7223, -9.1393), (41.1579, -8.6291)
+    assert distancia_haversine_km(*lisboa, *porto) == pytest.approx(274, abs=2)
+    assert distancia_haversine_km(*lisboa, *porto) == pytest.approx(distancia_haversine_km(*porto, *lisboa))
+    assert distancia_haversine_km(*lisboa, *lisboa) == 0
+
+@pytest.mark.parametrize("lat, lng", PONTOS)
+@pytest.mark.parametrize("tipo", [None, "Cultural"])
+@pytest.mark.parametrize("raio_km", [0.5, 3, 25, 150])
+def test_no_raio_igual_a_forca_bruta(atracoes, indice, lat, lng, tipo, raio_km):
+    esperados = [(d, a) for d, a in forca_bruta(atracoes, lat, lng, tipo) if d <= raio_km]
+    obtidos = indice.no_raio(lat, lng, raio_km, tipo)
+    assert [d for d, _ in obtidos] == pytest.approx([d for d, _ in esperados])
+    assert {a for _, a in obtidos} == {a for _, a in esperados}
+
+@pytest.mark.parametrize("lat, lng", PONTOS)
+@pytest.mark.parametrize("tipo", [None, "Gastronómico"])
+@pytest.mark.parametrize("k", [1, 5, 40])
+def test_mais_proximas_igual_a_forca_bruta(atracoes, indice, lat, lng, tipo, k):
+    esperados = forca_bruta(atracoes, lat, lng, tipo)[:k]
+    obtidos = indice.mais_proximas(lat, lng, k, tipo)
+    # Só as distâncias são comparadas: com empates na k-ésima posição qualquer das atrações serve
+    assert [d for d, _ in obtidos] == pytest.approx([d for d, _ in esperados])
+
+@pytest.mark.parametrize("caixa", [(38.70, -9.16, 38.74, -9.12), (37.0, -9.5, 42.1, -6.2),
+                                   (40.0, -8.0, 40.0001, -7.9999), (43.0, -5.0, 44.0, -4.0)])
+@pytest.mark.parametrize("tipo", [None, "Outro"])
+def test_na_caixa_igual_a_forca_bruta(atracoes, indice, caixa, tipo):
+    lat_min, lng_min, lat_max, lng_max = caixa
+    esperados = {a for a in atracoes
+                 if tipo in (None, a[2]) and lat_min <= a[3] <= lat_max and lng_min <= a[4] <= lng_max}
+    assert set(indice.na_caixa(*caixa, tipo=tipo)) == esperados
+
+# Pedir mais atrações do que existem devolve todas; tipos desconhecidos ou k <= 0 não devolvem nada
+def test_mais_proximas_limites(atracoes, indice):
+    assert len(indice.mais_proximas(40.0, -8.0, k=len(atracoes) + 10)) == len(atracoes)
+    assert indice.mais_proximas(40.0, -8.0, k=5, tipo="Inexistente") == []
+    assert indice.mais_proximas(40.0, -8.0, k=0) == []
+    assert indice.no_raio(40.0, -8.0, 50, tipo="Inexistente") == []
+    assert IndiceEspacial([]).mais_proximas(40.0, -8.0) == []
+
+# Pesquisas simultâneas constroem o índice uma só vez; depois de invalidado volta a ser construído
+def test_indice_construido_uma_vez(monkeypatch, atracoes):
+    consultas = []
+
+    class Cursor:
+        def execute(self, sql):
+            consultas.append(sql)
+            time.sleep(0.05)            # Dá tempo às outras threads de chegarem à construção
+
+        def fetchall(self):
+            return atracoes
+
+    @contextmanager
+    def cursor_falso():
+        yield Cursor()
+
+    monkeypatch.setattr(espacial, "cursor_bd", cursor_falso)
+    espacial.invalidar_indice_espacial()
+    indices = []
+    threads = [threading.Thread(target=lambda: indices.append(espacial.obter_indice_espacial())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(consultas) == 1 and all(indice is indices[0] for indice in indices)
+    espacial.invalidar_indice_espacial()
+    assert espacial.obter_indice_espacial() is not indices[0] and len(consultas) == 2
+    espacial.invalidar_indice_espacial()
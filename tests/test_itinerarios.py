@@ -0,0 +1,188 @@
+# Testes do modelo de itinerários: armazém ordenado (bisect) com eventos e leitura do formato de texto exportado
+import io
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from planeamento_viagens.itinerarios import (TEXTO_A_CALCULAR, ArmazemItinerarios, Itinerario, agrupar_encadeados,
+                                             escrever_itinerarios_texto, formatar_distancia, formatar_duracao,
+                                             importar_itinerarios_texto, interpretar_distancia, interpretar_duracao,
+                                             ler_blocos_itinerarios)
+
+INICIO = datetime(2024, 5, 1, 9, 0)
+
+# Itinerário de teste a "minutos" do início
+def itinerario(minutos, origem="Lisboa", destino="Porto", **campos):
+    return Itinerario(origem, destino, "Cultural", INICIO + timedelta(minutes=minutos), **campos)
+
+# Armazém que regista os eventos recebidos numa lista
+def armazem_com_eventos():
+    armazem = ArmazemItinerarios()
+    eventos = []
+    armazem.subscrever(lambda evento, **dados: eventos.append((evento, dados)))
+    return armazem, eventos
+
+# Campos que o formato de texto preserva (o id é novo em cada importação)
+def campos(it):
+    return it.origem, it.destino, it.tipo, it.data_hora, it.notas, it.distancia_m, it.duracao_s
+
+# Confirma que a ordem interna do armazém é a ordem por (data/hora, id)
+def verificar_ordem(armazem):
+    lista = list(armazem)
+    assert [it.chave() for it in lista] == sorted(it.chave() for it in lista)
+    for posicao, it in enumerate(lista):
+        assert armazem[posicao] is it
+        assert armazem.posicao(it.id) == posicao
+
+
+# --- Armazém de itinerários ---
+
+# Inserções por ordem aleatória ficam ordenadas e cada evento indica a posição em que o itinerário ficou
+def test_inserir_mantem_ordem_e_indica_posicao():
+    armazem, eventos = armazem_com_eventos()
+    gerador = random.Random(1)
+    itinerarios = [itinerario(gerador.randrange(0, 600, 15)) for _ in range(200)]     # Com horas repetidas
+    for it in itinerarios:
+        armazem.inserir(it)
+        evento, dados = eventos[-1]
+        assert evento == "inserido"
+        assert dados["itinerario"] is it
+        assert armazem[dados["posicao"]] is it
+    assert len(armazem) == len(itinerarios)
+    verificar_ordem(armazem)
+
+# Atualizar com outra data/hora move o itinerário e indica as posições antiga e nova
+def test_atualizar_move_itinerario():
+    armazem, eventos = armazem_com_eventos()
+    itinerarios = [itinerario(60 * i) for i in range(5)]
+    for it in itinerarios:
+        armazem.inserir(it)
+    primeiro = itinerarios[0]
+    movido = Itinerario(primeiro.origem, primeiro.destino, primeiro.tipo, INICIO + timedelta(hours=10),
+                        id=primeiro.id)
+    armazem.atualizar(movido)
+    evento, dados = eventos[-1]
+    assert evento == "atualizado"
+    assert (dados["posicao_antiga"], dados["posicao"]) == (0, 4)
+    assert armazem[4] is movido and armazem.obter(primeiro.id) is movido
+    assert len(armazem) == 5
+    verificar_ordem(armazem)
+
+# Remover retira o itinerário e indica a posição que ocupava
+def test_remover_indica_posicao():
+    armazem, eventos = armazem_com_eventos()
+    itinerarios = [itinerario(60 * i) for i in range(5)]
+    for it in itinerarios:
+        armazem.inserir(it)
+    armazem.remover(itinerarios[2].id)
+    assert eventos[-1] == ("removido", {"posicao": 2, "itinerario": itinerarios[2]})
+    assert itinerarios[2].id not in armazem
+    assert list(armazem) == itinerarios[:2] + itinerarios[3:]
+    with pytest.raises(KeyError):
+        armazem.remover(itinerarios[2].id)
+
+# Inserir vários de uma vez gera um só evento, substitui os ids repetidos e deixa tudo ordenado
+def test_inserir_varios_e_limpar():
+    armazem, eventos = armazem_com_eventos()
+    existente = itinerario(30)
+    armazem.inserir(existente)
+    substituto = Itinerario("Faro", "Braga", "Outro", INICIO + timedelta(hours=5), id=existente.id)
+    novos = [itinerario(m) for m in (90, 0, 45)] + [substituto]
+    eventos.clear()
+    armazem.inserir_varios(it for it in novos)
+    assert [evento for evento, _ in eventos] == ["carregado"]
+    assert eventos[0][1]["itinerarios"] == novos
+    assert len(armazem) == 4 and armazem.obter(existente.id) is substituto
+    verificar_ordem(armazem)
+    armazem.limpar()
+    evento, dados = eventos[-1]         # Indica os ids que a lista tinha (a gravação só apaga esses)
+    assert evento == "limpo" and sorted(dados["ids"]) == sorted(it.id for it in novos[:3] + [existente])
+    assert len(armazem) == 0 and list(armazem) == []
+
+# Só as rotas ainda por calcular (ou interrompidas a meio da exportação) contam como pendentes
+def test_rota_pendente():
+    assert itinerario(0).rota_pendente()
+    assert itinerario(0, estado_rota="Distância - a calcular…").rota_pendente()
+    assert not itinerario(0, distancia_m=1000, duracao_s=600).rota_pendente()
+    assert not itinerario(0, estado_rota="Rota não encontrada.").rota_pendente()
+
+# Itinerários seguidos do mesmo dia em que o destino é a origem do seguinte formam uma cadeia
+def test_agrupar_encadeados():
+    a = itinerario(0, "Hotel", "Museu")
+    b = itinerario(60, "museu ", "Praia")
+    c = itinerario(120, "Castelo", "Hotel")
+    d = itinerario(24 * 60, "Hotel", "Castelo")     # Dia seguinte
+    assert list(agrupar_encadeados([a, b, c, d])) == [[a, b], [c], [d]]
+    assert list(agrupar_encadeados([])) == []
+
+
+# --- Formato de texto exportado ---
+
+# As distâncias e durações formatadas como na API são lidas de volta sem perda (ao metro / ao minuto)
+@pytest.mark.parametrize("metros", [0, 1, 950, 999])
+def test_distancia_exata_abaixo_de_1_km(metros):
+    assert interpretar_distancia(formatar_distancia(metros)) == metros
+
+@pytest.mark.parametrize("texto, metros", [("1,5 km", 1500), ("9,9 km", 9900), ("321 km", 321000),
+                                           ("2.5 km", 2500), ("abc", None), ("", None)])
+def test_interpretar_distancia(texto, metros):
+    assert interpretar_distancia(texto) == metros
+
+@pytest.mark.parametrize("minutos", [1, 45, 60, 65, 189, 1440, 1500, 3000])
+def test_duracao_ida_e_volta(minutos):
+    assert interpretar_duracao(formatar_duracao(minutos * 60)) == minutos * 60
+
+# Um itinerário completo passa pelo resumo() e volta igual (exceto a distância, arredondada como na API)
+def test_de_texto_ida_e_volta():
+    original = Itinerario("Torre de Belém", "Porto - Ribeira", "Gastronómica", datetime(2024, 12, 31, 23, 5),
+                          "Levar guarda-chuva", 313000, 3 * 3600 + 9 * 60)
+    lido = Itinerario.de_texto(original.resumo().splitlines())
+    assert (lido.origem, lido.destino, lido.tipo, lido.data_hora, lido.notas) == \
+        (original.origem, original.destino, original.tipo, original.data_hora, original.notas)
+    assert (lido.distancia_m, lido.duracao_s, lido.estado_rota) == (313000, 3 * 3600 + 9 * 60, None)
+
+# Rotas sem resultado e rotas que ainda estavam a ser calculadas mantêm o estado (só as últimas ficam pendentes)
+def test_de_texto_estados_da_rota():
+    falhada = Itinerario("A", "B", "Outro", INICIO, estado_rota="Rota não encontrada.")
+    lida = Itinerario.de_texto(falhada.resumo().splitlines())
+    assert lida.estado_rota == "Rota não encontrada." and lida.distancia_m is None
+    linhas = ["📍 De A até B", "     Tipo de Atividade - Viagem Outro", "     Data - 01/05/2024",
+              "     Hora - 09:00", "     " + TEXTO_A_CALCULAR]
+    pendente = Itinerario.de_texto(linhas)
+    assert pendente.estado_rota == TEXTO_A_CALCULAR and pendente.distancia_m is None and pendente.rota_pendente()
+
+@pytest.mark.parametrize("linhas", [
+    [],
+    ["Sem cabeçalho", "     Data - 01/05/2024", "     Hora - 09:00"],
+    ["📍 De A até B", "     Data - 01/05/2024"],
+    ["📍 De A até B", "     Data - 31/02/2024", "     Hora - 09:00"],
+])
+def test_de_texto_blocos_invalidos(linhas):
+    assert Itinerario.de_texto(linhas) is None
+
+# Os blocos são separados por linhas em branco (uma ou várias, com \r\n ou BOM) e indicam a linha inicial
+def test_ler_blocos_itinerarios():
+    conteudo = "﻿a\r\nb\r\n\r\n\r\nc\n   \nd\ne".encode("utf-8")
+    assert list(ler_blocos_itinerarios(io.BytesIO(conteudo))) == [(1, ["a", "b"]), (5, ["c"]), (7, ["d", "e"])]
+    assert list(ler_blocos_itinerarios(io.BytesIO(b""))) == []
+
+# Exportar e importar um plano devolve os mesmos itinerários, em lotes, e conta os blocos inválidos
+def test_exportar_e_importar_texto(tmp_path):
+    gerador = random.Random(7)
+    itinerarios = [Itinerario(f"Origem {i}", f"Destino {i}", gerador.choice(["Cultural", "Outro"]),
+                              INICIO + timedelta(minutes=gerador.randrange(0, 10000)), f"nota {i}" if i % 3 else "",
+                              gerador.randrange(0, 999), gerador.randrange(1, 1440) * 60)
+                   for i in range(25)]
+    caminho = tmp_path / "plano.txt"
+    escrever_itinerarios_texto(caminho, itinerarios)
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write("Linha solta que não é um itinerário\n")
+    lotes = []
+    estado = importar_itinerarios_texto(caminho, lambda lote, estado: lotes.append((list(lote), estado)),
+                                        tamanho_lote=10)
+    assert [len(lote) for lote, _ in lotes] == [10, 10, 5]
+    assert [estado["importados"] for _, estado in lotes] == [10, 20, 25]
+    assert estado["importados"] == 25 and estado["ignorados"] == 1 and estado["fracao"] == 1.0
+    lidos = [it for lote, _ in lotes for it in lote]
+    assert [campos(it) for it in lidos] == [campos(it) for it in itinerarios]
@@ -0,0 +1,139 @@
+# Testes da otimização da ordem das visitas, comparada com a procura exaustiva em casos pequenos
+import itertools
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from planeamento_viagens import otimizacao  # noqa: E402
+from planeamento_viagens.espacial import IndiceEspacial  # noqa: E402
+from planeamento_viagens.otimizacao import (_avaliar_ordens, _vizinho_mais_proximo, avaliar_ordem,  # noqa: E402
+                                            estimar_matriz, otimizar_ordem, sugerir_atracoes_proximas)
+
+N_CASOS = 40
+
+
+# Caso aleatório com n locais (o 0 é a partida): durações assimétricas (s) a partir de pontos num plano,
+# 30 min de visita em cada atração e, opcionalmente, horários de abertura em cerca de 60% das atrações
+def gerar_caso(semente, n=7, com_janelas=False):
+    gerador = np.random.default_rng(semente)
+    pontos = gerador.uniform(0, 20, (n, 2))
+    duracoes = np.linalg.norm(pontos[:, None] - pontos[None], axis=2) * 120 * gerador.uniform(0.9, 1.2, (n, n))
+    np.fill_diagonal(duracoes, 0)
+    visita = np.full(n, 1800.0)
+    visita[0] = 0
+    janelas = None
+    if com_janelas:
+        janelas = [None]
+        for _ in range(1, n):
+            if gerador.random() < 0.6:
+                abertura = gerador.uniform(0, 6 * 3600)
+                janelas.append((abertura, abertura + gerador.uniform(1800, 3 * 3600)))
+            else:
+                janelas.append(None)
+    return duracoes, visita, janelas
+
+# Custo da melhor ordem possível (todas as permutações das atrações depois da partida)
+def custo_otimo(duracoes, visita, janelas, inicio=0):
+    restantes = [i for i in range(len(duracoes)) if i != inicio]
+    return min(avaliar_ordem([inicio] + list(ordem), duracoes, 0, visita, janelas)[0]
+               for ordem in itertools.permutations(restantes))
+
+# Razões entre o custo encontrado e o ótimo, verificando em cada caso que a ordem e o custo devolvidos são coerentes
+def razoes_ao_otimo(com_janelas, inicio=0):
+    razoes = []
+    for semente in range(N_CASOS):
+        duracoes, visita, janelas = gerar_caso(semente, com_janelas=com_janelas)
+        ordem, custo, chegadas = otimizar_ordem(duracoes, inicio, 0, visita, janelas)
+        assert ordem[0] == inicio and sorted(ordem) == list(range(len(duracoes)))
+        assert (custo, chegadas) == avaliar_ordem(ordem, duracoes, 0, visita, janelas)
+        razoes.append(custo / custo_otimo(duracoes, visita, janelas, inicio))
+    return np.array(razoes)
+
+
+# Sem janelas a melhoria local (2-opt e Or-opt) fica muito perto do ótimo
+def test_sem_janelas_perto_do_otimo():
+    razoes = razoes_ao_otimo(com_janelas=False)
+    assert razoes.min() >= 1 - 1e-9
+    assert razoes.mean() <= 1.01 and razoes.max() <= 1.05
+
+# Com janelas as alterações têm de ser avaliadas pelo custo completo (esperas e atrasos), e não só pela
+# soma das viagens; caso contrário a procura chega a ficar várias vezes acima do ótimo
+def test_com_janelas_perto_do_otimo():
+    razoes = razoes_ao_otimo(com_janelas=True)
+    assert razoes.min() >= 1 - 1e-9
+    assert razoes.mean() <= 1.02 and razoes.max() <= 1.15
+
+# A partida não tem de ser o primeiro índice da matriz
+def test_partida_noutro_indice():
+    razoes = razoes_ao_otimo(com_janelas=True, inicio=3)
+    assert razoes.max() <= 1.15
+
+# Um dia grande (200 paragens) com janelas espalhadas pelo percurso otimiza-se em bem menos de um segundo
+# (o limite do teste tem folga para máquinas lentas) e melhora a semente do vizinho mais próximo
+def test_com_janelas_200_paragens():
+    n = 200
+    duracoes, visita, _ = gerar_caso(11, n=n)
+    gerador = np.random.default_rng(11)
+    janelas = [None] + [(abertura, abertura + gerador.uniform(1800, 4 * 3600)) if gerador.random() < 0.6 else None
+                        for abertura in gerador.uniform(0, n * 2400, n - 1)]
+    inicio = time.perf_counter()
+    ordem, custo, _ = otimizar_ordem(duracoes, 0, 0, visita, janelas)
+    assert time.perf_counter() - inicio < 2
+    assert sorted(ordem) == list(range(n)) and custo == avaliar_ordem(ordem, duracoes, 0, visita, janelas)[0]
+    semente = _vizinho_mais_proximo(duracoes, 0, 0, visita, janelas)
+    assert custo < avaliar_ordem(semente, duracoes, 0, visita, janelas)[0]
+
+# Com um ou dois locais não há nada a otimizar
+def test_casos_triviais():
+    duracoes = np.array([[0.0, 100.0], [200.0, 0.0]])
+    assert otimizar_ordem(duracoes, inicio=1) == ([1, 0], 200.0, [0, 200.0])
+    assert otimizar_ordem(np.zeros((1, 1))) == ([0], 0, [0])
+
+# Chegar antes da abertura obriga a esperar; chegar depois do fecho é penalizado
+def test_avaliar_ordem_com_janelas():
+    duracoes = np.array([[0.0, 600.0, 900.0], [600.0, 0.0, 300.0], [900.0, 300.0, 0.0]])
+    visita = np.array([0.0, 1800.0, 1800.0])
+    custo, chegadas = avaliar_ordem([0, 1, 2], duracoes, 1000, visita, [None, (3600, 7200), (0, 3000)])
+    assert chegadas == [1000, 3600, 3600 + 1800 + 300]
+    assert custo == 5700 - 1000 + 10 * (5700 - 3000)
+
+# A avaliação vetorizada dá o mesmo custo que a simulação de cada ordem
+def test_avaliar_ordens_igual_a_avaliar_ordem():
+    duracoes, visita, janelas = gerar_caso(5, n=6, com_janelas=True)
+    abertura = np.array([j[0] if j else -np.inf for j in janelas])
+    fecho = np.array([j[1] if j else np.inf for j in janelas])
+    ordens = [[0] + list(ordem) for ordem in itertools.permutations(range(1, 6))]
+    custos = _avaliar_ordens(np.array(ordens), duracoes, 900, visita, abertura, fecho)
+    esperados = [avaliar_ordem(ordem, duracoes, 900, visita, janelas)[0] for ordem in ordens]
+    assert np.allclose(custos, esperados)
+
+# Os pares em falta são estimados pelo sentido inverso ou pelo caminho mais curto; os conhecidos não mudam
+def test_estimar_matriz():
+    nan = np.nan
+    matriz = np.array([[0, 100, nan, nan],
+                       [nan, 0, 50, nan],
+                       [nan, nan, 0, nan],
+                       [nan, nan, nan, 0]])
+    completa, estimados = estimar_matriz(matriz.copy())
+    assert (estimados == np.isnan(matriz)).all()
+    conhecidos = ~np.isnan(matriz)
+    assert (completa[conhecidos] == matriz[conhecidos]).all()
+    assert completa[1, 0] == 100            # Sentido inverso
+    assert completa[0, 2] == 150            # 0 -> 1 -> 2
+    assert completa[2, 0] == 150            # Inverso de 0 -> 2, através de 2 -> 1 -> 0
+    assert completa[0, 3] == completa[3, 0] == 2 * 150     # Sem ligação: dobro do maior valor
+    assert np.isfinite(completa).all()
+
+# As sugestões vêm do índice espacial, sem a partida, sem as já escolhidas e sem nomes repetidos
+def test_sugerir_atracoes_proximas(monkeypatch):
+    atracoes = [(1, "Hotel", "Outro", 38.70, -9.10), (2, "Museu", "Cultural", 38.701, -9.10),
+                (3, "Museu", "Cultural", 38.702, -9.10), (4, "Praia", "Outro", 38.703, -9.10),
+                (5, "Castelo", "Cultural", 38.704, -9.10), (6, "Longe", "Outro", 41.0, -8.0)]
+    coordenadas = {"Hotel": (38.70, -9.10)}
+    monkeypatch.setattr(otimizacao, "obter_indice_espacial", lambda: IndiceEspacial(atracoes))
+    monkeypatch.setattr(otimizacao.estimador_rotas, "coordenadas_local", coordenadas.get)
+    assert sugerir_atracoes_proximas("Hotel", k=2) == ["Museu", "Praia"]
+    assert sugerir_atracoes_proximas("Hotel", k=3, excluir=["Praia"]) == ["Museu", "Castelo", "Longe"]
+    assert sugerir_atracoes_proximas("Desconhecido") == []
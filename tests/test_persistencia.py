@@ -0,0 +1,102 @@
+# Testes da gravação "write-behind" dos itinerários (a escrita na base de dados é substituída por uma lista)
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from planeamento_viagens import persistencia
+from planeamento_viagens.itinerarios import ArmazemItinerarios, Itinerario
+from planeamento_viagens.persistencia import GravadorItinerarios
+
+INICIO = datetime(2024, 5, 1, 9, 0)
+
+
+# Gravações feitas, como (chaves gravadas, chaves apagadas); com "falhar" a próxima gravação lança esse erro
+class BaseFalsa:
+    def __init__(self):
+        self.gravacoes = []
+        self.falhar = None
+
+    def __call__(self, linhas, chaves_apagar=()):
+        if self.falhar is not None:
+            erro, self.falhar = self.falhar, None
+            raise erro
+        self.gravacoes.append(([linha[0] for linha in linhas], list(chaves_apagar)))
+
+@pytest.fixture
+def base(monkeypatch):
+    base = BaseFalsa()
+    monkeypatch.setattr(persistencia, "gravar_itinerarios_bd", base)
+    return base
+
+# Armazém ligado a um gravador cuja thread não chega a gravar sozinha (as gravações são pedidas no teste)
+@pytest.fixture
+def armazem_e_gravador(base):
+    armazem = ArmazemItinerarios()
+    gravador = GravadorItinerarios(intervalo=3600)
+    armazem.subscrever(gravador.ao_alterar)
+    yield armazem, gravador
+    gravador.fechar()
+
+def itinerarios(quantos):
+    return [Itinerario(f"Origem {i}", f"Destino {i}", "Cultural", INICIO + timedelta(hours=i)) for i in range(quantos)]
+
+
+# Limpar a lista apaga só os itinerários que ela tinha; os que foram lidos sem gravar também contam
+def test_limpar_apaga_so_as_chaves_da_lista(base, armazem_e_gravador):
+    armazem, gravador = armazem_e_gravador
+    lidos, novos = itinerarios(2), itinerarios(3)
+    with gravador.sem_gravar():
+        armazem.inserir_varios(lidos)
+    armazem.inserir_varios(novos)
+    armazem.limpar()
+    gravador.gravar()
+    assert base.gravacoes == [([], [it.id for it in novos] + [it.id for it in lidos])]
+
+# Limpar sem gravar (importação) não apaga nada da base de dados
+def test_limpar_sem_gravar(base, armazem_e_gravador):
+    armazem, gravador = armazem_e_gravador
+    armazem.inserir_varios(itinerarios(3))
+    gravador.gravar()
+    with gravador.sem_gravar():
+        armazem.limpar()
+    gravador.gravar()
+    assert len(base.gravacoes) == 1
+
+# Um erro inesperado é mostrado e as alterações voltam para a fila, pela mesma ordem
+def test_erro_inesperado_volta_a_tentar(base, armazem_e_gravador, capsys):
+    armazem, gravador = armazem_e_gravador
+    lista = itinerarios(4)
+    armazem.inserir_varios(lista)
+    base.falhar = KeyError("coluna")
+    gravador.gravar()
+    assert "Erro ao gravar itinerários: KeyError('coluna')" in capsys.readouterr().err
+    assert list(gravador.pendentes) == [it.id for it in lista]
+    gravador.gravar()
+    assert base.gravacoes == [([it.id for it in lista], [])]
+
+# Se a lista for limpa enquanto uma gravação falha, as linhas dessa gravação não voltam para a fila
+def test_limpar_durante_gravacao_falhada(base, armazem_e_gravador, monkeypatch):
+    armazem, gravador = armazem_e_gravador
+    lista = itinerarios(3)
+    armazem.inserir_varios(lista)
+
+    def falhar_depois_de_limpar(linhas, chaves_apagar=()):
+        armazem.limpar()
+        raise RuntimeError("ligação perdida")
+
+    monkeypatch.setattr(persistencia, "gravar_itinerarios_bd", falhar_depois_de_limpar)
+    gravador.gravar()
+    monkeypatch.setattr(persistencia, "gravar_itinerarios_bd", base)
+    gravador.gravar()
+    assert base.gravacoes == [([], [it.id for it in lista])]
+
+# Uma thread de gravação que terminou é iniciada de novo na alteração seguinte
+def test_thread_terminada_e_reiniciada(armazem_e_gravador):
+    armazem, gravador = armazem_e_gravador
+    terminada = threading.Thread(target=lambda: None)
+    terminada.start()
+    terminada.join()
+    gravador.thread = terminada
+    armazem.inserir(itinerarios(1)[0])
+    assert gravador.thread is not terminada and gravador.thread.is_alive()
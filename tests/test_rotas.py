@@ -0,0 +1,57 @@
+# Testes da estimativa offline de rotas (coordenadas das atrações e distância em linha reta)
+from contextlib import contextmanager
+
+import pytest
+
+from planeamento_viagens import rotas
+from planeamento_viagens.cache_local import cache_rotas
+from planeamento_viagens.rotas import ProvedorEstimativa
+
+
+# Coordenadas das atrações "na base de dados" (por nome); as consultas feitas ficam registadas
+@pytest.fixture
+def atracoes(monkeypatch, tmp_path):
+    conhecidas = {}
+    consultas = []
+
+    class Cursor:
+        def execute(self, sql, parametros):
+            consultas.append(parametros[0])
+            self.linha = conhecidas.get(parametros[0]) if "WHERE nome" in sql else (None, None)
+
+        def fetchone(self):
+            return self.linha
+
+    @contextmanager
+    def cursor_falso():
+        yield Cursor()
+
+    monkeypatch.setattr(rotas, "cursor_bd", cursor_falso)
+    caminho_original = cache_rotas.caminho
+    cache_rotas.mudar_ficheiro(str(tmp_path / "cache_rotas.db"))
+    yield conhecidas, consultas
+    cache_rotas.mudar_ficheiro(caminho_original)
+
+
+# As coordenadas encontradas ficam guardadas; um local sem coordenadas volta a ser procurado depois da validade
+def test_local_sem_coordenadas_expira(atracoes, monkeypatch):
+    conhecidas, consultas = atracoes
+    estimador = ProvedorEstimativa()
+    assert estimador.coordenadas_local("Museu Novo") is None
+    conhecidas["Museu Novo"] = (38.7, -9.1)         # Acrescentada/geocodificada entretanto
+    assert estimador.coordenadas_local("Museu Novo") is None
+    numero = len(consultas)
+    monkeypatch.setattr(rotas, "VALIDADE_SEM_COORDENADAS", 0)
+    assert estimador.coordenadas_local("Museu Novo") == (38.7, -9.1)
+    assert len(consultas) > numero
+    numero = len(consultas)
+    assert estimador.coordenadas_local(" museu novo ") == (38.7, -9.1)
+    assert len(consultas) == numero
+
+# A rota estimada usa a distância em linha reta com o fator do modo e fica marcada como estimada
+def test_rota_estimada(atracoes):
+    conhecidas, _ = atracoes
+    conhecidas.update({"Lisboa": (38.7223, -9.1393), "Porto": (41.1579, -8.6291)})
+    rota = ProvedorEstimativa().rota("Lisboa", "Porto")
+    assert rota["estimada"] and rota["distancia_m"] > 274000 and rota["duracao_s"] > 0
+    assert ProvedorEstimativa().rota("Lisboa", "Desconhecido") is None
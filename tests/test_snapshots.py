@@ -0,0 +1,106 @@
+# Testes dos snapshots JSONL: gravação e leitura sem perda, acesso preguiçoso e ficheiros inválidos
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from planeamento_viagens.cache_local import cache_rotas
+from planeamento_viagens.itinerarios import Itinerario
+from planeamento_viagens.snapshots import (SnapshotItinerarios, escrever_snapshot, importar_itinerarios_ficheiro,
+                                           itinerario_para_dict)
+
+
+# A cache de rotas semeada pela importação fica num ficheiro temporário (e não no cache_rotas.db do projeto)
+@pytest.fixture(autouse=True)
+def cache_temporaria(tmp_path):
+    caminho_original = cache_rotas.caminho
+    cache_rotas.mudar_ficheiro(str(tmp_path / "cache_rotas.db"))
+    yield cache_rotas
+    cache_rotas.mudar_ficheiro(caminho_original)
+
+# Plano de teste com rotas calculadas, falhadas e pendentes e texto fora do ASCII
+@pytest.fixture
+def itinerarios():
+    inicio = datetime(2024, 5, 1, 9, 0)
+    plano = [Itinerario(f"Origem {i}", f"Évora {i}", "Cultural", inicio + timedelta(minutes=37 * i), f"nota {i}",
+                        1234 * i + 5, 61 * i + 1)
+             for i in range(30)]
+    plano.append(Itinerario("Sé", "Castelo", "Outro", inicio, estado_rota="Rota não encontrada."))
+    plano.append(Itinerario("Praia", "Mercado", "Gastronómica", inicio))
+    return plano
+
+# Importa um ficheiro e devolve (itinerários, lotes, estado final)
+def importar(caminho, tamanho_lote=500):
+    lotes = []
+    estado = importar_itinerarios_ficheiro(str(caminho), lambda lote, estado: lotes.append((list(lote), estado)),
+                                           tamanho_lote=tamanho_lote)
+    return [it for lote, _ in lotes for it in lote], lotes, estado
+
+
+# Um snapshot (simples ou comprimido) devolve exatamente os mesmos itinerários, com os mesmos ids
+@pytest.mark.parametrize("nome", ["plano.jsonl", "plano.jsonl.gz"])
+def test_snapshot_ida_e_volta(tmp_path, itinerarios, nome):
+    caminho = tmp_path / nome
+    assert escrever_snapshot(str(caminho), itinerarios) == len(itinerarios)
+    assert not (tmp_path / (nome + ".tmp")).exists()
+    lidos, lotes, estado = importar(caminho, tamanho_lote=8)
+    assert [itinerario_para_dict(it) for it in lidos] == [itinerario_para_dict(it) for it in itinerarios]
+    assert [len(lote) for lote, _ in lotes] == [8, 8, 8, 8]
+    assert estado["importados"] == len(itinerarios) and estado["ignorados"] == 0 and estado["fracao"] == 1.0
+
+# A importação guarda na cache as rotas já calculadas, para não as voltar a pedir à API
+def test_importacao_semeia_cache(tmp_path, itinerarios, cache_temporaria):
+    caminho = tmp_path / "plano.jsonl"
+    escrever_snapshot(str(caminho), itinerarios)
+    importar(caminho)
+    rota = cache_temporaria.obter("Origem 3", "Évora 3", "driving", "pt-pt")
+    assert (rota["distancia_m"], rota["duracao_s"]) == (1234 * 3 + 5, 61 * 3 + 1)
+    assert cache_temporaria.obter("Sé", "Castelo", "driving", "pt-pt") is None
+
+# Linhas danificadas são contadas e indicadas pelo número da linha; as restantes são importadas
+def test_snapshot_com_linhas_invalidas(tmp_path, itinerarios):
+    caminho = tmp_path / "plano.jsonl"
+    escrever_snapshot(str(caminho), itinerarios[:3])
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write('{"origem": "A"}\nnão é JSON\n\n')
+    lidos, _, estado = importar(caminho)
+    assert len(lidos) == 3
+    assert estado["ignorados"] == 2 and estado["linhas_ignoradas"] == [5, 6]
+
+# O acesso preguiçoso devolve cada itinerário pela posição, sem ler o ficheiro todo
+def test_snapshot_preguicoso(tmp_path, itinerarios):
+    caminho = tmp_path / "plano.jsonl"
+    escrever_snapshot(str(caminho), itinerarios)
+    with SnapshotItinerarios(str(caminho)) as snapshot:
+        assert len(snapshot) == len(itinerarios)
+        assert snapshot.cabecalho["versao"] == 1
+        assert itinerario_para_dict(snapshot[17]) == itinerario_para_dict(itinerarios[17])
+        assert itinerario_para_dict(snapshot[-1]) == itinerario_para_dict(itinerarios[-1])
+        assert [it.id for it in snapshot] == [it.id for it in itinerarios]
+
+# Um snapshot sem itinerários (só o cabeçalho) é válido
+def test_snapshot_sem_itinerarios(tmp_path):
+    caminho = tmp_path / "vazio.jsonl"
+    assert escrever_snapshot(str(caminho), []) == 0
+    with SnapshotItinerarios(str(caminho)) as snapshot:
+        assert len(snapshot) == 0 and list(snapshot) == []
+    assert importar(caminho)[0] == []
+
+@pytest.mark.parametrize("conteudo, mensagem", [
+    (b"", "o ficheiro está vazio"),
+    (b"isto nao e JSON\n", "não é um snapshot"),
+    (json.dumps({"formato": "outro"}).encode() + b"\n", "não é um snapshot"),
+    (json.dumps({"formato": "itinerarios", "versao": 99}).encode() + b"\n", "Versão do snapshot não suportada"),
+])
+def test_snapshot_invalido(tmp_path, conteudo, mensagem):
+    caminho = tmp_path / "invalido.jsonl"
+    caminho.write_bytes(conteudo)
+    with pytest.raises(ValueError, match="Snapshot inválido: .*" + mensagem):
+        SnapshotItinerarios(str(caminho))
+
+# Os snapshots comprimidos só podem ser lidos sequencialmente
+def test_snapshot_comprimido_nao_e_mapeado(tmp_path, itinerarios):
+    caminho = tmp_path / "plano.jsonl.gz"
+    escrever_snapshot(str(caminho), itinerarios)
+    with pytest.raises(ValueError, match="sequencialmente"):
+        SnapshotItinerarios(str(caminho))